@@ -0,0 +1,182 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+from core.ticker_analyzer import TickerAnalyzer
+
+class AsyncFetchBackend:
+    """
+    Fetch ticker price histories concurrently on one dedicated asyncio event-loop thread.
+
+    All requests share a single pooled HTTP session, so keep-alive connections and
+    TLS sessions are reused across tickers and the number of open sockets is bounded
+    by `max_connections` no matter how many fetches are in flight.
+    """
+
+    CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+
+    def __init__(self, max_connections=8, timeout=10, session_factory=None):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.session_factory = session_factory or self._create_session
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        """Create the pooled HTTP session shared by all requests"""
+        from curl_cffi.requests import AsyncSession
+        return AsyncSession(max_clients=self.max_connections, impersonate="chrome", timeout=self.timeout)
+
+    def start(self):
+        """Start the event-loop thread if it is not running yet"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, name="ticker-fetch-loop", daemon=True)
+            self._thread.start()
+
+    def _run_loop(self):
+        """Run the event loop forever on the backend thread"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def is_running(self):
+        """Check if the event-loop thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, ticker, max_retries=2, retry_delay=2):
+        """
+        Schedule the download of a ticker history.
+
+        Returns:
+            concurrent.futures.Future: resolves to the (history, rate) tuple of the ticker
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(self.fetch(ticker, max_retries, retry_delay), self._loop)
+
+    async def fetch(self, ticker, max_retries=2, retry_delay=2):
+        """Download and validate the history of a ticker, retrying failed requests"""
+        if not isinstance(ticker, str) or not ticker.strip():
+            raise ValueError("Ticker must be a non-empty string")
+        ticker = ticker.strip().upper()
+
+        if self._session is None:
+            self._session = self.session_factory()
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                async with self._semaphore:
+                    response = await self._session.get(
+                        self.CHART_URL.format(ticker=ticker),
+                        params=self._chart_params()
+                    )
+            except self._transport_errors() as e:
+                error = str(e)
+            else:
+                if not self.is_retryable_status(response.status_code):
+                    break
+                error = f"HTTP {response.status_code}"
+            if attempts > max_retries:
+                raise Exception(f"Failed to download data after {attempts} attempts: {error}")
+            await asyncio.sleep(retry_delay)
+
+        # Unknown tickers answer 404 with a chart error, reported as missing data by the parser
+        if response.status_code >= 400 and response.status_code != 404:
+            raise Exception(f"Failed to download data for {ticker}: HTTP {response.status_code}")
+        data = self.parse_chart_response(response.json(), ticker)
+        return data, TickerAnalyzer.calculate_cagr(data, ticker)
+
+    @staticmethod
+    def is_retryable_status(status_code):
+        """Check if an HTTP status is worth retrying: rate limiting or a server error"""
+        return status_code == 429 or status_code >= 500
+
+    @staticmethod
+    def _transport_errors():
+        """Exception types of requests that failed on the network, the only ones retried"""
+        try:
+            from curl_cffi.requests.errors import RequestsError
+        except ImportError:
+            return (OSError,)
+        return (OSError, RequestsError)
+
+    @staticmethod
+    def _chart_params():
+        """Query parameters matching the period used by TickerAnalyzer"""
+        start = datetime.fromisoformat(TickerAnalyzer.HISTORY_START).replace(tzinfo=timezone.utc)
+        end = datetime.fromisoformat(TickerAnalyzer.HISTORY_END).replace(tzinfo=timezone.utc)
+        return {
+            "period1": int(start.timestamp()),
+            "period2": int(end.timestamp()),
+            "interval": "1d",
+            "events": "div,splits"
+        }
+
+    @staticmethod
+    def parse_chart_response(payload, ticker):
+        """
+        Convert a Yahoo chart response into a DataFrame with a 'Close' column.
+
+        Adjusted closes are used when available, matching `yf.download(auto_adjust=True)`.
+        """
+        import pandas as pd
+        chart = payload.get("chart", {}) if isinstance(payload, dict) else {}
+        results = chart.get("result") or []
+        if not results or not results[0].get("timestamp"):
+            raise ValueError(f"No data available for ticker {ticker}")
+
+        result = results[0]
+        indicators = result.get("indicators", {})
+        adjusted = indicators.get("adjclose") or [{}]
+        closes = adjusted[0].get("adjclose") or (indicators.get("quote") or [{}])[0].get("close")
+        if not closes:
+            raise ValueError(f"No data available for ticker {ticker}")
+
+        index = pd.to_datetime(result["timestamp"], unit="s").normalize()
+        data = pd.DataFrame({"Close": closes}, index=index, dtype=float)
+        return data.dropna(subset=["Close"])
+
+    def stop(self):
+        """Close the shared session and stop the event-loop thread"""
+        with self._lock:
+            if self._loop is None:
+                return
+            if self._session is not None and self.is_running():
+                future = asyncio.run_coroutine_threadsafe(self._close_session(), self._loop)
+                try:
+                    future.result(timeout=2)
+                except Exception as e:
+                    print(f"Could not close fetch session: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=2)
+            self._loop = None
+            self._thread = None
+
+    async def _close_session(self):
+        """Close the pooled HTTP session"""
+        session, self._session = self._session, None
+        await session.close()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_fetch_backend():
+    """Get the shared fetch backend, creating it on first use"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = AsyncFetchBackend()
+        return _backend
+
+def shutdown_fetch_backend():
+    """Stop the shared fetch backend if it was started"""
+    with _backend_lock:
+        if _backend is not None:
+            _backend.stop()
@@ -0,0 +1,258 @@
+import json
+import struct
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+import numpy as np
+from core.investment_calculator import InvestmentCalculator
+from core.portfolio_validator import PortfolioValidator
+
+# File layout:
+#   header        HEADER_FORMAT, see below
+#   document      UTF-8 JSON of the file without the investments (metadata and any other key)
+#   records       record_count fixed-width RECORD_DTYPE records
+#   strings       UTF-8 string table holding the tickers
+#   extras        UTF-8 JSON {record index: {field: value}} for values that do not fit a record
+# Every section starts on an 8-byte boundary.
+MAGIC = b"INVPBIN\0"
+FORMAT_VERSION = 1
+HEADER_FORMAT = "<8sIIQQQQQQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+RECORD_DTYPE = np.dtype([
+    ("ticker_offset", "<u8"),
+    ("ticker_length", "<u4"),
+    ("flags", "<u2"),
+    ("compound_frequency", "u1"),
+    ("contribution_frequency", "u1"),
+    ("rate", "<f8"),
+    ("initial_deposit", "<f8"),
+    ("contribution_amount", "<f8"),
+    ("years", "<f8"),
+])
+
+# Fields stored in the records, in the order they are written back to JSON
+FLOAT_FIELDS = ["rate", "initial_deposit", "contribution_amount"]
+FREQUENCY_FIELDS = ["compound_frequency", "contribution_frequency"]
+FIELD_ORDER = ["ticker"] + FLOAT_FIELDS + FREQUENCY_FIELDS + ["years"]
+FIELD_FLAGS = {field: 1 << bit for bit, field in enumerate(FIELD_ORDER)}
+
+FREQUENCIES = InvestmentCalculator.get_available_frequencies()
+
+def _padding(size: int) -> bytes:
+    """Zero bytes needed to align `size` on 8 bytes"""
+    return b"\0" * (-size % 8)
+
+def is_binary_portfolio(file_path: str) -> bool:
+    """Check if a file starts with the binary portfolio magic"""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def write_binary_portfolio(file_path: str, data: Dict):
+    """Write a portfolio document in binary format to a file path"""
+    with open(file_path, 'wb') as f:
+        dump_binary_portfolio(data, f)
+
+def dump_binary_portfolio(data: Dict, f: BinaryIO):
+    """
+    Write a portfolio document ({"metadata": ..., "investments": [...]}) in binary format.
+
+    Values that are not representable in a record (non-float numbers, unknown frequencies,
+    extra keys) are kept in the extras section, so reading the file back returns a document
+    equal to `data`.
+    """
+    investments = data["investments"]
+    document = {key: value for key, value in data.items() if key != "investments"}
+
+    records = np.zeros(len(investments), dtype=RECORD_DTYPE)
+    strings = bytearray()
+    extras = {}
+
+    for index, investment in enumerate(investments):
+        record = records[index]
+        flags = 0
+        leftovers = {}
+        for key, value in investment.items():
+            if key == "ticker" and isinstance(value, str):
+                encoded = value.encode('utf-8')
+                record["ticker_offset"] = len(strings)
+                record["ticker_length"] = len(encoded)
+                strings += encoded
+            elif key in FLOAT_FIELDS or key == "years":
+                if type(value) is not float:
+                    leftovers[key] = value
+                    continue
+                record[key] = value
+            elif key in FREQUENCY_FIELDS and value in FREQUENCIES:
+                record[key] = FREQUENCIES.index(value)
+            else:
+                leftovers[key] = value
+                continue
+            flags |= FIELD_FLAGS[key]
+        record["flags"] = flags
+        if leftovers:
+            extras[str(index)] = leftovers
+
+    document_bytes = json.dumps(document, ensure_ascii=False).encode('utf-8')
+    extras_bytes = json.dumps(extras, ensure_ascii=False).encode('utf-8') if extras else b""
+
+    document_offset = HEADER_SIZE + len(_padding(HEADER_SIZE))
+    records_offset = document_offset + len(document_bytes) + len(_padding(len(document_bytes)))
+    strings_offset = records_offset + records.nbytes
+    extras_offset = strings_offset + len(strings) + len(_padding(len(strings)))
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, FORMAT_VERSION, len(document_bytes), len(investments),
+                         records_offset, strings_offset, len(strings), extras_offset, len(extras_bytes))
+    f.write(header + _padding(HEADER_SIZE))
+    f.write(document_bytes + _padding(len(document_bytes)))
+    f.write(records.tobytes())
+    f.write(bytes(strings) + _padding(len(strings)))
+    f.write(extras_bytes)
+
+class BinaryPortfolio:
+    """
+    Read-only view of a binary portfolio file.
+
+    Opening only reads the header and the metadata; the records and the string table are
+    memory-mapped, so holdings are read lazily when accessed.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                raise ValueError("The file is not a binary investment file")
+            (magic, version, document_length, self.record_count, records_offset,
+             strings_offset, strings_length, self._extras_offset, self._extras_length) = struct.unpack(HEADER_FORMAT, header)
+            if magic != MAGIC:
+                raise ValueError("The file is not a binary investment file")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Unsupported binary investment file version {version}")
+            f.seek(HEADER_SIZE + len(_padding(HEADER_SIZE)))
+            self.document = json.loads(f.read(document_length).decode('utf-8'))
+
+        if self.record_count:
+            self.records = np.memmap(file_path, dtype=RECORD_DTYPE, mode='r',
+                                     offset=records_offset, shape=(self.record_count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        if strings_length:
+            self._strings = np.memmap(file_path, dtype=np.uint8, mode='r',
+                                      offset=strings_offset, shape=(strings_length,))
+        else:
+            self._strings = np.zeros(0, dtype=np.uint8)
+        self._extras = None
+
+    @property
+    def metadata(self) -> Dict:
+        """Metadata of the portfolio"""
+        return self.document.get("metadata", {})
+
+    def _get_extras(self) -> Dict[str, Dict]:
+        """Load the extras section on first use"""
+        if self._extras is None:
+            self._extras = {}
+            if self._extras_length:
+                with open(self.file_path, 'rb') as f:
+                    f.seek(self._extras_offset)
+                    self._extras = json.loads(f.read(self._extras_length).decode('utf-8'))
+        return self._extras
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def _ticker(self, record) -> str:
+        """Decode the ticker of a record from the string table"""
+        start = int(record["ticker_offset"])
+        return self._strings[start:start + int(record["ticker_length"])].tobytes().decode('utf-8')
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Decode one investment record"""
+        if index < 0:
+            index += self.record_count
+        if not 0 <= index < self.record_count:
+            raise IndexError("Investment index out of range")
+
+        record = self.records[index]
+        flags = int(record["flags"])
+        investment = {}
+        for field in FIELD_ORDER:
+            if not flags & FIELD_FLAGS[field]:
+                continue
+            if field == "ticker":
+                investment[field] = self._ticker(record)
+            elif field in FREQUENCY_FIELDS:
+                investment[field] = FREQUENCIES[int(record[field])]
+            else:
+                investment[field] = float(record[field])
+
+        leftovers = self._get_extras().get(str(index))
+        if leftovers:
+            investment.update(leftovers)
+        return investment
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(self.record_count):
+            yield self[index]
+
+    def column(self, field: str) -> np.ndarray:
+        """Memory-mapped view of a numeric field of all records (NaN-free only if always present)"""
+        return self.records[field]
+
+    def tickers(self) -> List[str]:
+        """Tickers of all records"""
+        return [self._ticker(record) for record in self.records]
+
+    def iter_batches(self, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Decode the records in batches"""
+        for start in range(0, self.record_count, batch_size):
+            yield [self[index] for index in range(start, min(start + batch_size, self.record_count))]
+
+    def to_dict(self) -> Dict:
+        """Decode the whole portfolio document"""
+        data = dict(self.document)
+        data["investments"] = list(self)
+        return data
+
+def json_to_binary(json_path: str, binary_path: str):
+    """Convert a JSON portfolio file to the binary format"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    write_binary_portfolio(binary_path, data)
+
+def binary_to_json(binary_path: str, json_path: str):
+    """Convert a binary portfolio file to the JSON format"""
+    data = BinaryPortfolio(binary_path).to_dict()
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def read_binary_portfolio_streaming(file_path: str, batch_size: int = 500,
+                                    progress_callback=None) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a binary portfolio with the same events as `read_portfolio_streaming`.
+
+    Yields:
+        tuple: ("metadata", dict) and ("batch", list of investment dicts)
+
+    Raises:
+        PortfolioValidationError: If the file is not a valid investment file
+    """
+    portfolio = BinaryPortfolio(file_path)
+    validator = PortfolioValidator()
+    if "metadata" in portfolio.document and validator.check_metadata(portfolio.metadata):
+        yield "metadata", portfolio.metadata
+    validator.has_investments = True
+    done = 0
+    for batch in portfolio.iter_batches(batch_size):
+        valid = [investment for offset, investment in enumerate(batch)
+                 if validator.check_investment(investment, done + offset)]
+        done += len(batch)
+        if progress_callback is not None:
+            progress_callback(done, len(portfolio))
+        if valid:
+            yield "batch", valid
+    if progress_callback is not None:
+        progress_callback(len(portfolio), len(portfolio))
+    validator.raise_if_invalid()
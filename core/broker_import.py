@@ -0,0 +1,169 @@
+import csv
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Header names used by common brokers for every investment field, lowercase
+COLUMN_ALIASES = {
+    "ticker": ["ticker", "symbol", "instrument symbol", "security symbol", "code"],
+    "initial_deposit": ["market value", "current value", "position value", "total value", "value", "amount", "cost basis"],
+    "contribution_amount": ["contribution", "contribution amount", "monthly contribution", "recurring amount",
+                            "savings plan amount"],
+    "rate": ["rate", "annual rate", "annual rate (%)", "expected return"],
+}
+
+@dataclass
+class BrokerColumnMapping:
+    """Data class to represent which CSV column holds every investment field"""
+    ticker: str
+    initial_deposit: str
+    contribution_amount: Optional[str] = None
+    rate: Optional[str] = None
+    decimal: str = "."
+
+    @classmethod
+    def detect(cls, headers: Sequence[str]) -> Optional["BrokerColumnMapping"]:
+        """Guess the mapping from the header names, or return None if ticker or value are missing"""
+        lookup = {header.strip().lower(): header for header in headers}
+        found = {}
+        for name, aliases in COLUMN_ALIASES.items():
+            found[name] = next((lookup[alias] for alias in aliases if alias in lookup), None)
+        if found["ticker"] is None or found["initial_deposit"] is None:
+            return None
+        return cls(**found)
+
+@dataclass
+class BrokerImportResult:
+    """Data class to represent the holdings read from a broker CSV"""
+    investments: List[Dict] = field(default_factory=list)
+    skipped_rows: List[Tuple[int, str]] = field(default_factory=list)  # (line number, reason)
+    merged_rows: int = 0  # Rows added to an earlier holding of the same ticker
+
+def sniff_delimiter(file_path: str) -> str:
+    """Detect the delimiter of a CSV file from its first lines"""
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        sample = f.read(16 * 1024)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        return ","
+
+def read_broker_headers(file_path: str) -> List[str]:
+    """Read the column names of a broker CSV"""
+    import pandas as pd
+    frame = pd.read_csv(file_path, sep=sniff_delimiter(file_path), nrows=0, encoding='utf-8-sig')
+    return [str(column).strip() for column in frame.columns]
+
+def parse_amounts(values: "pd.Series", decimal: str = ".") -> "pd.Series":
+    """
+    Convert broker formatted amounts to floats in one vectorized pass.
+
+    Currency symbols, spaces and thousands separators are dropped and amounts in
+    parentheses are negative. Unparseable values become NaN.
+    """
+    import pandas as pd
+    text = values.fillna("").astype(str).str.strip()
+    negative = text.str.startswith("(") & text.str.endswith(")")
+    cleaned = text.str.replace(f"[^0-9\\-{re.escape(decimal)}]", "", regex=True)
+    if decimal != ".":
+        cleaned = cleaned.str.replace(decimal, ".", regex=False)
+    numbers = pd.to_numeric(cleaned.replace("", np.nan), errors='coerce')
+    return numbers.where(~negative, -numbers)
+
+def read_broker_csv(file_path: str, mapping: Optional[BrokerColumnMapping] = None) -> BrokerImportResult:
+    """
+    Read holdings from a broker CSV export.
+
+    Args:
+        file_path: Path of the CSV file
+        mapping: Columns to read, detected from the header names if None
+
+    Returns:
+        BrokerImportResult with one investment per ticker, duplicate tickers merged
+
+    Raises:
+        ValueError: If the ticker or value columns cannot be found
+    """
+    import pandas as pd
+    frame = pd.read_csv(file_path, sep=sniff_delimiter(file_path), dtype=str,
+                        keep_default_na=False, encoding='utf-8-sig')
+    frame.columns = [str(column).strip() for column in frame.columns]
+
+    if mapping is None:
+        mapping = BrokerColumnMapping.detect(frame.columns)
+        if mapping is None:
+            raise ValueError(f"Could not find the ticker and value columns in: {', '.join(frame.columns)}")
+    for column in (mapping.ticker, mapping.initial_deposit, mapping.contribution_amount, mapping.rate):
+        if column is not None and column not in frame.columns:
+            raise ValueError(f"Column '{column}' not found in the file")
+
+    # Line number of every row in the file, after the header line
+    lines = pd.Series(np.arange(len(frame)) + 2, index=frame.index)
+    tickers = frame[mapping.ticker].str.strip().str.upper()
+    initial = parse_amounts(frame[mapping.initial_deposit], mapping.decimal)
+    if mapping.contribution_amount is not None:
+        raw_contribution = frame[mapping.contribution_amount].str.strip()
+        contribution = parse_amounts(raw_contribution, mapping.decimal)
+        invalid_contribution = contribution.isna() & (raw_contribution != "")
+        contribution = contribution.fillna(0.0)
+    else:
+        contribution = pd.Series(0.0, index=frame.index)
+        invalid_contribution = pd.Series(False, index=frame.index)
+    if mapping.rate is not None:
+        rate = parse_amounts(frame[mapping.rate], mapping.decimal)
+    else:
+        rate = pd.Series(np.nan, index=frame.index)
+
+    # Reasons are checked in order, a row is reported for the first one only
+    checks = [
+        (tickers == "", "missing ticker"),
+        (initial.isna(), "invalid value"),
+        (initial < 0, "negative value"),
+        (invalid_contribution, "invalid contribution"),
+        (contribution < 0, "negative contribution"),
+    ]
+    result = BrokerImportResult()
+    rejected = pd.Series(False, index=frame.index)
+    for mask, reason in checks:
+        mask = mask & ~rejected
+        result.skipped_rows.extend((int(line), reason) for line in lines[mask])
+        rejected |= mask
+    result.skipped_rows.sort()
+
+    holdings = pd.DataFrame({
+        "ticker": tickers,
+        "initial_deposit": initial,
+        "contribution_amount": contribution,
+        # Rates of merged rows are averaged, weighted by their value
+        "weighted_rate": (rate * initial).fillna(0.0),
+        "rate_weight": initial.where(rate.notna(), 0.0),
+        "rate": rate,
+    })[~rejected]
+    result.merged_rows = int(len(holdings) - holdings["ticker"].nunique())
+
+    grouped = holdings.groupby("ticker", sort=False).agg(
+        initial_deposit=("initial_deposit", "sum"),
+        contribution_amount=("contribution_amount", "sum"),
+        weighted_rate=("weighted_rate", "sum"),
+        rate_weight=("rate_weight", "sum"),
+        mean_rate=("rate", "mean"),
+    )
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grouped["rate"] = np.where(grouped["rate_weight"] > 0,
+                                   grouped["weighted_rate"] / grouped["rate_weight"], grouped["mean_rate"])
+
+    for ticker, initial_deposit, contribution_amount, holding_rate in zip(
+            grouped.index, grouped["initial_deposit"], grouped["contribution_amount"], grouped["rate"]):
+        investment = {
+            "ticker": ticker,
+            "initial_deposit": float(initial_deposit),
+            "contribution_amount": float(contribution_amount),
+        }
+        if not np.isnan(holding_rate):
+            investment["rate"] = float(holding_rate)
+        result.investments.append(investment)
+    return result
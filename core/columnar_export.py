@@ -0,0 +1,189 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from core.csv_export import EXPORT_CHUNK_SIZE
+from core.finance import project_annual_breakdown
+from core.investment_calculator import InvestmentCalculator
+from core.simulation import percentile_bands, simulate_paths
+
+BREAKDOWN_COLUMNS = ("ticker", "year", "rate", "capital", "invested", "profit")
+# Percentiles of the simulated capital, exported when a volatility is given
+BAND_COLUMNS = ("p5", "p25", "median", "p75", "p95")
+
+# Factory of an iterator over chunks of rows, each chunk mapping column name -> array
+ChunkFactory = Callable[[], Iterator[Dict[str, np.ndarray]]]
+
+def is_parquet_available() -> bool:
+    """Check if pyarrow is installed to write Parquet files"""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def _select_columns(columns: Optional[Sequence[str]], available: Sequence[str]) -> List[str]:
+    """Validate a column projection, keeping every column if None"""
+    if columns is None:
+        return list(available)
+    unknown = [column for column in columns if column not in available]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+    return list(columns)
+
+def write_columnar(file_path: str, make_chunks: ChunkFactory, dtypes: Dict[str, np.dtype],
+                   total_rows: int, compression: Optional[str] = "zstd") -> str:
+    """
+    Write chunks of rows to a Parquet file, or to a .npz archive if the path does not end
+    with .parquet or pyarrow is not installed.
+
+    Args:
+        file_path: Destination path
+        make_chunks: Returns an iterator over the chunks, called once
+        dtypes: Column name -> dtype, in column order
+        total_rows: Number of rows produced by the chunks
+        compression: Parquet codec ("zstd", "snappy", "gzip"...); any value deflates .npz entries
+
+    Returns:
+        str: The path written, with a .npz extension when falling back to NumPy
+    """
+    if file_path.lower().endswith(".parquet") and is_parquet_available():
+        _write_parquet(file_path, make_chunks, dtypes, compression)
+        return file_path
+
+    root, extension = os.path.splitext(file_path)
+    if extension.lower() != ".npz":
+        file_path = root + ".npz"
+    _write_npz(file_path, make_chunks, dtypes, total_rows, compression)
+    return file_path
+
+def _write_parquet(file_path: str, make_chunks: ChunkFactory, dtypes: Dict[str, np.dtype],
+                   compression: Optional[str]):
+    """Write every chunk as a row group of a Parquet file"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        (name, pa.string() if dtype.kind == "U" else pa.from_numpy_dtype(dtype))
+        for name, dtype in dtypes.items()
+    ])
+    with pq.ParquetWriter(file_path, schema, compression=compression or "none") as writer:
+        for chunk in make_chunks():
+            writer.write_table(pa.table({name: chunk[name] for name in dtypes}, schema=schema))
+
+def _write_npz(file_path: str, make_chunks: ChunkFactory, dtypes: Dict[str, np.dtype],
+               total_rows: int, compression: Optional[str]):
+    """
+    Stream every column to its own .npy entry of a zip archive readable with numpy.load.
+
+    A .npy entry needs its whole column contiguously and only one entry can be written
+    at a time, so the chunks are produced once and every column is spooled to a
+    temporary file before it is copied into the archive.
+    """
+    spools = {name: tempfile.TemporaryFile() for name in dtypes}
+    try:
+        for chunk in make_chunks():
+            for name, dtype in dtypes.items():
+                spools[name].write(np.ascontiguousarray(chunk[name], dtype=dtype).tobytes())
+
+        mode = zipfile.ZIP_DEFLATED if compression else zipfile.ZIP_STORED
+        with zipfile.ZipFile(file_path, 'w', compression=mode, allowZip64=True) as archive:
+            for name, dtype in dtypes.items():
+                with archive.open(f"{name}.npy", 'w', force_zip64=True) as entry:
+                    header = {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False,
+                              'shape': (total_rows,)}
+                    np.lib.format.write_array_header_1_0(entry, header)
+                    spools[name].seek(0)
+                    shutil.copyfileobj(spools[name], entry)
+    finally:
+        for spool in spools.values():
+            spool.close()
+
+def export_breakdown(file_path: str, investments_data: List[Dict], years: float,
+                     compound_freq: str, contrib_freq: str, columns: Optional[Sequence[str]] = None,
+                     compression: Optional[str] = "zstd", chunk_size: int = EXPORT_CHUNK_SIZE,
+                     volatility: Optional[float] = None, path_count: int = 10_000,
+                     seed: Optional[int] = None) -> str:
+    """
+    Export the year-by-year projection of every holding in long format, one row per
+    holding and year.
+
+    With a volatility, the percentile bands of a Monte Carlo simulation of every
+    holding are exported as well (see core.simulation).
+
+    Args:
+        file_path: Destination path (.parquet or .npz)
+        investments_data: List of investment data
+        years: Years of growth
+        compound_freq: Compound frequency
+        contrib_freq: Contribution frequency
+        columns: Subset of BREAKDOWN_COLUMNS (and BAND_COLUMNS with a volatility) to write,
+            all of them if None
+        compression: Compression codec, None to store uncompressed
+        chunk_size: Number of holdings projected at a time
+        volatility: Standard deviation of the annual log return in percent, None to skip the bands
+        path_count: Number of simulated paths of every holding
+        seed: Seed of the random generator of every holding, for reproducible results
+
+    Returns:
+        str: The path written
+    """
+    available = BREAKDOWN_COLUMNS + (BAND_COLUMNS if volatility is not None else ())
+    columns = _select_columns(columns, available)
+    tickers = np.array([str(inv['ticker']) for inv in investments_data])
+    rates = np.array([inv['rate'] for inv in investments_data], dtype=np.float64)
+    initial = np.array([inv['initial_deposit'] for inv in investments_data], dtype=np.float64)
+    contribution = np.array([inv['contribution_amount'] for inv in investments_data], dtype=np.float64)
+    year_range = np.arange(int(years) + 1, dtype=np.int32)
+    contributions_per_year = InvestmentCalculator.get_frequency_multiplier(contrib_freq)
+
+    all_dtypes = {
+        "ticker": np.dtype(f"<U{max(tickers.dtype.itemsize // 4, 1)}"),
+        "year": np.dtype(np.int32),
+        "rate": np.dtype(np.float64),
+        "capital": np.dtype(np.float64),
+        "invested": np.dtype(np.float64),
+        "profit": np.dtype(np.float64),
+    }
+    all_dtypes.update((name, np.dtype(np.float64)) for name in BAND_COLUMNS)
+
+    def make_chunks():
+        for start in range(0, len(tickers), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            count = len(tickers[chunk])
+            values = {}
+            if "ticker" in columns:
+                values["ticker"] = np.repeat(tickers[chunk], len(year_range))
+            if "year" in columns:
+                values["year"] = np.tile(year_range, count)
+            if "rate" in columns:
+                values["rate"] = np.repeat(rates[chunk], len(year_range))
+            if {"capital", "invested", "profit"} & set(columns):
+                _, capital = project_annual_breakdown(rates[chunk], initial[chunk], contribution[chunk],
+                                                      years, compound_freq, contrib_freq)
+                invested = initial[chunk, None] + contribution[chunk, None] * contributions_per_year * year_range
+                values["capital"] = capital.ravel()
+                values["invested"] = invested.ravel()
+                values["profit"] = (capital - invested).ravel()
+            if set(BAND_COLUMNS) & set(columns):
+                values.update(_simulate_bands(rates[chunk], initial[chunk], contribution[chunk], years,
+                                              contrib_freq, volatility, path_count, seed))
+            yield values
+
+    dtypes = {name: all_dtypes[name] for name in columns}
+    return write_columnar(file_path, make_chunks, dtypes, len(tickers) * len(year_range), compression)
+
+def _simulate_bands(rates: np.ndarray, initial: np.ndarray, contribution: np.ndarray, years: float,
+                    contrib_freq: str, volatility: float, path_count: int,
+                    seed: Optional[int]) -> Dict[str, np.ndarray]:
+    """Simulate every holding of a chunk and concatenate its percentile bands, column name -> array"""
+    bands = {name: [] for name in BAND_COLUMNS}
+    for rate, initial_deposit, contribution_amount in zip(rates, initial, contribution):
+        year_range, paths = simulate_paths(initial_deposit, contribution_amount, years, rate, volatility,
+                                           contrib_freq, path_count, seed)
+        holding_bands = percentile_bands(year_range, paths)
+        for name in BAND_COLUMNS:
+            bands[name].append(getattr(holding_bands, name))
+    return {name: np.concatenate(arrays) if arrays else np.empty(0) for name, arrays in bands.items()}
@@ -0,0 +1,85 @@
+import csv
+from datetime import datetime
+from typing import Dict, List
+import numpy as np
+from core.finance import project_annual_breakdown, project_portfolio
+
+# Holdings formatted and written per chunk, so the breakdown never sits in memory as text
+EXPORT_CHUNK_SIZE = 1000
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+def _format_rows(labels, columns) -> List[List[str]]:
+    """Format numeric columns with two decimals next to their row labels"""
+    formatted = [np.char.mod("%.2f", column).tolist() for column in columns]
+    return [[label, *values] for label, *values in zip(labels, *formatted)]
+
+def write_portfolio_csv(file_path: str, investments_data: List[Dict], years: float,
+                        compound_freq: str, contrib_freq: str, include_breakdown: bool = False):
+    """
+    Write the projection of every holding to a CSV file for Excel
+
+    Args:
+        file_path: Destination path
+        investments_data: List of investment data
+        years: Years of growth
+        compound_freq: Compound frequency
+        contrib_freq: Contribution frequency
+        include_breakdown: Also write the capital of every holding at the end of each year
+    """
+    tickers = [inv['ticker'] for inv in investments_data]
+    rates = np.array([inv['rate'] for inv in investments_data], dtype=np.float64)
+    initial = np.array([inv['initial_deposit'] for inv in investments_data], dtype=np.float64)
+    contribution = np.array([inv['contribution_amount'] for inv in investments_data], dtype=np.float64)
+
+    final_capital, profit, invested = project_portfolio(rates, initial, contribution, years,
+                                                        compound_freq, contrib_freq)
+
+    with open(file_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+
+        # Write general information
+        writer.writerow(["Investment Portfolio Export"])
+        writer.writerow(["Export Date:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
+        writer.writerow(["Years of Growth:", years])
+        writer.writerow(["Compound Frequency:", compound_freq])
+        writer.writerow(["Contribution Frequency:", contrib_freq])
+        writer.writerow([])  # Empty row
+
+        # Write investment header
+        writer.writerow([
+            "Ticker", "Annual Rate (%)", "Initial Deposit",
+            "Contribution Amount", "Expected Final Value", "Total Invested", "Profit"
+        ])
+
+        for start in range(0, len(tickers), EXPORT_CHUNK_SIZE):
+            chunk = slice(start, start + EXPORT_CHUNK_SIZE)
+            writer.writerows(_format_rows(tickers[chunk], [
+                rates[chunk], initial[chunk], contribution[chunk],
+                final_capital[chunk], invested[chunk], profit[chunk]
+            ]))
+
+        writer.writerow([])
+        writer.writerow(["Portfolio Total", ""] + [
+            f"{column.sum():.2f}" for column in (initial, contribution, final_capital, invested, profit)
+        ])
+
+        if include_breakdown:
+            _write_breakdown(writer, tickers, rates, initial, contribution, years, compound_freq, contrib_freq)
+
+def _write_breakdown(writer, tickers, rates, initial, contribution, years, compound_freq, contrib_freq):
+    """Write the year-by-year capital of every holding, one chunk of holdings at a time"""
+    year_range = np.arange(int(years) + 1)
+    totals = np.zeros(len(year_range))
+
+    writer.writerow([])
+    writer.writerow(["Year-by-Year Breakdown"])
+    writer.writerow(["Ticker", *(f"Year {year}" for year in year_range)])
+
+    for start in range(0, len(tickers), EXPORT_CHUNK_SIZE):
+        chunk = slice(start, start + EXPORT_CHUNK_SIZE)
+        _, capital = project_annual_breakdown(rates[chunk], initial[chunk], contribution[chunk],
+                                              years, compound_freq, contrib_freq)
+        totals += capital.sum(axis=0)
+        writer.writerows(_format_rows(tickers[chunk], capital.T))
+
+    writer.writerows(_format_rows(["Portfolio Total"], totals[:, None]))
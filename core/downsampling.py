@@ -0,0 +1,73 @@
+import numpy as np
+
+def lttb(x_values, y_values, threshold: int) -> np.ndarray:
+    """
+    Pick the points that best keep the shape of a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points between them are split into
+    threshold - 2 buckets and every bucket keeps the point forming the largest triangle
+    with the point kept in the previous bucket and the average of the next bucket, so
+    peaks and dips survive the reduction.
+
+    Args:
+        x_values: Sorted x values
+        y_values: y values
+        threshold: Maximum number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the points to keep, every index if the series is short enough
+    """
+    x_values = np.asarray(x_values, dtype=np.float64)
+    y_values = np.asarray(y_values, dtype=np.float64)
+    count = len(x_values)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.intp)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = count - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The last bucket is followed by the last point only
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else count
+        average_x = x_values[end:next_end].mean()
+        average_y = y_values[end:next_end].mean()
+
+        # Twice the triangle areas, the factor does not change which one is the largest
+        areas = np.abs((x_values[previous] - average_x) * (y_values[start:end] - y_values[previous])
+                       - (x_values[previous] - x_values[start:end]) * (average_y - y_values[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    return indices
+
+def visible_slice(x_values, x_min: float, x_max: float) -> slice:
+    """
+    Get the slice of sorted x values inside a range, with one more point on each side
+    so lines still reach the edges of the plot.
+    """
+    start = max(int(np.searchsorted(x_values, x_min, side='left')) - 1, 0)
+    end = min(int(np.searchsorted(x_values, x_max, side='right')) + 1, len(x_values))
+    return slice(start, end)
+
+def downsample(x_values, y_values, x_min: float, x_max: float, max_points: int):
+    """
+    Reduce a series to the points drawn in a visible range.
+
+    Args:
+        x_values: Sorted x values
+        y_values: y values
+        x_min: Start of the visible range
+        x_max: End of the visible range
+        max_points: Maximum number of points, e.g. the plot width in pixels
+
+    Returns:
+        tuple: x and y arrays of the points to draw
+    """
+    window = visible_slice(x_values, x_min, x_max)
+    x_visible = np.asarray(x_values[window], dtype=np.float64)
+    y_visible = np.asarray(y_values[window], dtype=np.float64)
+    indices = lttb(x_visible, y_visible, max_points)
+    return x_visible[indices], y_visible[indices]
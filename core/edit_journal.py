@@ -0,0 +1,184 @@
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from core.session import get_app_data_dir
+
+@dataclass
+class PortfolioState:
+    """Data class to represent the working portfolio rebuilt from the journal"""
+    settings: Dict[str, Any] = field(default_factory=dict)
+    holdings: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # holding id -> fields, in card order
+
+    def apply(self, entry: Dict[str, Any]):
+        """Apply one journal entry"""
+        op = entry["op"]
+        if op == "add":
+            self.holdings[entry["id"]] = dict(entry.get("fields", {}))
+        elif op == "update":
+            holding = self.holdings.get(entry["id"])
+            if holding is not None:
+                holding.update(entry["fields"])
+        elif op == "remove":
+            self.holdings.pop(entry["id"], None)
+        elif op == "settings":
+            self.settings.update(entry["fields"])
+        elif op == "clear":
+            self.holdings.clear()
+        else:
+            raise ValueError(f"Unknown journal operation: {op}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the state for a snapshot"""
+        return {"settings": self.settings, "holdings": [[key, value] for key, value in self.holdings.items()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PortfolioState":
+        """Rebuild a state from a snapshot"""
+        return cls(settings=dict(data.get("settings", {})),
+                   holdings={key: dict(value) for key, value in data.get("holdings", [])})
+
+class EditJournal:
+    """
+    Append-only journal of portfolio edits with periodic snapshots.
+
+    Every edit is appended to journal.log as one JSON line with an increasing sequence
+    number. After `compact_every` edits the current state is written to snapshot.json,
+    which records the last sequence number it contains, and the journal is truncated.
+    Recovery loads the snapshot and replays the newer journal lines, skipping a line
+    cut short by a crash.
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    JOURNAL_FILE = "journal.log"
+
+    def __init__(self, directory: Optional[str] = None, compact_every: int = 1000):
+        self.directory = directory or os.path.join(get_app_data_dir(), "journal")
+        self.compact_every = compact_every
+        self.state = PortfolioState()
+        self.sequence = 0
+        self.pending_entries = 0
+        self.recovered = False
+        self._journal = None
+
+    def _path(self, name: str) -> str:
+        """Get the path of a journal file"""
+        return os.path.join(self.directory, name)
+
+    def recover(self) -> PortfolioState:
+        """
+        Rebuild the last state from the snapshot and the journal.
+
+        Returns:
+            PortfolioState: The recovered state, empty if nothing was recorded
+        """
+        self.state = PortfolioState()
+        self.sequence = 0
+        self.pending_entries = 0
+        self.recovered = True
+        try:
+            with open(self._path(self.SNAPSHOT_FILE), 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.state = PortfolioState.from_dict(snapshot["state"])
+            self.sequence = snapshot["sequence"]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Could not read journal snapshot: {e}")
+
+        try:
+            with open(self._path(self.JOURNAL_FILE), 'r', encoding='utf-8') as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            lines = []
+
+        damaged = False
+        for line in lines:
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                # Entries already contained in the snapshot are left over by an interrupted compaction
+                if entry["seq"] <= self.sequence:
+                    continue
+                self.state.apply(entry)
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by a crash during an append
+                damaged = True
+                continue
+            self.sequence = entry["seq"]
+            self.pending_entries += 1
+
+        # Start a clean journal so new edits are not appended to a damaged line
+        if damaged:
+            self.compact()
+        return self.state
+
+    def record(self, op: str, **values):
+        """
+        Append an edit to the journal and apply it to the state.
+
+        Args:
+            op: "add", "update", "remove", "settings" or "clear"
+            values: Fields of the entry, e.g. id and fields
+        """
+        # Sequence numbers must continue after the ones already on disk
+        if not self.recovered:
+            self.recover()
+        entry = {"seq": self.sequence + 1, "op": op, **values}
+        self.state.apply(entry)
+        self.sequence += 1
+        try:
+            self._open_journal().write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Could not write to the edit journal: {e}")
+            return
+
+        self.pending_entries += 1
+        if self.pending_entries >= self.compact_every:
+            self.compact()
+
+    def reset(self, state: PortfolioState):
+        """Replace the whole state, e.g. after loading a file, and snapshot it right away"""
+        if not self.recovered:
+            self.recover()
+        self.state = state
+        self.sequence += 1
+        self.compact()
+
+    def compact(self):
+        """Write the state to a new snapshot and truncate the journal"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({"sequence": self.sequence, "state": self.state.to_dict()}, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._path(self.SNAPSHOT_FILE))
+
+            # Entries up to the snapshot sequence are skipped if truncating is interrupted
+            self._close_journal()
+            open(self._path(self.JOURNAL_FILE), 'w', encoding='utf-8').close()
+            self.pending_entries = 0
+        except OSError as e:
+            print(f"Could not compact the edit journal: {e}")
+
+    def _open_journal(self):
+        """Open the journal for appending, line buffered so every edit reaches the OS"""
+        if self._journal is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._journal = open(self._path(self.JOURNAL_FILE), 'a', encoding='utf-8', buffering=1)
+        return self._journal
+
+    def _close_journal(self):
+        """Close the journal file if open"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def close(self):
+        """Compact the journal on a clean exit"""
+        if self.pending_entries:
+            self.compact()
+        self._close_journal()
@@ -0,0 +1,93 @@
+import json
+from PySide6.QtCore import QThread, Signal
+from core.portfolio_stream import read_portfolio_streaming
+from core.binary_portfolio import is_binary_portfolio, read_binary_portfolio_streaming
+
+class PortfolioLoadWorker(QThread):
+    """Worker thread that parses a portfolio file incrementally without blocking the UI"""
+
+    # Signals to communicate with the main thread
+    metadata_ready = Signal(dict)  # metadata
+    batch_ready = Signal(list)  # investment dicts
+    progress_changed = Signal(int)  # percent of the file parsed
+    loading_finished = Signal(str, int)  # file_path, investment count
+    loading_failed = Signal(str)  # error_message
+
+    def __init__(self, file_path, batch_size=500):
+        super().__init__()
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self._last_percent = -1
+        self._is_cancelled = False
+
+    def run(self):
+        """Parse the file and hand records to the UI in batches"""
+        count = 0
+        try:
+            if is_binary_portfolio(self.file_path):
+                events = read_binary_portfolio_streaming(self.file_path, self.batch_size, self._report_progress)
+            else:
+                events = read_portfolio_streaming(self.file_path, self.batch_size, self._report_progress)
+            for kind, value in events:
+                if self._is_cancelled:
+                    return
+                if kind == "metadata":
+                    self.metadata_ready.emit(value)
+                else:
+                    count += len(value)
+                    self.batch_ready.emit(value)
+        except FileNotFoundError:
+            self._fail("The selected file was not found.")
+            return
+        except json.JSONDecodeError:
+            self._fail("The selected file is not a valid JSON file.")
+            return
+        except ValueError as e:
+            self._fail(f"The selected file is not a valid investment file:\n{e}")
+            return
+        except Exception as e:
+            self._fail(f"Failed to load investments: {str(e)}")
+            return
+
+        if not self._is_cancelled:
+            self.loading_finished.emit(self.file_path, count)
+
+    def _report_progress(self, done, total):
+        """Emit progress only when the percentage changes"""
+        percent = int(done * 100 / total) if total else 100
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress_changed.emit(percent)
+
+    def _fail(self, error_message):
+        """Report an error unless the load was cancelled"""
+        if not self._is_cancelled:
+            self.loading_failed.emit(error_message)
+
+    def cancel(self):
+        """Cancel the operation"""
+        self._is_cancelled = True
+        self.requestInterruption()
+
+class PortfolioSaveWorker(QThread):
+    """Worker thread that writes a portfolio file atomically without blocking the UI"""
+
+    # Signals to communicate with the main thread
+    save_finished = Signal(str)  # file_path
+    save_failed = Signal(str)  # error_message
+
+    def __init__(self, file_manager, file_path, save_data):
+        super().__init__()
+        self.file_manager = file_manager
+        self.file_path = file_path
+        self.save_data = save_data
+
+    def run(self):
+        """Write the file, the previous version stays intact if anything fails"""
+        try:
+            self.file_manager.write_portfolio(self.file_path, self.save_data)
+        except Exception as e:
+            self.save_failed.emit(f"Failed to save investments: {str(e)}")
+            return
+        self.file_manager.record_snapshot(self.file_path, self.save_data)
+        self.save_finished.emit(self.file_path)
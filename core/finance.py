@@ -1,3 +1,6 @@
+import numpy as np
+from core.investment_calculator import InvestmentCalculator
+
 class Finance():
     """Class to handle financial calculations for investments"""
     def __init__(self, investment = None):
@@ -124,3 +127,64 @@ class Finance():
             capital.append(total)
 
         return years, capital
+
+def _growth_terms(rates, compound_frequency: str, contribution_frequency: str):
+    """Per-period growth factor and effective rate per contribution of every holding"""
+    n = InvestmentCalculator.get_frequency_multiplier(compound_frequency)
+    m = InvestmentCalculator.get_frequency_multiplier(contribution_frequency)
+    r = np.asarray(rates, dtype=np.float64) / 100
+    base = 1 + r / n
+    effective_rate_per_contribution = base ** (n / m) - 1
+    return n, m, r, base, effective_rate_per_contribution
+
+def _capital_at(P, PMT, n, m, r, base, effective_rate, t):
+    """Capital after `t` years with the same formulas as Finance.calculate, broadcasting over holdings"""
+    initial = P * base ** (n * t)
+    # Contributions of holdings without interest, or whose rate per contribution is too small
+    # to represent, add up linearly; the initial deposit compounds either way
+    linear = (r == 0) | (effective_rate == 0)
+    safe_rate = np.where(linear, 1.0, effective_rate)
+    contribution = PMT * ((1 + safe_rate) ** (m * t) - 1) / safe_rate
+    return initial + np.where(linear, PMT * m * t, contribution)
+
+def project_portfolio(rates, initial_deposits, contribution_amounts, years: float,
+                      compound_frequency: str, contribution_frequency: str):
+    """
+    Vectorized Finance.calculate over many holdings sharing years and frequencies.
+
+    Args:
+        rates: Annual rates in percent, one per holding
+        initial_deposits: Initial deposit of every holding
+        contribution_amounts: Contribution amount of every holding
+        years: Investment duration in years
+        compound_frequency: Compound frequency name
+        contribution_frequency: Contribution frequency name
+
+    Returns:
+        tuple of arrays: (final_capital, profit, invested), one value per holding
+    """
+    n, m, r, base, effective_rate = _growth_terms(rates, compound_frequency, contribution_frequency)
+    P = np.asarray(initial_deposits, dtype=np.float64)
+    PMT = np.asarray(contribution_amounts, dtype=np.float64)
+
+    invested = P + PMT * m * years
+    final_capital = _capital_at(P, PMT, n, m, r, base, effective_rate, years)
+    return final_capital, final_capital - invested, invested
+
+def project_annual_breakdown(rates, initial_deposits, contribution_amounts, years: float,
+                             compound_frequency: str, contribution_frequency: str):
+    """
+    Vectorized Finance.get_annual_breakdown over many holdings.
+
+    Returns:
+        tuple:
+            - years (ndarray of int): Years from 0 up to the investment duration
+            - capital (ndarray): (holdings x years) capital at the end of each year
+    """
+    n, m, r, base, effective_rate = _growth_terms(rates, compound_frequency, contribution_frequency)
+    P = np.asarray(initial_deposits, dtype=np.float64)[:, None]
+    PMT = np.asarray(contribution_amounts, dtype=np.float64)[:, None]
+
+    year_range = np.arange(int(years) + 1)
+    capital = _capital_at(P, PMT, n, m, r[:, None], base[:, None], effective_rate[:, None], year_range[None, :])
+    return year_range, capital
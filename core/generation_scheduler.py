@@ -0,0 +1,137 @@
+from PySide6.QtCore import QObject, QThread, QTimer, Signal
+
+class GenerationWorker(QThread):
+    """Worker thread that computes the result of one request, tagged with its generation"""
+
+    # Signals to communicate with the main thread
+    result_ready = Signal(int, object)  # generation, result
+    request_failed = Signal(int, str)  # generation, error_message
+
+    def __init__(self, generation, request):
+        super().__init__()
+        self.generation = generation
+        self.request = request
+
+    def compute(self, request):
+        """Compute the result of a request, implemented by subclasses"""
+        raise NotImplementedError
+
+    def run(self):
+        """Compute the result, unless a newer request superseded this one"""
+        try:
+            result = self.compute(self.request)
+        except Exception as e:
+            self.request_failed.emit(self.generation, str(e))
+            return
+
+        if not self.isInterruptionRequested():
+            self.result_ready.emit(self.generation, result)
+
+class GenerationScheduler(QObject):
+    """
+    Run requests on a worker thread and publish only the result of the latest one.
+
+    Every request gets a new generation number. Edits are debounced, a running
+    worker is interrupted when a newer request arrives and results of older
+    generations are dropped, so a burst of edits ends with exactly one update.
+    Subclasses set `worker_class` and publish results through their own signals.
+    """
+
+    worker_class = GenerationWorker
+
+    # Wait after the last edit before computing
+    DEBOUNCE_INTERVAL = 300  # milliseconds
+
+    def __init__(self, parent=None, delay=DEBOUNCE_INTERVAL):
+        super().__init__(parent)
+        self.generation = 0
+        self.worker = None
+        self.pending = None  # (generation, request) waiting for the running worker
+        self.read_request = None
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(delay)
+        self.debounce_timer.timeout.connect(self._on_debounce_timeout)
+
+    def schedule(self, read_request):
+        """
+        Request a computation once the edits stop.
+
+        Args:
+            read_request: Callable returning the request, or None if nothing should
+                be computed. It is called once the delay expired.
+        """
+        self.read_request = read_request
+        self.debounce_timer.start()
+
+    def submit(self, request):
+        """Request a computation right away, superseding every earlier request"""
+        self.debounce_timer.stop()
+        self.read_request = None
+        self.generation += 1
+        self.pending = (self.generation, request)
+        if self.worker is not None:
+            self.worker.requestInterruption()
+        else:
+            self._start_pending()
+
+    def cancel(self):
+        """Drop every waiting or running request without publishing it"""
+        self.debounce_timer.stop()
+        self.read_request = None
+        self.pending = None
+        self.generation += 1
+        if self.worker is not None:
+            self.worker.requestInterruption()
+
+    def _on_debounce_timeout(self):
+        """Read the edited request and compute it"""
+        read_request, self.read_request = self.read_request, None
+        request = read_request() if read_request is not None else None
+        if request is not None:
+            self.submit(request)
+
+    def _start_pending(self):
+        """Start the worker for the latest request"""
+        generation, request = self.pending
+        self.pending = None
+        self.worker = self.worker_class(generation, request)
+        self.worker.result_ready.connect(self._on_result_ready)
+        self.worker.request_failed.connect(self._on_request_failed)
+        self.worker.finished.connect(self._on_worker_finished)
+        self.worker.start()
+
+    def _on_result_ready(self, generation, result):
+        """Publish a result unless a newer request arrived meanwhile"""
+        if generation == self.generation:
+            self.publish(result)
+
+    def _on_request_failed(self, generation, error_message):
+        """Report a failure unless a newer request arrived meanwhile"""
+        if generation == self.generation:
+            self.report_failure(error_message)
+
+    def publish(self, result):
+        """Emit the result of the latest request, implemented by subclasses"""
+        raise NotImplementedError
+
+    def report_failure(self, error_message):
+        """Emit the failure of the latest request, implemented by subclasses"""
+        raise NotImplementedError
+
+    def _on_worker_finished(self):
+        """Release the finished worker and run the request that waited for it"""
+        self.worker.deleteLater()
+        self.worker = None
+        if self.pending is not None:
+            self._start_pending()
+
+    def is_busy(self):
+        """Check if a request is waiting or running"""
+        return self.debounce_timer.isActive() or self.worker is not None or self.pending is not None
+
+    def shutdown(self):
+        """Drop the waiting requests and wait for the running worker"""
+        self.cancel()
+        if self.worker is not None:
+            self.worker.wait()
@@ -1,203 +1,224 @@
+import codecs
 import json
 import os
-from typing import List, Dict, Optional
-from PySide6.QtWidgets import QFileDialog, QMessageBox
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
+from core.session import SessionState
+from core.binary_portfolio import BinaryPortfolio, dump_binary_portfolio, is_binary_portfolio
+from core.portfolio_validator import PortfolioValidationError, ValidationIssue, ValidationReport, validate_portfolio
+from core.csv_export import write_portfolio_csv
+from core.columnar_export import export_breakdown
+from core.snapshot_store import SnapshotStore
 
 class InvestmentFileManager:
-    """Manager for saving and loading investments from files"""
+    """Manager for saving and loading investments from files, without any GUI dependency"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[SessionState] = None, snapshot_store: Optional[SnapshotStore] = None):
         self.default_extension = "json"
-        self.file_filter = "Investment Files (*.json);;All Files (*)"
+        self.binary_extension = "invb"
+        self.session = session or SessionState()
+        self.snapshot_store = snapshot_store  # Saves are recorded in the history if set
         
-    def save_investments_to_file(self, parent_widget, investments_data: List[Dict], 
-                                years: int, compound_freq: str, contrib_freq: str) -> bool:
+    def save_investments(self, file_path: str, investments_data: List[Dict], 
+                         years: int, compound_freq: str, contrib_freq: str):
         """
-        Save investments to a JSON file
+        Save investments to a JSON file, or a binary file if the name ends with .invb
         
         Args:
-            parent_widget: Parent widget for dialogs
+            file_path: Destination path
             investments_data: List of investment data
             years: Years of growth
             compound_freq: Compound frequency
             contrib_freq: Contribution frequency
-            
-        Returns:
-            bool: True if save successful, False otherwise
         """
+        save_data = self.build_save_data(investments_data, years, compound_freq, contrib_freq)
+        self.write_portfolio(file_path, save_data)
+        self.record_snapshot(file_path, save_data)
+        self.remember_file(file_path)
+    
+    @staticmethod
+    def build_save_data(investments_data: List[Dict], years: int, 
+                        compound_freq: str, contrib_freq: str) -> Dict:
+        """Build the document written to investment files"""
+        return {
+            "metadata": {
+                "version": "3.0",
+                "created_at": datetime.now().isoformat(),
+                "years": years,
+                "compound_frequency": compound_freq,
+                "contribution_frequency": contrib_freq
+            },
+            "investments": investments_data
+        }
+    
+    def write_portfolio(self, file_path: str, save_data: Dict):
+        """
+        Write a portfolio document without ever leaving a partially written file
+        
+        The document is written to a temporary file in the same directory, flushed to
+        disk and then renamed over the target, so a crash keeps the previous file intact.
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        temp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp")
+        
+        # Created like a regular file, so the saved file gets the usual permissions
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
         try:
-            # Open dialog to choose save location
-            file_path, _ = QFileDialog.getSaveFileName(
-                parent_widget,
-                "Save Investments",
-                f"investments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                self.file_filter
-            )
-            
-            if not file_path:
-                return False
-                
-            # Prepare data to save
-            save_data = {
-                "metadata": {
-                    "version": "3.0",
-                    "created_at": datetime.now().isoformat(),
-                    "years": years,
-                    "compound_frequency": compound_freq,
-                    "contribution_frequency": contrib_freq
-                },
-                "investments": investments_data
-            }
-            
-            # Save to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
-                
-            self._show_message(parent_widget, "Success", f"Investments saved to {os.path.basename(file_path)}")
-            return True
-            
-        except Exception as e:
-            self._show_error(parent_widget, "Save Error", f"Failed to save investments: {str(e)}")
-            return False
+            with os.fdopen(fd, 'wb') as f:
+                if self.is_binary_path(file_path):
+                    dump_binary_portfolio(save_data, f)
+                else:
+                    json.dump(save_data, codecs.getwriter('utf-8')(f), indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        
+        # Persist the rename itself (not supported on Windows)
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
     
-    def load_investments_from_file(self, parent_widget) -> Optional[Dict]:
+    def load_investments(self, file_path: str) -> Dict:
         """
-        Load investments from a JSON file
+        Load and validate investments from a JSON or binary file
         
         Args:
-            parent_widget: Parent widget for dialogs
+            file_path: Path of the file
             
         Returns:
-            Dict with loaded data or None if failed
+            Dict with the loaded data
+            
+        Raises:
+            OSError: If the file cannot be read
+            json.JSONDecodeError: If the file is not valid JSON
+            PortfolioValidationError: If the file is not a valid investment file
         """
+        data = self.read_portfolio(file_path)
+        report = self.validate_file(data)
+        if not report.is_valid:
+            raise PortfolioValidationError(report)
+        self.remember_file(file_path)
+        return data
+    
+    def is_binary_path(self, file_path: str) -> bool:
+        """Check if a path should be saved in the binary format"""
+        return file_path.lower().endswith("." + self.binary_extension)
+    
+    @staticmethod
+    def read_portfolio(file_path: str) -> Dict:
+        """Read a whole portfolio document, detecting the binary format from the file header"""
+        if is_binary_portfolio(file_path):
+            return BinaryPortfolio(file_path).to_dict()
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def validate_file(self, data: Dict) -> ValidationReport:
+        """Validate a loaded file, reporting every invalid field of every record"""
+        return validate_portfolio(data)
+    
+    def remember_file(self, file_path: str):
+        """Remember the file as the last used portfolio for the next startup"""
         try:
-            # Open dialog to choose file to load
-            file_path, _ = QFileDialog.getOpenFileName(
-                parent_widget,
-                "Load Investments",
-                "",
-                self.file_filter
-            )
-            
-            if not file_path:
-                return None
-                
-            # Load from file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            # Validate file structure
-            if not self._validate_file_structure(data):
-                self._show_error(parent_widget, "Invalid File", 
-                               "The selected file is not a valid investment file.")
-                return None
-                
-            self._show_message(parent_widget, "Success", f"Investments loaded from {os.path.basename(file_path)}")
-            return data
-            
-        except FileNotFoundError:
-            self._show_error(parent_widget, "File Not Found", "The selected file was not found.")
-        except json.JSONDecodeError:
-            self._show_error(parent_widget, "Invalid File", "The selected file is not a valid JSON file.")
+            self.session.set_last_portfolio(file_path)
+        except OSError as e:
+            print(f"Could not store session state: {e}")
+    
+    def record_snapshot(self, file_path: str, save_data: Dict):
+        """Record a saved portfolio in the snapshot history, a failure does not fail the save"""
+        if self.snapshot_store is None:
+            return
+        try:
+            self.snapshot_store.add(save_data, os.path.basename(file_path))
         except Exception as e:
-            self._show_error(parent_widget, "Load Error", f"Failed to load investments: {str(e)}")
-            
-        return None
+            print(f"Could not record portfolio snapshot: {e}")
     
-    def _validate_file_structure(self, data: Dict) -> bool:
-        """Validate the structure of loaded file"""
-        if not isinstance(data, dict):
-            return False
-            
-        if 'metadata' not in data or 'investments' not in data:
-            return False
-            
-        metadata = data['metadata']
-        required_metadata = ['years', 'compound_frequency', 'contribution_frequency']
-        
-        if not all(key in metadata for key in required_metadata):
-            return False
-            
-        if not isinstance(data['investments'], list):
-            return False
+    @staticmethod
+    def read_portfolio_tickers(file_path: str) -> List[str]:
+        """Read the unique ticker symbols of a saved portfolio file"""
+        if is_binary_portfolio(file_path):
+            # Only the string table is read, the other fields stay on disk
+            symbols = BinaryPortfolio(file_path).tickers()
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            symbols = [investment.get('ticker', '') for investment in data.get('investments', [])]
             
-        # Validate each investment
-        for investment in data['investments']:
-            if not isinstance(investment, dict):
-                return False
-                
-            required_fields = ['ticker', 'rate', 'initial_deposit', 'contribution_amount']
-            if not all(key in investment for key in required_fields):
-                return False
-                
-        return True
-    
-    def _show_message(self, parent, title: str, message: str):
-        """Show information message"""
-        QMessageBox.information(parent, title, message)
-        
-    def _show_error(self, parent, title: str, message: str):
-        """Show error message"""
-        QMessageBox.critical(parent, title, message)
+        tickers = []
+        seen = set()
+        for symbol in symbols:
+            ticker = str(symbol).strip().upper()
+            if ticker and ticker not in seen:
+                seen.add(ticker)
+                tickers.append(ticker)
+        return tickers
     
-    def export_to_csv(self, parent_widget, investments_data: List[Dict], 
-                      years: int, compound_freq: str, contrib_freq: str) -> bool:
+    def export_to_csv(self, file_path: str, investments_data: List[Dict], 
+                      years: int, compound_freq: str, contrib_freq: str,
+                      include_breakdown: bool = False):
         """
         Export investments to CSV format for Excel
+        
+        Args:
+            file_path: Destination path
+            investments_data: List of investment data
+            years: Years of growth
+            compound_freq: Compound frequency
+            contrib_freq: Contribution frequency
+            include_breakdown: Add the year-by-year capital of every holding
         """
-        try:
-            import csv
-            
-            file_path, _ = QFileDialog.getSaveFileName(
-                parent_widget,
-                "Export to CSV",
-                f"investments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                "CSV Files (*.csv);;All Files (*)"
-            )
-            
-            if not file_path:
-                return False
-                
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                # Write general information
-                writer.writerow(["Investment Portfolio Export"])
-                writer.writerow(["Export Date:", datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-                writer.writerow(["Years of Growth:", years])
-                writer.writerow(["Compound Frequency:", compound_freq])
-                writer.writerow(["Contribution Frequency:", contrib_freq])
-                writer.writerow([])  # Empty row
-                
-                # Write investment header
-                writer.writerow([
-                    "Ticker", "Annual Rate (%)", "Initial Deposit", 
-                    "Contribution Amount", "Expected Final Value"
-                ])
-                
-                # Write investment data
-                for inv in investments_data:
-                    # Calculate approximate final value
-                    # (this is simplified, use your calculator for precise values)
-                    rate = inv['rate'] / 100
-                    initial = inv['initial_deposit']
-                    contribution = inv['contribution_amount']
-                    
-                    # Simplified annual calculation
-                    final_value = initial * ((1 + rate) ** years) + contribution * years * (1 + rate)
-                    
-                    writer.writerow([
-                        inv['ticker'],
-                        f"{inv['rate']:.2f}",
-                        f"{initial:.2f}",
-                        f"{contribution:.2f}",
-                        f"{final_value:.2f}"
-                    ])
-                    
-            self._show_message(parent_widget, "Success", f"Data exported to {os.path.basename(file_path)}")
-            return True
+        write_portfolio_csv(file_path, investments_data, years, compound_freq, contrib_freq, include_breakdown)
+    
+    def export_columnar(self, file_path: str, investments_data: List[Dict], 
+                        years: int, compound_freq: str, contrib_freq: str,
+                        columns: Optional[List[str]] = None, volatility: Optional[float] = None) -> str:
+        """
+        Export the year-by-year projection to Parquet, or NumPy .npz without pyarrow
+        
+        Args:
+            file_path: Destination path
+            investments_data: List of investment data
+            years: Years of growth
+            compound_freq: Compound frequency
+            contrib_freq: Contribution frequency
+            columns: Columns to write, all of them if None
+            volatility: Volatility in percent to export the percentile bands with, None to skip them
             
-        except Exception as e:
-            self._show_error(parent_widget, "Export Error", f"Failed to export data: {str(e)}")
-            return False
\ No newline at end of file
+        Returns:
+            str: The path written
+        """
+        return export_breakdown(file_path, investments_data, years, compound_freq, contrib_freq, columns,
+                                volatility=volatility)
+
+def _validate_portfolio_file(file_path: str) -> ValidationReport:
+    """Read and validate one portfolio file, reporting read errors as problems"""
+    try:
+        data = InvestmentFileManager.read_portfolio(file_path)
+    except (OSError, ValueError) as e:
+        return ValidationReport([ValidationIssue(None, None, f"Could not read the file: {e}")])
+    return validate_portfolio(data)
+
+def validate_portfolio_files(file_paths: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, ValidationReport]:
+    """
+    Validate many portfolio files in parallel worker processes
+    
+    Args:
+        file_paths: Paths of the portfolio files
+        max_workers: Number of processes, the number of CPUs by default
+        
+    Returns:
+        Dict mapping every path to its validation report
+    """
+    file_paths = list(file_paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(file_paths, executor.map(_validate_portfolio_file, file_paths)))
@@ -0,0 +1,152 @@
+import json
+import os
+from typing import Callable, Dict, Iterator, Optional, Tuple, Any
+from core.portfolio_validator import PortfolioValidator
+
+class _ChunkedJsonReader:
+    """Decode JSON values one at a time from a file read in fixed-size chunks"""
+
+    def __init__(self, file_obj, chunk_size: int):
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping the consumed part of the buffer"""
+        if self.eof:
+            return False
+        chunk = self.file_obj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise json.JSONDecodeError("Unexpected end of file", self.buffer, self.pos)
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of `chars`"""
+        char = self.peek()
+        if char not in chars:
+            raise json.JSONDecodeError(f"Expected one of {chars!r}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer end may be a truncated number
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+def iter_portfolio_events(file_obj, chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """
+    Parse a portfolio file incrementally.
+
+    Only one investment record is decoded at a time, so memory stays bounded by the
+    chunk size and the size of a single record, whatever the number of holdings.
+    Invalid records are not yielded; once the whole file is read, every problem found
+    is reported at once.
+
+    Args:
+        file_obj: Text file object opened for reading
+        chunk_size: Number of characters read at a time
+
+    Yields:
+        tuple: ("metadata", dict) once and ("investment", dict) for every valid record,
+        in file order
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON
+        PortfolioValidationError: If the file is not a valid investment file
+    """
+    reader = _ChunkedJsonReader(file_obj, chunk_size)
+    validator = PortfolioValidator()
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.value()
+            reader.expect(":")
+
+            if key == "investments":
+                yield from _iter_investments(reader, validator)
+            else:
+                value = reader.value()
+                if key == "metadata" and validator.check_metadata(value):
+                    yield "metadata", value
+
+            if reader.expect(",}") == "}":
+                break
+
+    validator.raise_if_invalid()
+
+def _iter_investments(reader: _ChunkedJsonReader, validator: PortfolioValidator) -> Iterator[Tuple[str, Dict]]:
+    """Decode the investments array one record at a time"""
+    validator.has_investments = True
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.expect("]")
+        return
+
+    index = 0
+    while True:
+        investment = reader.value()
+        if validator.check_investment(investment, index):
+            yield "investment", investment
+        index += 1
+        if reader.expect(",]") == "]":
+            return
+
+def read_portfolio_streaming(file_path: str, batch_size: int = 500,
+                             progress_callback: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a portfolio file from disk in batches.
+
+    Args:
+        file_path: Path of the portfolio file
+        batch_size: Maximum number of investments per batch
+        progress_callback: Called with (bytes_read, total_bytes)
+
+    Yields:
+        tuple: ("metadata", dict) and ("batch", list of investment dicts)
+    """
+    total = os.path.getsize(file_path)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        batch = []
+        for kind, value in iter_portfolio_events(f):
+            if kind == "metadata":
+                yield "metadata", value
+                continue
+            batch.append(value)
+            if len(batch) >= batch_size:
+                if progress_callback is not None:
+                    progress_callback(min(f.buffer.tell(), total), total)
+                yield "batch", batch
+                batch = []
+        if progress_callback is not None:
+            progress_callback(total, total)
+        if batch:
+            yield "batch", batch
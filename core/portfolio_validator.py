@@ -0,0 +1,206 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+from core.investment_calculator import InvestmentCalculator
+
+FREQUENCIES = frozenset(InvestmentCalculator.FREQUENCY_MAP)
+FREQUENCY_CHOICES = ", ".join(InvestmentCalculator.FREQUENCY_MAP)
+
+# Sentinel for fields absent from a record
+_MISSING = object()
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """Data class to represent one problem found in a portfolio file"""
+    index: Optional[int]  # Investment index, None for the metadata and the document
+    field: Optional[str]  # Offending field, None if the whole section is invalid
+    message: str
+
+    def __str__(self) -> str:
+        if self.index is None:
+            if self.field is None:
+                return self.message
+            return f"Invalid metadata: field '{self.field}' {self.message}"
+        if self.field is None:
+            return f"Investment at index {self.index} {self.message}"
+        return f"Investment at index {self.index}: field '{self.field}' {self.message}"
+
+@dataclass
+class ValidationReport:
+    """Data class to represent the result of validating a portfolio"""
+    issues: List[ValidationIssue] = field(default_factory=list)
+    record_count: int = 0
+
+    @property
+    def is_valid(self) -> bool:
+        """True if no problem was found"""
+        return not self.issues
+
+    def invalid_indices(self) -> List[int]:
+        """Indices of all investments with at least one problem"""
+        return sorted({issue.index for issue in self.issues if issue.index is not None})
+
+    def summary(self, limit: int = 10) -> str:
+        """Describe the first `limit` problems, one per line"""
+        lines = [str(issue) for issue in self.issues[:limit]]
+        if len(self.issues) > limit:
+            lines.append(f"... and {len(self.issues) - limit} more problems")
+        return "\n".join(lines)
+
+class PortfolioValidationError(ValueError):
+    """Raised when a portfolio file has invalid content, carrying the full report"""
+
+    def __init__(self, report: ValidationReport):
+        super().__init__(report.summary())
+        self.report = report
+
+def _number_problem(value, minimum: float, inclusive: bool) -> Optional[str]:
+    """Describe why a value is not a finite number in range, or return None"""
+    value_type = type(value)
+    if value_type is not float and value_type is not int:
+        return "must be a number"
+    if value_type is float and not math.isfinite(value):
+        return "must be a finite number"
+    if value < minimum or (not inclusive and value == minimum):
+        return f"must be {'at least' if inclusive else 'greater than'} {minimum:g}"
+    return None
+
+class PortfolioValidator:
+    """
+    Single-pass validator of portfolio documents.
+
+    Records can be checked one at a time (while streaming a file) or all at once with
+    `validate_portfolio`. Every problem is collected instead of stopping at the first.
+    """
+
+    # (field, minimum, whether the minimum itself is allowed) of the required numbers
+    NUMBER_RULES = (
+        ('rate', -100.0, False),
+        ('initial_deposit', 0.0, True),
+        ('contribution_amount', 0.0, True),
+    )
+
+    def __init__(self):
+        self.issues: List[ValidationIssue] = []
+        self.record_count = 0
+        self.has_metadata = False
+        self.has_investments = False
+
+    def _add(self, index: Optional[int], field_name: Optional[str], message: str):
+        """Record a problem"""
+        self.issues.append(ValidationIssue(index, field_name, message))
+
+    def check_metadata(self, metadata: Any) -> bool:
+        """Check the metadata section, returning True if it is valid"""
+        self.has_metadata = True
+        if not isinstance(metadata, dict):
+            self._add(None, None, "Invalid metadata: it must be an object")
+            return False
+
+        valid = True
+        years = metadata.get('years', _MISSING)
+        if years is _MISSING:
+            self._add(None, 'years', "is missing")
+            valid = False
+        else:
+            problem = _number_problem(years, 0.0, False)
+            if problem:
+                self._add(None, 'years', problem)
+                valid = False
+
+        for name in ('compound_frequency', 'contribution_frequency'):
+            frequency = metadata.get(name, _MISSING)
+            if frequency is _MISSING:
+                self._add(None, name, "is missing")
+                valid = False
+            elif type(frequency) is not str or frequency not in FREQUENCIES:
+                self._add(None, name, f"must be one of {FREQUENCY_CHOICES}")
+                valid = False
+        return valid
+
+    def check_investment(self, investment: Any, index: int) -> bool:
+        """Check one investment record, returning True if it is valid"""
+        self.record_count += 1
+        if type(investment) is not dict:
+            self._add(index, None, "must be an object")
+            return False
+
+        valid = True
+        get = investment.get
+        ticker = get('ticker', _MISSING)
+        if ticker is _MISSING:
+            self._add(index, 'ticker', "is missing")
+            valid = False
+        elif type(ticker) is not str or not ticker.strip():
+            self._add(index, 'ticker', "must be a non-empty string")
+            valid = False
+
+        for name, minimum, inclusive in self.NUMBER_RULES:
+            value = get(name, _MISSING)
+            if value is _MISSING:
+                self._add(index, name, "is missing")
+                valid = False
+                continue
+            problem = _number_problem(value, minimum, inclusive)
+            if problem:
+                self._add(index, name, problem)
+                valid = False
+
+        # Optional per-investment overrides
+        years = get('years', _MISSING)
+        if years is not _MISSING:
+            problem = _number_problem(years, 0.0, False)
+            if problem:
+                self._add(index, 'years', problem)
+                valid = False
+        for name in ('compound_frequency', 'contribution_frequency'):
+            frequency = get(name, _MISSING)
+            if frequency is not _MISSING and (type(frequency) is not str or frequency not in FREQUENCIES):
+                self._add(index, name, f"must be one of {FREQUENCY_CHOICES}")
+                valid = False
+        return valid
+
+    def check_investments(self, investments: Any) -> bool:
+        """Check the investments section, returning True if every record is valid"""
+        self.has_investments = True
+        if not isinstance(investments, list):
+            self._add(None, None, "The investments must be a list")
+            return False
+        check = self.check_investment
+        valid = True
+        for index, investment in enumerate(investments):
+            if not check(investment, index):
+                valid = False
+        return valid
+
+    def finish(self) -> ValidationReport:
+        """Check that both sections were seen and return the report"""
+        if not self.has_metadata or not self.has_investments:
+            self._add(None, None, "The file does not contain metadata and investments")
+        return ValidationReport(self.issues, self.record_count)
+
+    def raise_if_invalid(self):
+        """Finish validation, raising PortfolioValidationError if any problem was found"""
+        report = self.finish()
+        if not report.is_valid:
+            raise PortfolioValidationError(report)
+
+def validate_portfolio(data: Any) -> ValidationReport:
+    """
+    Validate a whole portfolio document in one pass.
+
+    Args:
+        data: Decoded portfolio document
+
+    Returns:
+        ValidationReport listing every problem with its investment index and field
+    """
+    validator = PortfolioValidator()
+    if not isinstance(data, dict):
+        validator._add(None, None, "The file must contain a JSON object")
+        return ValidationReport(validator.issues)
+    if 'metadata' in data:
+        validator.check_metadata(data['metadata'])
+    if 'investments' in data:
+        validator.check_investments(data['investments'])
+    return validator.finish()
@@ -0,0 +1,244 @@
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from core.session import get_app_data_dir
+from core.rolling_stats import close_prices
+from core.ticker_cache import ticker_cache
+
+class PriceMatrixStore:
+    """
+    Aligned daily close prices of many tickers in a memory-mapped (dates x tickers) matrix.
+
+    The store is a directory with three files:
+        - prices.<generation>.f8: float64 matrix in row-major order, one row per date, NaN if missing
+        - dates.<generation>.i8: int64 days since epoch of every row, in increasing order
+        - index.json: current generation, ticker of every column, number of rows and when
+          the prices of every ticker were last stored
+
+    Readers map the files read-only, so any number of processes share the same pages
+    without copying. New dates are appended after the indexed rows of both files; only adding a
+    ticker or a date before the last stored one writes a new generation of the matrix,
+    which is swapped in by replacing the index so readers never see a partial rewrite.
+    """
+
+    PRICES_FILE = "prices.{generation}.f8"
+    DATES_FILE = "dates.{generation}.i8"
+    INDEX_FILE = "index.json"
+    VERSION = 1
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(get_app_data_dir(), "price_store")
+        self._index = self._read_index()
+        self._remove_old_generations()
+
+    def _path(self, name: str) -> str:
+        """Get the path of a store file"""
+        return os.path.join(self.directory, name)
+
+    def _read_index(self) -> Dict:
+        """Read the index file, returning an empty index if the store does not exist"""
+        try:
+            with open(self._path(self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"version": self.VERSION, "generation": 0, "tickers": [], "rows": 0, "fetched_at": {}}
+
+    def _prices_path(self, generation: Optional[int] = None) -> str:
+        """Get the path of the prices file of a generation (the current one by default)"""
+        generation = self._index["generation"] if generation is None else generation
+        return self._path(self.PRICES_FILE.format(generation=generation))
+
+    def _dates_path(self, generation: Optional[int] = None) -> str:
+        """Get the path of the dates file of a generation (the current one by default)"""
+        generation = self._index["generation"] if generation is None else generation
+        return self._path(self.DATES_FILE.format(generation=generation))
+
+    def _write_index(self, tickers: List[str], rows: int, generation: int, fetched_at: Dict[str, float]):
+        """Atomically replace the index file"""
+        self._index = {"version": self.VERSION, "generation": generation, "tickers": tickers, "rows": rows,
+                       "fetched_at": fetched_at}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, self._path(self.INDEX_FILE))
+
+    def _remove_old_generations(self):
+        """Delete the files of generations older than the indexed one"""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            parts = name.split('.')
+            if (len(parts) == 3 and parts[0] in ("prices", "dates") and parts[1].isdigit()
+                    and int(parts[1]) < self._index["generation"]):
+                try:
+                    os.remove(self._path(name))
+                except OSError:
+                    # Still mapped by a reader on Windows, removed on a later open
+                    pass
+
+    def refresh(self):
+        """Re-read the index to see rows and tickers added by other writers"""
+        self._index = self._read_index()
+
+    @property
+    def tickers(self) -> List[str]:
+        """Ticker of every column"""
+        return list(self._index["tickers"])
+
+    def fetched_at(self, ticker: str) -> Optional[float]:
+        """When the prices of a ticker were last stored (seconds since epoch), or None if unknown"""
+        return self._index.get("fetched_at", {}).get(ticker.strip().upper())
+
+    @property
+    def rows(self) -> int:
+        """Number of stored dates"""
+        return self._index["rows"]
+
+    def dates(self) -> np.ndarray:
+        """Read-only datetime64[D] view of the stored dates"""
+        return self._raw_days().view('datetime64[D]')
+
+    def _raw_days(self) -> np.ndarray:
+        """Read-only view of the stored dates as days since epoch"""
+        if self.rows == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.memmap(self._dates_path(), dtype=np.int64, mode='r', shape=(self.rows,))
+
+    def prices(self) -> np.ndarray:
+        """Read-only (dates x tickers) view of the stored close prices"""
+        columns = len(self._index["tickers"])
+        if self.rows == 0 or columns == 0:
+            return np.empty((self.rows, columns), dtype=np.float64)
+        return np.memmap(self._prices_path(), dtype=np.float64, mode='r', shape=(self.rows, columns))
+
+    def column(self, ticker: str) -> Optional[np.ndarray]:
+        """Read-only view of the close prices of one ticker, or None if not stored"""
+        ticker = ticker.strip().upper()
+        if ticker not in self._index["tickers"]:
+            return None
+        return self.prices()[:, self._index["tickers"].index(ticker)]
+
+    def window(self, start, end) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the dates and prices between two dates (inclusive) as views.
+
+        Args:
+            start: First date, anything accepted by numpy.datetime64
+            end: Last date, anything accepted by numpy.datetime64
+        """
+        days = self._raw_days()
+        first = np.searchsorted(days, np.datetime64(start, 'D').astype(np.int64), side='left')
+        last = np.searchsorted(days, np.datetime64(end, 'D').astype(np.int64), side='right')
+        return self.dates()[first:last], self.prices()[first:last]
+
+    def history(self, ticker: str):
+        """Rebuild a price history DataFrame with a 'Close' column for one ticker"""
+        import pandas as pd
+        prices = self.column(ticker)
+        if prices is None:
+            return None
+        valid = ~np.isnan(prices)
+        return pd.DataFrame({'Close': np.array(prices[valid])},
+                            index=pd.DatetimeIndex(self.dates()[valid].astype('datetime64[ns]')))
+
+    def update(self, histories: Dict[str, object], fetched_at: Optional[Dict[str, float]] = None):
+        """
+        Merge price histories into the store.
+
+        Args:
+            histories: ticker -> DataFrame with a 'Close' column and a date index
+            fetched_at: ticker -> when its prices were downloaded (seconds since epoch), now if missing
+        """
+        series = {}
+        for ticker, history in histories.items():
+            if history is None or len(history) == 0:
+                continue
+            series[ticker.strip().upper()] = close_prices(history)
+        if not series:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.refresh()
+        stored_days = np.array(self._raw_days())
+        tickers = self.tickers
+        fetched_times = dict(self._index.get("fetched_at", {}))
+        now = time.time()
+        fetched_times.update((ticker, (fetched_at or {}).get(ticker, now)) for ticker in series)
+
+        new_tickers = [t for t in series if t not in tickers]
+        incoming_days = np.unique(np.concatenate([days for days, _ in series.values()]))
+        new_days = np.setdiff1d(incoming_days, stored_days, assume_unique=True)
+
+        if new_tickers or (len(stored_days) and len(new_days) and new_days[0] <= stored_days[-1]):
+            self._rebuild(tickers + new_tickers, np.union1d(stored_days, new_days), series, fetched_times)
+        else:
+            self._append(tickers, stored_days, new_days, series, fetched_times)
+
+    def update_from_cache(self, cache=ticker_cache):
+        """Store the histories of every ticker in the cache, with the time they were fetched"""
+        entries = {ticker: cache.get(ticker) for ticker in cache.tickers()}
+        entries = {ticker: entry for ticker, entry in entries.items() if entry is not None}
+        self.update({ticker: entry.history for ticker, entry in entries.items()},
+                    {ticker: entry.fetched_at for ticker, entry in entries.items()})
+
+    def _append(self, tickers: List[str], stored_days: np.ndarray, new_days: np.ndarray,
+                series: Dict[str, Tuple[np.ndarray, np.ndarray]], fetched_at: Dict[str, float]):
+        """Append rows for dates after the last stored one and fill existing rows in place"""
+        all_days = np.concatenate([stored_days, new_days])
+        rows = np.full((len(new_days), len(tickers)), np.nan)
+        for ticker, (days, prices) in series.items():
+            column = tickers.index(ticker)
+            positions = np.searchsorted(all_days, days)
+            appended = positions >= len(stored_days)
+            rows[positions[appended] - len(stored_days), column] = prices[appended]
+            self._fill_existing(column, positions[~appended], prices[~appended], len(stored_days), len(tickers))
+
+        stored_rows = len(stored_days)
+        for path, size, data in ((self._prices_path(), stored_rows * len(tickers) * 8, rows),
+                                 (self._dates_path(), stored_rows * 8, new_days.astype(np.int64))):
+            with open(path, 'ab') as f:
+                # Drop bytes past the indexed rows, left by a write interrupted before the index was updated
+                f.truncate(size)
+                f.write(data.tobytes())
+        self._write_index(tickers, len(all_days), self._index["generation"], fetched_at)
+
+    def _fill_existing(self, column: int, positions: np.ndarray, prices: np.ndarray, rows: int, columns: int):
+        """Write prices of already stored dates in place"""
+        if len(positions) == 0:
+            return
+        matrix = np.memmap(self._prices_path(), dtype=np.float64, mode='r+', shape=(rows, columns))
+        matrix[positions, column] = prices
+        matrix.flush()
+
+    def _rebuild(self, tickers: List[str], all_days: np.ndarray,
+                 series: Dict[str, Tuple[np.ndarray, np.ndarray]], fetched_at: Dict[str, float]):
+        """Rewrite the whole matrix with new columns or dates inserted in the middle"""
+        old_prices = self.prices()
+        old_days = self._raw_days()
+        matrix = np.full((len(all_days), len(tickers)), np.nan)
+        if len(old_days):
+            matrix[np.searchsorted(all_days, old_days), :old_prices.shape[1]] = old_prices
+        for ticker, (days, prices) in series.items():
+            matrix[np.searchsorted(all_days, days), tickers.index(ticker)] = prices
+
+        # Write the next generation next to the current one, then switch the index to it
+        old_generation = self._index["generation"]
+        generation = old_generation + 1
+        with open(self._prices_path(generation), 'wb') as f:
+            f.write(matrix.tobytes())
+        with open(self._dates_path(generation), 'wb') as f:
+            f.write(all_days.astype(np.int64).tobytes())
+        self._write_index(tickers, len(all_days), generation, fetched_at)
+
+        # Readers still mapping the old generation keep their pages until they unmap them,
+        # on Windows the files cannot be removed before and are left to the next open
+        for path in (self._prices_path(old_generation), self._dates_path(old_generation)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
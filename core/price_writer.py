@@ -0,0 +1,61 @@
+import concurrent.futures
+import threading
+
+class PriceStoreWriter:
+    """
+    Write downloaded price histories to the local price store on a background thread.
+
+    Batches are written one after the other in the order they were submitted, so
+    fetches finishing at the same time never write the store concurrently and the
+    UI thread never waits for the disk.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="price-store")
+
+    def submit(self, histories):
+        """
+        Queue price histories to be merged into the store.
+
+        Args:
+            histories: ticker -> DataFrame with a 'Close' column and a date index
+        """
+        histories = {ticker: history for ticker, history in histories.items() if history is not None}
+        if not histories:
+            return None
+        return self._executor.submit(self._write, histories)
+
+    def _write(self, histories):
+        """Merge one batch into the store, keeping the writer alive on errors"""
+        # Imported here, the price store pulls in numpy
+        from core.price_store import PriceMatrixStore
+        try:
+            if self.store is None:
+                self.store = PriceMatrixStore()
+            self.store.update(histories)
+        except Exception as e:
+            print(f"Error storing prices: {e}")
+
+    def shutdown(self, wait=True):
+        """Stop accepting batches, by default after the queued ones are written"""
+        self._executor.shutdown(wait=wait)
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_price_writer():
+    """Get the shared price store writer, creating it on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PriceStoreWriter()
+        return _writer
+
+def shutdown_price_writer():
+    """Write the queued batches and stop the shared writer if it was started"""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.shutdown()
+            _writer = None
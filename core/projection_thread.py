@@ -0,0 +1,32 @@
+from PySide6.QtCore import Signal
+from core.generation_scheduler import GenerationScheduler, GenerationWorker
+
+class ProjectionWorker(GenerationWorker):
+    """Worker thread that computes the projection of one investment"""
+
+    def compute(self, investment):
+        """Compute the results and the yearly breakdown"""
+        from core.finance import Finance
+        finance = Finance(dict(investment))  # Finance updates the dict, the UI keeps its own
+        if self.isInterruptionRequested():
+            return None
+        results = finance.get_results()
+        years, capital = finance.get_annual_breakdown()
+        return results, years, capital
+
+class ProjectionScheduler(GenerationScheduler):
+    """Run projections off the UI thread and publish only the latest one"""
+
+    worker_class = ProjectionWorker
+
+    # Emitted with the projection of the latest request
+    projection_ready = Signal(dict, object, object)  # results, years, capital
+    projection_failed = Signal(str)  # error_message
+
+    def publish(self, result):
+        """Emit the projection of the latest request"""
+        self.projection_ready.emit(*result)
+
+    def report_failure(self, error_message):
+        """Emit the failure of the latest request"""
+        self.projection_failed.emit(error_message)
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from core.ticker_cache import ticker_cache
+
+# Window lengths in years computed by default
+DEFAULT_WINDOWS = (1, 3, 5)
+# A window is summarized only if the history spans this many window lengths,
+# fewer start dates would describe a handful of overlapping windows
+MIN_HISTORY_WINDOWS = 2
+
+@dataclass
+class RollingReturnStats:
+    """Data class to represent the distribution of rolling-window CAGRs"""
+    window_years: float
+    count: int
+    mean: float
+    median: float
+    std: float
+    min: float
+    max: float
+    p5: float
+    p25: float
+    p75: float
+    p95: float
+    values: np.ndarray
+
+def close_prices(history) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract the trading days and positive close prices of a price history.
+
+    Returns:
+        tuple:
+            - days (np.ndarray of int64): days since epoch of every close
+            - prices (np.ndarray of float64): the matching close prices
+    """
+    close = history['Close']
+    prices = np.asarray(close, dtype=np.float64).reshape(len(close), -1)[:, 0]
+    days = np.asarray(history.index.values).astype('datetime64[D]').astype(np.int64)
+
+    valid = np.isfinite(prices) & (prices > 0)
+    return days[valid], prices[valid]
+
+def rolling_cagr(days: np.ndarray, prices: np.ndarray, window_years: float) -> np.ndarray:
+    """
+    Calculate the CAGR in percent of every window of `window_years` in the history.
+
+    The cumulative log return up to day i is log(P_i / P_0), so the return of any
+    window is the difference of two entries. Window ends are found for all starts at
+    once with a binary search over the sorted days, so the whole distribution costs
+    one vectorized pass instead of re-slicing the history per window.
+    """
+    if window_years <= 0:
+        raise ValueError("Window length must be positive")
+    if len(days) < 2:
+        return np.empty(0)
+
+    cumulative_log_returns = np.log(prices / prices[0])
+
+    ends = np.searchsorted(days, days + int(round(window_years * 365)), side='left')
+    starts = np.nonzero(ends < len(days))[0]
+    ends = ends[starts]
+    if len(starts) == 0:
+        return np.empty(0)
+
+    years = (days[ends] - days[starts]) / 365
+    log_growth = cumulative_log_returns[ends] - cumulative_log_returns[starts]
+    return np.expm1(log_growth / years) * 100
+
+def summarize(values: np.ndarray, window_years: float) -> Optional[RollingReturnStats]:
+    """Summarize a distribution of rolling CAGRs, or None if it is empty"""
+    if len(values) == 0:
+        return None
+
+    p5, p25, median, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+    return RollingReturnStats(
+        window_years=window_years,
+        count=len(values),
+        mean=float(values.mean()),
+        median=float(median),
+        std=float(values.std()),
+        min=float(values.min()),
+        max=float(values.max()),
+        p5=float(p5),
+        p25=float(p25),
+        p75=float(p75),
+        p95=float(p95),
+        values=values
+    )
+
+def covers_window(days: np.ndarray, window_years: float) -> bool:
+    """Check if a history is long enough to summarize the rolling CAGRs of a window length"""
+    return len(days) >= 2 and days[-1] - days[0] >= MIN_HISTORY_WINDOWS * round(window_years * 365)
+
+def compute_rolling_statistics(history, windows: Iterable[float] = DEFAULT_WINDOWS) -> Dict[float, RollingReturnStats]:
+    """
+    Calculate the rolling CAGR distribution of a price history for every window length.
+
+    Windows the history is too short for are left out.
+    """
+    days, prices = close_prices(history)
+
+    statistics = {}
+    for window_years in windows:
+        if not covers_window(days, window_years):
+            continue
+        stats = summarize(rolling_cagr(days, prices, window_years), window_years)
+        if stats is not None:
+            statistics[window_years] = stats
+    return statistics
+
+def get_rolling_statistics(ticker: str, windows: Iterable[float] = DEFAULT_WINDOWS,
+                           cache=ticker_cache) -> Optional[Dict[float, RollingReturnStats]]:
+    """
+    Get the rolling CAGR statistics of a cached ticker, computing them once per ticker.
+
+    Returns None if the ticker history is not cached.
+    """
+    windows = tuple(windows)
+    return cache.get_statistics(ticker, ("rolling_cagr", windows),
+                                lambda history: compute_rolling_statistics(history, windows))
@@ -0,0 +1,43 @@
+import json
+import os
+from typing import Dict, Optional
+
+def get_app_data_dir() -> str:
+    """Get the directory where the application keeps its own data files"""
+    return os.environ.get("INVESTMENT_APP_HOME") or os.path.join(os.path.expanduser("~"), ".investment_app")
+
+class SessionState:
+    """Persist lightweight state between application runs"""
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path or os.path.join(get_app_data_dir(), "session.json")
+
+    def load(self) -> Dict:
+        """Load the stored session state, returning an empty dict if unavailable"""
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save(self, data: Dict):
+        """Write the session state to disk"""
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def get_last_portfolio(self) -> Optional[str]:
+        """Get the path of the last portfolio file used, if it still exists"""
+        path = self.load().get("last_portfolio")
+        if isinstance(path, str) and os.path.exists(path):
+            return path
+        return None
+
+    def set_last_portfolio(self, file_path: str):
+        """Remember the path of the last portfolio file used"""
+        data = self.load()
+        data["last_portfolio"] = os.path.abspath(file_path)
+        self.save(data)
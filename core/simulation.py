@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+from core.investment_calculator import InvestmentCalculator
+
+# Percentiles drawn as the bands of the fan chart
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+
+@dataclass
+class PercentileBands:
+    """Data class to represent the percentiles of simulated capital at every year"""
+    years: np.ndarray
+    p5: np.ndarray
+    p25: np.ndarray
+    median: np.ndarray
+    p75: np.ndarray
+    p95: np.ndarray
+
+def percentile_bands(years, paths: np.ndarray) -> PercentileBands:
+    """
+    Reduce simulated paths to the percentiles drawn by the fan chart.
+
+    Args:
+        years: Years of the path columns
+        paths: (paths x years) simulated capital
+
+    Returns:
+        PercentileBands: One array per percentile, as long as the horizon
+    """
+    p5, p25, median, p75, p95 = np.percentile(paths, BAND_PERCENTILES, axis=0)
+    return PercentileBands(np.asarray(years), p5, p25, median, p75, p95)
+
+def simulate_paths(initial_deposit: float, contribution_amount: float, years: float, rate: float,
+                   volatility: float, contribution_frequency: str = "Monthly", path_count: int = 10_000,
+                   seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate the capital at the end of every year with random yearly returns.
+
+    Yearly growth factors are log-normal with an expected value of 1 + rate and a
+    log standard deviation of volatility, and the contributions of a year are added
+    at its end.
+
+    Args:
+        initial_deposit: Initial deposit
+        contribution_amount: Amount of every contribution
+        years: Years of growth
+        rate: Expected annual return in percent
+        volatility: Standard deviation of the annual log return in percent
+        contribution_frequency: Contribution frequency
+        path_count: Number of simulated paths
+        seed: Seed of the random generator, for reproducible results
+
+    Returns:
+        tuple:
+            - years (np.ndarray of int): Years from 0 up to the investment duration
+            - paths (np.ndarray): (paths x years) capital at the end of each year
+    """
+    if rate <= -100:
+        raise ValueError("Rate must be greater than -100%")
+    year_range = np.arange(int(years) + 1)
+    sigma = volatility / 100
+    mu = np.log1p(rate / 100) - sigma ** 2 / 2
+    yearly_contribution = contribution_amount * InvestmentCalculator.get_frequency_multiplier(contribution_frequency)
+
+    growth = np.exp(np.random.default_rng(seed).normal(mu, sigma, size=(path_count, len(year_range) - 1)))
+    paths = np.empty((path_count, len(year_range)))
+    paths[:, 0] = initial_deposit
+    for year in range(1, len(year_range)):
+        paths[:, year] = paths[:, year - 1] * growth[:, year - 1] + yearly_contribution
+    return year_range, paths
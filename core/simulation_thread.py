@@ -0,0 +1,34 @@
+from PySide6.QtCore import Signal
+from core.generation_scheduler import GenerationScheduler, GenerationWorker
+
+class SimulationWorker(GenerationWorker):
+    """Worker thread that simulates the range of outcomes of one investment"""
+
+    def compute(self, request):
+        """Simulate the paths and reduce them to percentile bands"""
+        from core.simulation import percentile_bands, simulate_paths
+        years, paths = simulate_paths(**request)
+        if self.isInterruptionRequested():
+            return None
+        return percentile_bands(years, paths)
+
+class SimulationScheduler(GenerationScheduler):
+    """
+    Run Monte Carlo simulations off the UI thread and publish only the latest one.
+
+    Requests are the keyword arguments of simulate_paths.
+    """
+
+    worker_class = SimulationWorker
+
+    # Emitted with the bands of the latest request
+    bands_ready = Signal(object)  # PercentileBands
+    simulation_failed = Signal(str)  # error_message
+
+    def publish(self, bands):
+        """Emit the bands of the latest request"""
+        self.bands_ready.emit(bands)
+
+    def report_failure(self, error_message):
+        """Emit the failure of the latest request"""
+        self.simulation_failed.emit(error_message)
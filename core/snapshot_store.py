@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from core.binary_portfolio import BinaryPortfolio, is_binary_portfolio
+from core.session import get_app_data_dir
+
+# Timestamp in the default names of saved files, e.g. investments_20240131_142501.json
+FILE_TIMESTAMP = re.compile(r"(\d{8}_\d{6})")
+NUMERIC_FIELDS = ("initial_deposit", "contribution_amount", "rate")
+SETTINGS_FIELDS = ("years", "compound_frequency", "contribution_frequency")
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    """Data class to represent one save recorded in the snapshot index"""
+    digest: str
+    name: str
+    timestamp: str  # ISO format
+    holdings: int
+
+@dataclass
+class SnapshotDiff:
+    """Data class to represent the differences between two snapshots"""
+    settings: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)  # field -> (old, new)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    changed: Dict[str, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)  # ticker -> field -> (old, new)
+
+    @property
+    def is_empty(self) -> bool:
+        """Check if both snapshots hold the same portfolio"""
+        return not (self.settings or self.added or self.removed or self.changed)
+
+def _normalize_number(value):
+    """Give equal numbers one representation, e.g. 10 and 10.0"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def normalize_portfolio(data: Dict) -> Dict:
+    """
+    Keep only the content of a portfolio document, in a canonical form.
+
+    The creation time is dropped and tickers and numbers are normalized, so saving the
+    same portfolio twice gives the same snapshot.
+    """
+    metadata = data.get("metadata", {})
+    normalized_metadata = {"version": metadata.get("version")}
+    for name in SETTINGS_FIELDS:
+        normalized_metadata[name] = _normalize_number(metadata.get(name))
+
+    investments = []
+    for investment in data.get("investments", []):
+        investment = dict(investment)
+        investment["ticker"] = str(investment.get("ticker", "")).strip().upper()
+        for name in NUMERIC_FIELDS:
+            if name in investment:
+                investment[name] = _normalize_number(investment[name])
+        investments.append(investment)
+    return {"metadata": normalized_metadata, "investments": investments}
+
+def encode_portfolio(data: Dict) -> bytes:
+    """Serialize a portfolio to the canonical JSON bytes that are hashed and stored"""
+    return json.dumps(normalize_portfolio(data), sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False).encode("utf-8")
+
+def _holdings_by_ticker(data: Dict) -> Dict[str, Dict]:
+    """Key holdings by ticker, numbering repeated tickers as TICKER#2, TICKER#3..."""
+    holdings = {}
+    for investment in data.get("investments", []):
+        key = investment["ticker"]
+        count = 2
+        while key in holdings:
+            key = f"{investment['ticker']}#{count}"
+            count += 1
+        holdings[key] = investment
+    return holdings
+
+class SnapshotStore:
+    """
+    Content-addressed store of saved portfolios.
+
+    Every snapshot is stored once under the SHA-256 of its normalized content in
+    objects/<first two hex digits>/<digest>.json, a portfolio file that can be loaded
+    like any other. index.jsonl records one line per save with its time and file name,
+    so disk use grows with distinct portfolios rather than with the number of saves.
+    """
+
+    OBJECTS_DIR = "objects"
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(get_app_data_dir(), "snapshots")
+        self._entries: Optional[List[SnapshotEntry]] = None
+        # Saves record snapshots on a worker thread while the history dialog reads them
+        self._lock = threading.Lock()
+
+    def object_path(self, digest: str) -> str:
+        """Get the path of the portfolio file stored for a digest"""
+        return os.path.join(self.directory, self.OBJECTS_DIR, digest[:2], f"{digest}.json")
+
+    def add(self, data: Dict, name: str = "", timestamp: Optional[datetime] = None) -> SnapshotEntry:
+        """
+        Record a saved portfolio, storing its content only if it is new.
+
+        Args:
+            data: Portfolio document as written to investment files
+            name: Name of the saved file
+            timestamp: Time of the save, now by default
+
+        Returns:
+            SnapshotEntry: The index entry of the save
+        """
+        content = encode_portfolio(data)
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if not os.path.exists(path):
+            self._write_object(path, content)
+
+        entry = SnapshotEntry(
+            digest=digest,
+            name=name,
+            timestamp=(timestamp or datetime.now()).isoformat(timespec="seconds"),
+            holdings=len(data.get("investments", []))
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            with open(os.path.join(self.directory, self.INDEX_FILE), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            if self._entries is not None:
+                self._entries.append(entry)
+                self._entries.sort(key=lambda item: item.timestamp)
+        return entry
+
+    def add_file(self, file_path: str) -> SnapshotEntry:
+        """Record an existing portfolio file, dated by the timestamp in its name or its modification time"""
+        if is_binary_portfolio(file_path):
+            data = BinaryPortfolio(file_path).to_dict()
+        else:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        match = FILE_TIMESTAMP.search(os.path.basename(file_path))
+        try:
+            timestamp = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S") if match else None
+        except ValueError:
+            timestamp = None
+        if timestamp is None:
+            timestamp = datetime.fromtimestamp(os.path.getmtime(file_path))
+        return self.add(data, os.path.basename(file_path), timestamp)
+
+    def _write_object(self, path: str, content: bytes):
+        """Write an object atomically, so a crash never leaves a truncated snapshot"""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def entries(self) -> List[SnapshotEntry]:
+        """Get every recorded save, oldest first"""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._read_index()
+            return list(self._entries)
+
+    def _read_index(self) -> List[SnapshotEntry]:
+        """Read the index, skipping lines cut short by a crash"""
+        entries = []
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entries.append(SnapshotEntry(**json.loads(line)))
+                    except (ValueError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        entries.sort(key=lambda entry: entry.timestamp)
+        return entries
+
+    def history(self, name: Optional[str] = None, distinct: bool = False) -> List[SnapshotEntry]:
+        """
+        List recorded saves, newest first
+
+        Args:
+            name: Only saves of files with this name
+            distinct: Only the latest save of every distinct content
+        """
+        entries = [entry for entry in reversed(self.entries()) if name is None or entry.name == name]
+        if distinct:
+            seen = set()
+            entries = [entry for entry in entries if not (entry.digest in seen or seen.add(entry.digest))]
+        return entries
+
+    def resolve(self, ref: str) -> str:
+        """
+        Get the full digest of a snapshot from a unique prefix of it
+
+        Raises:
+            KeyError: If no snapshot or several snapshots match
+        """
+        digests = {entry.digest for entry in self.entries() if entry.digest.startswith(ref)}
+        if len(digests) != 1:
+            raise KeyError(f"{'Ambiguous' if digests else 'Unknown'} snapshot: {ref}")
+        return digests.pop()
+
+    def load(self, ref: str) -> Dict:
+        """Read the portfolio stored for a digest or digest prefix"""
+        with open(self.object_path(self.resolve(ref)), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def diff(self, old_ref: str, new_ref: str) -> SnapshotDiff:
+        """Compare the settings and holdings of two snapshots"""
+        old, new = self.load(old_ref), self.load(new_ref)
+        result = SnapshotDiff()
+        for name in SETTINGS_FIELDS:
+            if old["metadata"].get(name) != new["metadata"].get(name):
+                result.settings[name] = (old["metadata"].get(name), new["metadata"].get(name))
+
+        old_holdings, new_holdings = _holdings_by_ticker(old), _holdings_by_ticker(new)
+        result.added = [key for key in new_holdings if key not in old_holdings]
+        result.removed = [key for key in old_holdings if key not in new_holdings]
+        for key in old_holdings.keys() & new_holdings.keys():
+            before, after = old_holdings[key], new_holdings[key]
+            changes = {name: (before.get(name), after.get(name))
+                       for name in sorted(before.keys() | after.keys()) if before.get(name) != after.get(name)}
+            if changes:
+                result.changed[key] = changes
+        result.changed = dict(sorted(result.changed.items()))
+        return result
+
+    def disk_usage(self) -> int:
+        """Get the size in bytes of the stored objects and index"""
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
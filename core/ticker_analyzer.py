@@ -1,9 +1,12 @@
 import time
 from urllib.request import urlopen
 from urllib.error import URLError
-import yfinance as yf
 
 class TickerAnalyzer:
+    # Period used for the historical CAGR
+    HISTORY_START = "2020-01-01"
+    HISTORY_END = "2025-01-01"
+
     @staticmethod
     def is_internet_available():
         """Check if internet connection is available."""
@@ -18,12 +21,25 @@ class TickerAnalyzer:
         """
         Calculate the Compound Annual Growth Rate (CAGR) for a given stock ticker.
         """
+        data = TickerAnalyzer.download_history(ticker, max_retries, retry_delay)
+        return TickerAnalyzer.calculate_cagr(data)
+
+    @staticmethod
+    def download_history(ticker, max_retries=3, retry_delay=5):
+        """
+        Download the daily price history used for the CAGR calculation of a ticker.
+
+        The returned data is validated with the same rules as the CAGR calculation,
+        so it can be cached and reused without downloading it again.
+        """
         if not isinstance(ticker, str) or not ticker.strip():
             raise ValueError("Ticker must be a non-empty string")
         if not isinstance(max_retries, int) or max_retries < 0:
             raise ValueError("max_retries must be a non-negative integer")
         if not isinstance(retry_delay, (int, float)) or retry_delay < 0:
             raise ValueError("retry_delay must be a non-negative number")
+        # Imported on first use, yfinance and pandas are slow to load at startup
+        import yfinance as yf
 
         attempts = 0
         last_exception = None
@@ -40,7 +56,8 @@ class TickerAnalyzer:
                         raise Exception("No internet connection after maximum retries")
 
                 try:
-                    data = yf.download(ticker, start="2020-01-01", end="2025-01-01", progress=False)
+                    data = yf.download(ticker, start=TickerAnalyzer.HISTORY_START,
+                                       end=TickerAnalyzer.HISTORY_END, progress=False)
                 except Exception as e:
                     if "No timezone found" in str(e):
                         raise
@@ -51,26 +68,8 @@ class TickerAnalyzer:
                     else:
                         raise Exception(f"Failed to download data after {max_retries} attempts: {str(e)}")
 
-                if data.empty:
-                    raise ValueError(f"No data available for ticker {ticker}")
-                if len(data) < 2:
-                    raise ValueError(f"Insufficient data points for ticker {ticker}")
-
-                initial_price = float(data['Close'].iloc[0])
-                final_price = float(data['Close'].iloc[-1])
-                if initial_price <= 0 or final_price <= 0:
-                    raise ValueError("Prices must be positive values")
-
-                num_days = (data.index[-1] - data.index[0]).days
-                if num_days <= 0:
-                    raise ValueError("Invalid date range in data")
-                num_years = num_days / 365
-
-                if initial_price == 0:
-                    raise ValueError("Initial price cannot be zero")
-
-                cagr = (final_price / initial_price) ** (1 / num_years) - 1
-                return float(cagr) * 100
+                TickerAnalyzer.calculate_cagr(data, ticker)
+                return data
 
             except Exception as e:
                 last_exception = e
@@ -79,3 +78,103 @@ class TickerAnalyzer:
                     time.sleep(retry_delay)
                 else:
                     raise last_exception
+
+    @staticmethod
+    def calculate_cagr(data, ticker=""):
+        """
+        Calculate the CAGR in percent from a downloaded price history.
+        """
+        if data is None or data.empty:
+            raise ValueError(f"No data available for ticker {ticker}")
+        if len(data) < 2:
+            raise ValueError(f"Insufficient data points for ticker {ticker}")
+
+        close = data['Close']
+        initial_price = float(close.iloc[0].squeeze())
+        final_price = float(close.iloc[-1].squeeze())
+        if initial_price <= 0 or final_price <= 0:
+            raise ValueError("Prices must be positive values")
+
+        num_days = (data.index[-1] - data.index[0]).days
+        if num_days <= 0:
+            raise ValueError("Invalid date range in data")
+        num_years = num_days / 365
+
+        if initial_price == 0:
+            raise ValueError("Initial price cannot be zero")
+
+        cagr = (final_price / initial_price) ** (1 / num_years) - 1
+        return float(cagr) * 100
+
+    @staticmethod
+    def download_histories(tickers, max_retries=2, retry_delay=2):
+        """
+        Download the price histories of several tickers with a single batched request.
+
+        Returns:
+            dict: ticker -> DataFrame with a 'Close' column (None for unknown tickers)
+        """
+        tickers = [t.strip().upper() for t in tickers if isinstance(t, str) and t.strip()]
+        if not tickers:
+            return {}
+        import yfinance as yf
+
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                if not TickerAnalyzer.is_internet_available():
+                    raise Exception("No internet connection available")
+                data = yf.download(tickers, start=TickerAnalyzer.HISTORY_START,
+                                   end=TickerAnalyzer.HISTORY_END, group_by='ticker', progress=False)
+                break
+            except Exception as e:
+                if attempts > max_retries:
+                    raise Exception(f"Failed to download data after {max_retries} attempts: {str(e)}")
+                print(f"Batch download failed. Retrying in {retry_delay} seconds... (Attempt {attempts}/{max_retries})")
+                time.sleep(retry_delay)
+
+        histories = {}
+        for ticker in tickers:
+            if data is None or data.empty or ticker not in data.columns.get_level_values(0):
+                histories[ticker] = None
+            else:
+                histories[ticker] = data[ticker].dropna(subset=['Close'])
+        return histories
+
+    @staticmethod
+    def get_rates(tickers, max_retries=2, retry_delay=2):
+        """
+        Calculate the CAGR of several tickers from one batched download.
+
+        Returns:
+            tuple:
+                - histories (dict): ticker -> price history of the valid tickers
+                - rates (dict): ticker -> CAGR in percent of the valid tickers
+                - errors (dict): ticker -> error message of the unknown tickers
+        """
+        histories = {}
+        rates = {}
+        errors = {}
+        for ticker, data in TickerAnalyzer.download_histories(tickers, max_retries, retry_delay).items():
+            try:
+                rates[ticker] = TickerAnalyzer.calculate_cagr(data, ticker)
+                histories[ticker] = data
+            except ValueError as e:
+                errors[ticker] = str(e)
+        return histories, rates, errors
+
+    @staticmethod
+    def find_stale_rates(saved_rates, current_rates, tolerance=0.01):
+        """
+        Compare saved rates with freshly calculated ones.
+
+        Returns:
+            list: tickers whose saved rate differs by more than `tolerance` percentage points
+        """
+        stale = []
+        for ticker, saved_rate in saved_rates.items():
+            current_rate = current_rates.get(ticker)
+            if current_rate is not None and abs(current_rate - saved_rate) > tolerance:
+                stale.append(ticker)
+        return stale
@@ -0,0 +1,114 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+@dataclass
+class CachedTicker:
+    """Data class to represent the cached data of a single ticker"""
+    history: Any
+    rate: float
+    fetched_at: float = field(default_factory=time.time)
+    statistics: Dict[str, Any] = field(default_factory=dict)
+
+class TickerCache:
+    """
+    Thread-safe in-memory cache of downloaded ticker prices and statistics.
+
+    Entries older than the time to live are treated as missing, so the ticker is
+    fetched again and picks up the closing prices of the days since.
+    """
+
+    # Daily close prices change at most once per trading day
+    DEFAULT_TTL = 12 * 60 * 60  # seconds
+
+    def __init__(self, ttl: float = DEFAULT_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CachedTicker] = {}
+
+    @staticmethod
+    def _normalize(ticker: str) -> str:
+        """Normalize ticker symbols so lookups are case-insensitive"""
+        return ticker.strip().upper()
+
+    def is_fresh(self, fetched_at: float) -> bool:
+        """Check if prices fetched at a time (seconds since epoch) are still within the time to live"""
+        return time.time() - fetched_at <= self.ttl
+
+    def store(self, ticker: str, history, rate: float, fetched_at: Optional[float] = None):
+        """
+        Store the price history and rate of a ticker, replacing any previous entry.
+
+        Args:
+            ticker: Ticker symbol
+            history: Price history
+            rate: Annual rate in percent
+            fetched_at: When the prices were downloaded (seconds since epoch), now if None
+        """
+        entry = CachedTicker(history=history, rate=rate,
+                             fetched_at=time.time() if fetched_at is None else fetched_at)
+        with self._lock:
+            self._entries[self._normalize(ticker)] = entry
+
+    def get(self, ticker: str) -> Optional[CachedTicker]:
+        """Return the cached entry for a ticker, or None if it is missing or expired"""
+        ticker = self._normalize(ticker)
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is not None and not self.is_fresh(entry.fetched_at):
+                del self._entries[ticker]
+                return None
+            return entry
+
+    def get_rate(self, ticker: str) -> Optional[float]:
+        """Return the cached rate for a ticker or None"""
+        entry = self.get(ticker)
+        return entry.rate if entry is not None else None
+
+    def get_history(self, ticker: str):
+        """Return the cached price history for a ticker or None"""
+        entry = self.get(ticker)
+        return entry.history if entry is not None else None
+
+    def get_statistics(self, ticker: str, key, compute):
+        """
+        Get statistics derived from a cached history, computing them on first use.
+
+        Args:
+            ticker: Ticker symbol
+            key: Hashable identifier of the statistics
+            compute: Callable receiving the price history and returning the statistics
+
+        Returns:
+            The statistics, or None if the ticker is not cached
+        """
+        entry = self.get(ticker)
+        if entry is None:
+            return None
+            
+        with self._lock:
+            if key in entry.statistics:
+                return entry.statistics[key]
+                
+        # Compute outside the lock so other tickers are not blocked
+        value = compute(entry.history)
+        with self._lock:
+            return entry.statistics.setdefault(key, value)
+
+    def contains(self, ticker: str) -> bool:
+        """Check if a ticker is cached"""
+        return self.get(ticker) is not None
+
+    def tickers(self) -> List[str]:
+        """Get list of cached tickers that have not expired"""
+        with self._lock:
+            return [ticker for ticker, entry in self._entries.items() if self.is_fresh(entry.fetched_at)]
+
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+# Shared cache used by the ticker threads and the startup warm-up
+ticker_cache = TickerCache()
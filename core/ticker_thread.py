@@ -1,62 +1,76 @@
-from PySide6.QtCore import QThread, Signal
+import concurrent.futures
+import importlib
+from PySide6.QtCore import QObject, QThread, Signal
+from core.async_fetch import get_fetch_backend
+from core.price_writer import get_price_writer
 from core.ticker_analyzer import TickerAnalyzer
+from core.ticker_cache import ticker_cache
 
-class TickerWorker(QThread):
-    """Worker thread for ticker analysis without blocking the UI"""
+class TickerRequest(QObject):
+    """Bridge between a fetch running on the asyncio backend and the Qt main thread"""
     
     # Signals to communicate with the main thread
     result_ready = Signal(str, float)  # ticker, rate
     error_occurred = Signal(str, str)  # ticker, error_message
     progress_update = Signal(str, str)  # ticker, status_message
+    finished = Signal()
     
-    def __init__(self, ticker, max_retries=2, retry_delay=2):
+    # Emitted from the backend thread, delivered on the main thread
+    _completed = Signal(object)
+    
+    def __init__(self, ticker):
         super().__init__()
         self.ticker = ticker
-        self.max_retries = max_retries
-        self.retry_delay = retry_delay
+        self.future = None
         self._is_cancelled = False
+        self._completed.connect(self._deliver)
     
-    def run(self):
-        """Execute ticker analysis in background"""
-        if self._is_cancelled:
+    def submit(self, backend, max_retries=2, retry_delay=2):
+        """Schedule the fetch on the backend"""
+        self.progress_update.emit(self.ticker, f"Analyzing ticker {self.ticker}...")
+        self.future = backend.submit(self.ticker, max_retries=max_retries, retry_delay=retry_delay)
+        # The lambda keeps this request alive until the backend is done with it
+        self.future.add_done_callback(lambda future: self._completed.emit(future))
+    
+    def _deliver(self, future):
+        """Publish the fetch outcome on the main thread"""
+        if self._is_cancelled or future.cancelled():
+            self.finished.emit()
             return
             
         try:
-            self.progress_update.emit(self.ticker, f"Analyzing ticker {self.ticker}...")
-            
-            # Call TickerAnalyzer with reduced parameters to avoid long freezes
-            rate = TickerAnalyzer.get_rate(
-                self.ticker, 
-                max_retries=self.max_retries, 
-                retry_delay=self.retry_delay
-            )
-            
-            if not self._is_cancelled:
-                self.result_ready.emit(self.ticker, rate)
-                
+            data, rate = future.result()
         except Exception as e:
-            if not self._is_cancelled:
-                error_msg = str(e)
-                # Customize error messages for user
-                if "No data available" in error_msg:
-                    error_msg = f"Ticker '{self.ticker}' not found or has no data"
-                elif "No internet connection" in error_msg:
-                    error_msg = "No internet connection available"
-                elif "Failed to download data" in error_msg:
-                    error_msg = f"Failed to retrieve data for '{self.ticker}'"
-                
-                self.error_occurred.emit(self.ticker, error_msg)
+            self.error_occurred.emit(self.ticker, describe_ticker_error(self.ticker, e))
+        else:
+            ticker_cache.store(self.ticker, data, rate)
+            get_price_writer().submit({self.ticker: data})
+            self.result_ready.emit(self.ticker, rate)
+        self.finished.emit()
     
     def cancel(self):
         """Cancel the operation"""
         self._is_cancelled = True
-        self.requestInterruption()
+        if self.future is not None:
+            self.future.cancel()
+
+def describe_ticker_error(ticker, error):
+    """Customize error messages for user"""
+    error_msg = str(error)
+    if "No data available" in error_msg:
+        error_msg = f"Ticker '{ticker}' not found or has no data"
+    elif "No internet connection" in error_msg:
+        error_msg = "No internet connection available"
+    elif "Failed to download data" in error_msg:
+        error_msg = f"Failed to retrieve data for '{ticker}'"
+    return error_msg
 
 class TickerThreadManager:
-    """Manager to handle multiple ticker requests"""
+    """Manager to handle multiple ticker requests on the shared fetch backend"""
     
-    def __init__(self):
-        self.active_workers = {}  # ticker -> worker
+    def __init__(self, backend=None):
+        self.backend = backend or get_fetch_backend()
+        self.active_workers = {}  # ticker -> request
         
     def start_analysis(self, ticker, result_callback=None, error_callback=None, progress_callback=None):
         """Start analysis of a ticker"""
@@ -66,34 +80,37 @@ class TickerThreadManager:
         if ticker in self.active_workers:
             self.cancel_analysis(ticker)
         
-        # Create and start the worker
-        worker = TickerWorker(ticker, max_retries=2, retry_delay=2)
+        # Answer immediately if the ticker was fetched recently (e.g. by the startup warm-up),
+        # expired cache entries are fetched again
+        cached_rate = ticker_cache.get_rate(ticker)
+        if cached_rate is not None:
+            if result_callback:
+                result_callback(ticker, cached_rate)
+            return None
+        
+        request = TickerRequest(ticker)
         
         # Connect callbacks if provided
         if result_callback:
-            worker.result_ready.connect(result_callback)
+            request.result_ready.connect(result_callback)
         if error_callback:
-            worker.error_occurred.connect(error_callback)
+            request.error_occurred.connect(error_callback)
         if progress_callback:
-            worker.progress_update.connect(progress_callback)
+            request.progress_update.connect(progress_callback)
             
-        # Automatic cleanup when thread finishes
-        worker.finished.connect(lambda: self._cleanup_worker(ticker))
+        # Automatic cleanup when the request finishes
+        request.finished.connect(lambda: self._cleanup_worker(ticker, request))
         
-        self.active_workers[ticker] = worker
-        worker.start()
+        self.active_workers[ticker] = request
+        request.submit(self.backend, max_retries=2, retry_delay=2)
         
-        return worker
+        return request
     
     def cancel_analysis(self, ticker):
         """Cancel analysis of a specific ticker"""
         ticker = ticker.upper()
         if ticker in self.active_workers:
-            worker = self.active_workers[ticker]
-            worker.cancel()
-            worker.wait(1000)  # Wait max 1 second
-            if worker.isRunning():
-                worker.terminate()
+            self.active_workers[ticker].cancel()
             self._cleanup_worker(ticker)
     
     def cancel_all(self):
@@ -101,11 +118,176 @@ class TickerThreadManager:
         for ticker in list(self.active_workers.keys()):
             self.cancel_analysis(ticker)
     
-    def _cleanup_worker(self, ticker):
-        """Remove worker from active list"""
-        if ticker in self.active_workers:
+    def _cleanup_worker(self, ticker, request=None):
+        """Remove request from active list"""
+        if ticker in self.active_workers and request in (None, self.active_workers[ticker]):
             del self.active_workers[ticker]
     
     def is_analyzing(self, ticker):
         """Check if a ticker is currently being analyzed"""
         return ticker.upper() in self.active_workers
+
+class BulkTickerWorker(QThread):
+    """Worker thread that validates many tickers with one batched request"""
+    
+    validation_ready = Signal(dict, dict)  # ticker -> rate, ticker -> error_message
+    validation_failed = Signal(str)  # error_message
+    
+    def __init__(self, tickers, max_retries=1, retry_delay=2):
+        super().__init__()
+        self.tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._is_cancelled = False
+    
+    def run(self):
+        """Fetch all uncached tickers at once and report rates and unknown symbols"""
+        rates = {}
+        missing = []
+        for ticker in self.tickers:
+            cached_rate = ticker_cache.get_rate(ticker)
+            if cached_rate is not None:
+                rates[ticker] = cached_rate
+            else:
+                missing.append(ticker)
+        
+        errors = {}
+        if missing:
+            try:
+                histories, fetched_rates, errors = TickerAnalyzer.get_rates(
+                    missing,
+                    max_retries=self.max_retries,
+                    retry_delay=self.retry_delay
+                )
+            except Exception as e:
+                if not self._is_cancelled:
+                    self.validation_failed.emit(str(e))
+                return
+            
+            for ticker, rate in fetched_rates.items():
+                ticker_cache.store(ticker, histories[ticker], rate)
+            get_price_writer().submit({ticker: histories[ticker] for ticker in fetched_rates})
+            rates.update(fetched_rates)
+        
+        if not self._is_cancelled:
+            self.validation_ready.emit(rates, errors)
+    
+    def cancel(self):
+        """Cancel the operation"""
+        self._is_cancelled = True
+        self.requestInterruption()
+
+
+class CacheWarmupWorker(QThread):
+    """Low-priority worker that pre-fetches the tickers of the last used portfolio"""
+    
+    ticker_warmed = Signal(str, float)  # ticker, rate
+    
+    def __init__(self, file_path, max_retries=0, retry_delay=0, backend=None, store=None):
+        super().__init__()
+        self.file_path = file_path
+        self.store = store
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.backend = backend or get_fetch_backend()
+        self._futures = []
+        self._is_cancelled = False
+    
+    def run(self):
+        """Read the portfolio tickers and fetch every one not cached yet"""
+        # Imported here, the file formats and the price store pull in numpy
+        from core.investment_file_manager import InvestmentFileManager
+        try:
+            tickers = InvestmentFileManager.read_portfolio_tickers(self.file_path)
+        except Exception as e:
+            print(f"Warm-up could not read {self.file_path}: {e}")
+            return
+            
+        # Prices kept from previous sessions do not need the network
+        tickers = [t for t in tickers if not self._load_from_store(t)]
+            
+        # Fetch all uncached tickers concurrently on the shared backend
+        pending = {}
+        for ticker in tickers:
+            if self._is_cancelled or self.isInterruptionRequested():
+                return
+            if not ticker_cache.contains(ticker):
+                future = self.backend.submit(ticker, max_retries=self.max_retries, retry_delay=self.retry_delay)
+                pending[future] = ticker
+        self._futures = list(pending)
+        
+        fetched = {}
+        try:
+            for future in concurrent.futures.as_completed(pending):
+                if self._is_cancelled or self.isInterruptionRequested():
+                    return
+                ticker = pending[future]
+                try:
+                    data, rate = future.result()
+                except Exception as e:
+                    # Warm-up is best effort, the ticker will be analyzed again on demand
+                    print(f"Warm-up skipped {ticker}: {e}")
+                    continue
+                ticker_cache.store(ticker, data, rate)
+                fetched[ticker] = data
+                self.ticker_warmed.emit(ticker, rate)
+        finally:
+            # Keep what was downloaded for the next startup, in one batch
+            get_price_writer().submit(fetched)
+    
+    def _load_from_store(self, ticker):
+        """Fill the cache from the local price store, returning True on success"""
+        if ticker_cache.contains(ticker):
+            return True
+        try:
+            from core.price_store import PriceMatrixStore
+            store = self.store or PriceMatrixStore()
+            # Prices stored longer ago than the cache lifetime are downloaded again
+            fetched_at = store.fetched_at(ticker)
+            if fetched_at is None or not ticker_cache.is_fresh(fetched_at):
+                return False
+            data = store.history(ticker)
+            if data is None:
+                return False
+            rate = TickerAnalyzer.calculate_cagr(data, ticker)
+        except Exception as e:
+            print(f"Warm-up could not use stored prices of {ticker}: {e}")
+            return False
+        ticker_cache.store(ticker, data, rate, fetched_at=fetched_at)
+        self.ticker_warmed.emit(ticker, rate)
+        return True
+    
+    def start_low_priority(self):
+        """Start the worker with the lowest thread priority"""
+        self.start(QThread.LowestPriority)
+    
+    def cancel(self):
+        """Cancel the warm-up"""
+        self._is_cancelled = True
+        self.requestInterruption()
+        for future in self._futures:
+            future.cancel()
+
+class ModulePreloadWorker(QThread):
+    """Low-priority worker that imports the price data libraries before the first analysis needs them"""
+    
+    # Imported on first use instead of at startup, they take most of the import time
+    MODULES = ("pandas", "yfinance")
+    
+    def __init__(self, modules=MODULES):
+        super().__init__()
+        self.modules = modules
+    
+    def run(self):
+        """Import every module, a failed import is reported again when the module is used"""
+        for module in self.modules:
+            if self.isInterruptionRequested():
+                return
+            try:
+                importlib.import_module(module)
+            except Exception as e:
+                print(f"Preload could not import {module}: {e}")
+    
+    def start_low_priority(self):
+        """Start the worker with the lowest thread priority"""
+        self.start(QThread.LowestPriority)
@@ -2,6 +2,7 @@ from ui.main_window import MainWindow
 import sys
 import os
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
 from PySide6.QtGui import QIcon
 
 def get_resource_path(relative_path):
@@ -34,4 +35,7 @@ if __name__ == "__main__":
     window = MainWindow()
     app.setWindowIcon(QIcon(get_resource_path("assets/icon.ico")))
     window.show()
+    # Warm the ticker cache once the event loop is running, after the first paint
+    QTimer.singleShot(0, window.start_cache_warmup)
+    QTimer.singleShot(0, window.start_module_preload)
     sys.exit(app.exec())
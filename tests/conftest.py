@@ -1,5 +1,6 @@
 import sys
 import os
+import pytest
 
 # Ensure core directory is in Python path
 # This file is automatically loaded by pytest and ensures imports work
@@ -9,4 +10,63 @@ def pytest_configure(config):
     """Configure pytest to add core directory to Python path"""
     core_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
     if core_dir not in sys.path:
-        sys.path.insert(0, core_dir)
\ No newline at end of file
+        sys.path.insert(0, core_dir)
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Create the QApplication needed by widget tests, without a display"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def wait_until(qapp):
+    """Process Qt events until a condition holds, failing after a timeout"""
+    import time
+
+    def wait(condition, timeout=5.0):
+        deadline = time.perf_counter() + timeout
+        while not condition():
+            assert time.perf_counter() < deadline, "Timed out"
+            qapp.processEvents()
+            time.sleep(0.001)
+    return wait
+
+PORTFOLIO_METADATA = {
+    "version": "3.0",
+    "created_at": "2025-07-20T10:30:00",
+    "years": 10,
+    "compound_frequency": "Annually",
+    "contribution_frequency": "Monthly"
+}
+
+@pytest.fixture
+def portfolio_metadata():
+    """Metadata section of a valid portfolio document"""
+    return dict(PORTFOLIO_METADATA)
+
+@pytest.fixture
+def make_investments():
+    """
+    Factory of valid investment records T0, T1...
+
+    Args of the factory:
+        count: Number of records
+        huge_ints: Give record 3 a contribution too large for 64 bits
+        notes: Add a unicode note with quotes to every record
+        frequencies: Add per-holding frequencies and years
+    """
+    def make(count, huge_ints=False, notes=False, frequencies=False):
+        investments = []
+        for i in range(count):
+            investment = {"ticker": f"T{i}", "rate": 1.5 + i / 1000, "initial_deposit": 1000.0 + i,
+                          "contribution_amount": 100}
+            if huge_ints and i == 3:
+                investment["contribution_amount"] = 12345678901234567890
+            if notes:
+                investment["note"] = "ünïcode \"quoted\""
+            if frequencies:
+                investment.update(compound_frequency="Monthly", contribution_frequency="Quarterly", years=5.5)
+            investments.append(investment)
+        return investments
+    return make
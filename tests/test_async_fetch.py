@@ -0,0 +1,141 @@
+import asyncio
+import threading
+import pytest
+from core.async_fetch import AsyncFetchBackend
+
+def chart_payload(closes, start=1577836800):
+    return {
+        "chart": {
+            "result": [{
+                "timestamp": [start + i * 86400 * 30 for i in range(len(closes))],
+                "indicators": {
+                    "quote": [{"close": [c * 2 if c is not None else None for c in closes]}],
+                    "adjclose": [{"adjclose": closes}]
+                }
+            }],
+            "error": None
+        }
+    }
+
+NOT_FOUND = {"chart": {"result": None, "error": {"code": "Not Found"}}}
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+class FakeSession:
+    """Async session recording concurrency instead of doing network I/O"""
+    def __init__(self, payloads):
+        self.payloads = payloads
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.closed = False
+
+    async def get(self, url, params=None):
+        self.requests.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        ticker = url.rsplit("/", 1)[-1]
+        # A list holds one answer per attempt: a payload, an HTTP status or an exception
+        answer = self.payloads.get(ticker, NOT_FOUND)
+        if isinstance(answer, list):
+            answer = answer.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        if isinstance(answer, int):
+            return FakeResponse({}, status_code=answer)
+        return FakeResponse(answer, status_code=404 if answer is NOT_FOUND else 200)
+
+    async def close(self):
+        self.closed = True
+
+@pytest.fixture
+def backend_factory():
+    backends = []
+    def make(payloads, max_connections=4):
+        sessions = []
+        def session_factory():
+            sessions.append(FakeSession(payloads))
+            return sessions[-1]
+        backend = AsyncFetchBackend(max_connections=max_connections, session_factory=session_factory)
+        backends.append(backend)
+        return backend, sessions
+    yield make
+    for backend in backends:
+        backend.stop()
+
+class TestAsyncFetchBackend:
+    def test_fetch_returns_history_and_rate(self, backend_factory):
+        backend, _ = backend_factory({"AAPL": chart_payload([100.0, 110.0, 121.0])})
+        data, rate = backend.submit("aapl").result(timeout=5)
+        assert list(data['Close']) == [100.0, 110.0, 121.0]
+        assert rate > 0
+
+    def test_many_fetches_share_one_session_and_thread(self, backend_factory):
+        tickers = [f"T{i}" for i in range(100)]
+        backend, sessions = backend_factory({t: chart_payload([100.0, 150.0]) for t in tickers}, max_connections=4)
+        threads_before = threading.active_count()
+        futures = [backend.submit(t) for t in tickers]
+        results = [f.result(timeout=10) for f in futures]
+
+        assert len(results) == 100
+        assert len(sessions) == 1
+        assert len(sessions[0].requests) == 100
+        assert sessions[0].max_active <= 4
+        assert threading.active_count() - threads_before <= 1
+
+    def test_unknown_ticker(self, backend_factory):
+        backend, _ = backend_factory({})
+        with pytest.raises(ValueError, match="No data available for ticker ZZZZ"):
+            backend.submit("ZZZZ").result(timeout=5)
+
+    def test_failed_requests_are_retried(self, backend_factory):
+        backend, sessions = backend_factory({"AAPL": [503, 503, 503]})
+        with pytest.raises(Exception, match="Failed to download data after 3 attempts: HTTP 503"):
+            backend.submit("AAPL", max_retries=2, retry_delay=0).result(timeout=5)
+        assert len(sessions[0].requests) == 3
+
+    def test_transient_failures_recover(self, backend_factory):
+        backend, sessions = backend_factory({"AAPL": [ConnectionError("reset"), 429, chart_payload([100.0, 110.0])]})
+        data, _ = backend.submit("AAPL", max_retries=2, retry_delay=0).result(timeout=5)
+        assert list(data['Close']) == [100.0, 110.0]
+        assert len(sessions[0].requests) == 3
+
+    @pytest.mark.parametrize("answer, message", [
+        (403, "Failed to download data for AAPL: HTTP 403"),
+        (TypeError("bug"), "bug"),
+    ])
+    def test_other_failures_are_not_retried(self, backend_factory, answer, message):
+        backend, sessions = backend_factory({"AAPL": [answer, chart_payload([100.0, 110.0])]})
+        with pytest.raises(Exception, match=message):
+            backend.submit("AAPL", max_retries=2, retry_delay=0).result(timeout=5)
+        assert len(sessions[0].requests) == 1
+
+    def test_stop_closes_session(self, backend_factory):
+        backend, sessions = backend_factory({"AAPL": chart_payload([100.0, 110.0])})
+        backend.submit("AAPL").result(timeout=5)
+        backend.stop()
+        assert sessions[0].closed
+        assert not backend.is_running()
+
+class TestParseChartResponse:
+    def test_falls_back_to_raw_close(self):
+        payload = chart_payload([1.0, 2.0])
+        del payload["chart"]["result"][0]["indicators"]["adjclose"]
+        data = AsyncFetchBackend.parse_chart_response(payload, "AAPL")
+        assert list(data['Close']) == [2.0, 4.0]
+
+    def test_drops_missing_closes(self):
+        data = AsyncFetchBackend.parse_chart_response(chart_payload([1.0, None, 3.0]), "AAPL")
+        assert list(data['Close']) == [1.0, 3.0]
+
+    def test_empty_result(self):
+        with pytest.raises(ValueError, match="No data available"):
+            AsyncFetchBackend.parse_chart_response(NOT_FOUND, "AAPL")
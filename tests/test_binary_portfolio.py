@@ -0,0 +1,92 @@
+import json
+import os
+import numpy as np
+import pytest
+from core.binary_portfolio import (BinaryPortfolio, binary_to_json, is_binary_portfolio, json_to_binary,
+                                   read_binary_portfolio_streaming, write_binary_portfolio)
+
+@pytest.fixture
+def portfolio_path(tmp_path, portfolio_metadata, make_investments):
+    path = str(tmp_path / "portfolio.invb")
+    investments = make_investments(50, frequencies=True)
+    write_binary_portfolio(path, {"metadata": portfolio_metadata, "investments": investments})
+    return path
+
+class TestBinaryPortfolio:
+    def test_round_trip(self, portfolio_path, portfolio_metadata, make_investments):
+        portfolio = BinaryPortfolio(portfolio_path)
+        assert portfolio.metadata == portfolio_metadata
+        assert len(portfolio) == 50
+        investments = make_investments(50, frequencies=True)
+        assert portfolio.to_dict() == {"metadata": portfolio_metadata, "investments": investments}
+
+    def test_records_are_memory_mapped(self, portfolio_path):
+        portfolio = BinaryPortfolio(portfolio_path)
+        assert isinstance(portfolio.records, np.memmap)
+        np.testing.assert_allclose(portfolio.column("initial_deposit"), 1000.0 + np.arange(50))
+        assert portfolio[-1]["ticker"] == "T49"
+        assert portfolio.tickers()[:2] == ["T0", "T1"]
+        with pytest.raises(IndexError):
+            portfolio[50]
+
+    def test_irregular_values_are_lossless(self, tmp_path, portfolio_metadata):
+        investments = [
+            {"ticker": "ÄPPL", "rate": 7, "initial_deposit": "1000", "contribution_amount": None,
+             "compound_frequency": "Hourly", "note": {"tags": ["a", 1]}},
+            {"rate": 2.5, "ticker": 42, "initial_deposit": 12345678901234567890, "contribution_amount": True},
+            {},
+        ]
+        data = {"metadata": portfolio_metadata, "investments": investments, "extra": [1, 2]}
+        path = str(tmp_path / "odd.invb")
+        write_binary_portfolio(path, data)
+
+        loaded = BinaryPortfolio(path).to_dict()
+        assert loaded == data
+        assert type(loaded["investments"][0]["rate"]) is int
+
+    def test_empty_portfolio(self, tmp_path, portfolio_metadata):
+        path = str(tmp_path / "empty.invb")
+        write_binary_portfolio(path, {"metadata": portfolio_metadata, "investments": []})
+        portfolio = BinaryPortfolio(path)
+        assert len(portfolio) == 0
+        assert portfolio.to_dict() == {"metadata": portfolio_metadata, "investments": []}
+
+    def test_rejects_other_files(self, tmp_path, portfolio_metadata):
+        path = str(tmp_path / "portfolio.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"metadata": portfolio_metadata, "investments": []}, f)
+        assert not is_binary_portfolio(path)
+        with pytest.raises(ValueError):
+            BinaryPortfolio(path)
+
+class TestConversion:
+    def test_json_binary_json(self, tmp_path, portfolio_metadata, make_investments):
+        data = {"metadata": portfolio_metadata, "investments": make_investments(20, frequencies=True)}
+        json_path = str(tmp_path / "in.json")
+        binary_path = str(tmp_path / "out.invb")
+        back_path = str(tmp_path / "back.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+        json_to_binary(json_path, binary_path)
+        binary_to_json(binary_path, back_path)
+
+        assert is_binary_portfolio(binary_path)
+        assert os.path.getsize(binary_path) < os.path.getsize(json_path)
+        with open(back_path, 'r', encoding='utf-8') as f:
+            assert json.load(f) == data
+
+class TestStreaming:
+    def test_batches_and_progress(self, portfolio_path, portfolio_metadata):
+        progress = []
+        events = list(read_binary_portfolio_streaming(portfolio_path, batch_size=20,
+                                                      progress_callback=lambda done, total: progress.append((done, total))))
+        assert events[0] == ("metadata", portfolio_metadata)
+        assert [len(batch) for _, batch in events[1:]] == [20, 20, 10]
+        assert progress[-1] == (50, 50)
+
+    def test_invalid_record(self, tmp_path, portfolio_metadata):
+        path = str(tmp_path / "bad.invb")
+        write_binary_portfolio(path, {"metadata": portfolio_metadata, "investments": [{"ticker": "A"}]})
+        with pytest.raises(ValueError, match="index 0"):
+            list(read_binary_portfolio_streaming(path))
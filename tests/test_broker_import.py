@@ -0,0 +1,61 @@
+import pytest
+from core.broker_import import BrokerColumnMapping, parse_amounts, read_broker_csv, read_broker_headers
+import pandas as pd
+
+@pytest.fixture
+def broker_csv(tmp_path):
+    path = tmp_path / "statement.csv"
+    path.write_text(
+        "Symbol,Description,Quantity,Market Value,Monthly Contribution,Annual Rate\n"
+        "aapl,Apple,10,\"$1,234.50\",100,8\n"
+        "MSFT,Microsoft,5,2000,,\n"
+        "AAPL,Apple,1,\"$765.50\",25,4\n"
+        ",Total,,\"$4,000.00\",,\n"
+        "VOO,Vanguard,1,n/a,50,\n"
+        "QQQ,Invesco,1,(10.00),,\n",
+        encoding="utf-8"
+    )
+    return str(path)
+
+class TestColumnMapping:
+    def test_detect(self):
+        mapping = BrokerColumnMapping.detect(["Symbol", "Name", "Market Value", "Annual Rate"])
+        assert mapping == BrokerColumnMapping("Symbol", "Market Value", None, "Annual Rate")
+
+    def test_detect_missing_columns(self):
+        assert BrokerColumnMapping.detect(["Name", "Market Value"]) is None
+
+class TestParseAmounts:
+    def test_formats(self):
+        values = pd.Series(["$1,234.50", "(10.00)", "", "abc", "7%", "-3"])
+        result = parse_amounts(values).tolist()
+        assert result[:2] == [1234.5, -10.0]
+        assert pd.isna(result[2]) and pd.isna(result[3])
+        assert result[4:] == [7.0, -3.0]
+
+    def test_decimal_comma(self):
+        assert parse_amounts(pd.Series(["1.234,50 €", "0,5"]), decimal=",").tolist() == [1234.5, 0.5]
+
+class TestReadBrokerCsv:
+    def test_merges_duplicates_and_skips_invalid_rows(self, broker_csv):
+        result = read_broker_csv(broker_csv)
+
+        assert result.investments == [
+            {"ticker": "AAPL", "initial_deposit": 2000.0, "contribution_amount": 125.0,
+             "rate": pytest.approx((8 * 1234.5 + 4 * 765.5) / 2000)},
+            {"ticker": "MSFT", "initial_deposit": 2000.0, "contribution_amount": 0.0},
+        ]
+        assert result.merged_rows == 1
+        assert result.skipped_rows == [(5, "missing ticker"), (6, "invalid value"), (7, "negative value")]
+
+    def test_explicit_mapping_and_delimiter(self, tmp_path):
+        path = tmp_path / "statement.csv"
+        path.write_text("Code;Wert\nSAP;\"1.500,25\"\n", encoding="utf-8")
+        assert read_broker_headers(str(path)) == ["Code", "Wert"]
+
+        result = read_broker_csv(str(path), BrokerColumnMapping("Code", "Wert", decimal=","))
+        assert result.investments == [{"ticker": "SAP", "initial_deposit": 1500.25, "contribution_amount": 0.0}]
+
+    def test_unknown_columns(self, broker_csv):
+        with pytest.raises(ValueError, match="not found"):
+            read_broker_csv(broker_csv, BrokerColumnMapping("Ticker", "Market Value"))
@@ -0,0 +1,184 @@
+import time
+import numpy as np
+import pytest
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QMouseEvent
+from ui.chart import Chart, nearest_index
+from ui.homepage import Homepage
+from core.finance import Finance
+from core.simulation import percentile_bands, simulate_paths
+
+INVESTMENT = {"initial_deposit": 1000.0, "years": 10, "rate": 7.0, "compound_frequency": "Monthly",
+              "contribution_amount": 100.0, "contribution_frequency": "Monthly", "is_empty": False}
+
+def projection(**changes):
+    finance = Finance(dict(INVESTMENT, **changes))
+    years, capital = finance.get_annual_breakdown()
+    return finance.get_results(), years, capital
+
+class TestChart:
+    def test_set_data_replaces_points_and_fits_axes(self, qapp):
+        chart = Chart([0, 1, 2], [100.0, 200.0, 300.0], [100.0, 150.0, 200.0])
+
+        chart.set_data([0, 1, 2, 3, 4], [10.0, 20.0, 30.0, 40.0, 50.0], [10.0, 10.0, 10.0, 10.0, 10.0])
+
+        assert [point.y() for point in chart.growth_series.points()] == [10.0, 20.0, 30.0, 40.0, 50.0]
+        assert chart.invested_series.count() == 5
+        assert (chart.axis_x.min(), chart.axis_x.max()) == (0, 4)
+        assert chart.axis_y.max() == pytest.approx(54.0)
+
+    def test_set_data_resets_zoom(self, qapp):
+        chart = Chart([0, 1, 2], [100.0, 200.0, 300.0], [100.0, 150.0, 200.0])
+        chart.chart.zoom(2.0)
+
+        chart.set_data([0, 1, 2], [100.0, 200.0, 300.0], [100.0, 150.0, 200.0])
+
+        assert not chart.chart.isZoomed()
+        assert (chart.axis_x.min(), chart.axis_x.max()) == (0, 2)
+
+    def test_long_series_are_downsampled_to_the_plot_width(self, qapp):
+        years = np.linspace(0, 40, 100_000)
+        chart = Chart(years, 1000 * 1.07 ** years, 1000 + 10 * years)
+
+        assert chart.growth_series.count() <= chart.max_points()
+        assert chart.growth_series.at(chart.growth_series.count() - 1).x() == 40.0
+
+        # Zooming in draws more detail of the visible range
+        chart.axis_x.setRange(10, 11)
+        chart.render_visible()
+        points = chart.growth_series.points()
+        assert len(points) <= chart.max_points()
+        assert points[0].x() <= 10 and points[-1].x() >= 11
+        assert all(9.9 < point.x() < 11.1 for point in points)
+
+    @pytest.mark.parametrize("path_count", [10, 20_000])
+    def test_percentile_bands_depend_on_the_horizon_only(self, qapp, path_count):
+        years, paths = simulate_paths(1000.0, 100.0, 30, 7.0, 15.0, path_count=path_count, seed=1)
+        chart = Chart(years, paths.mean(axis=0), 1000.0 + 1200.0 * years)
+
+        chart.set_percentile_bands(percentile_bands(years, paths))
+
+        assert chart.outer_band.isVisible() and chart.median_series.isVisible()
+        for series in (chart.outer_band_upper, chart.outer_band_lower, chart.inner_band_upper,
+                       chart.inner_band_lower, chart.median_series):
+            assert series.count() == 31
+        assert len(chart.chart.series()) == 5
+        assert chart.axis_y.max() >= chart.bands.p95.max()
+
+    def test_clear_percentile_bands(self, qapp):
+        years, paths = simulate_paths(1000.0, 100.0, 10, 7.0, 15.0, path_count=100, seed=1)
+        chart = Chart(years, paths.mean(axis=0), 1000.0 + 1200.0 * years)
+        chart.set_percentile_bands(percentile_bands(years, paths))
+
+        chart.clear_percentile_bands()
+
+        assert chart.bands is None
+        assert not chart.outer_band.isVisible() and not chart.median_series.isVisible()
+
+    def test_empty_chart(self, qapp):
+        chart = Chart()
+
+        assert chart.growth_series.count() == 0
+
+class TestNearestIndex:
+    def test_matches_linear_scan(self):
+        rng = np.random.default_rng(1)
+        x_values = np.sort(rng.uniform(0, 100, 10_000))
+
+        for x in rng.uniform(-10, 110, 200):
+            assert nearest_index(x_values, x) == int(np.argmin(np.abs(x_values - x)))
+
+    def test_empty(self):
+        assert nearest_index(np.array([]), 1.0) is None
+
+class TestHover:
+    def move(self, view, x, y):
+        position = QPointF(x, y)
+        view.mouseMoveEvent(QMouseEvent(QEvent.Type.MouseMove, position, view.mapToGlobal(position),
+                                        Qt.MouseButton.NoButton, Qt.MouseButton.NoButton,
+                                        Qt.KeyboardModifier.NoModifier))
+
+    def test_shows_closest_values(self, qapp):
+        chart = Chart([0, 1, 2], [100.0, 200.0, 300.0], [100.0, 150.0, 200.0])
+
+        chart.show_values_at(1.2)
+
+        assert chart.values_label.text() == "Year: 1 | Investment Value: $200.00 | Invested Amount: $150.00"
+
+    def test_mouse_moves_are_coalesced(self, qapp, monkeypatch):
+        chart = Chart(list(range(10_001)), [float(i) for i in range(10_001)], [1.0] * 10_001)
+        lookups = []
+        monkeypatch.setattr(chart, "show_values_at", lookups.append)
+
+        for x in range(100, 150):
+            self.move(chart.chart_view, x, 100)
+        deadline = time.perf_counter() + 1.0
+        while not lookups and time.perf_counter() < deadline:
+            qapp.processEvents()
+
+        assert len(lookups) == 1
+
+class TestHomepage:
+    def test_keeps_one_chart_across_updates(self, qapp):
+        homepage = Homepage()
+        homepage.update_investment(*projection())
+        chart = homepage.chart
+        widget_count = homepage.home_layout.count()
+
+        homepage.update_investment(*projection(years=20, rate=5.0))
+
+        assert homepage.chart is chart
+        assert homepage.home_layout.count() == widget_count
+        assert chart.growth_series.count() == 21
+        assert "Years of Growth: 20" in homepage.details.text()
+
+    def test_shows_range_of_outcomes(self, qapp, wait_until):
+        homepage = Homepage()
+        homepage.update_investment(*projection())
+
+        homepage.show_range.setChecked(True)
+        wait_until(lambda: not homepage.simulations.is_busy())
+        assert homepage.chart.bands is not None
+        assert len(homepage.chart.bands.median) == 11
+
+        homepage.show_range.setChecked(False)
+        assert homepage.chart.bands is None
+        homepage.cleanup()
+
+    def test_volatility_steps_are_simulated_once(self, qapp, wait_until):
+        homepage = Homepage()
+        homepage.update_investment(*projection())
+        homepage.show_range.setChecked(True)
+        wait_until(lambda: not homepage.simulations.is_busy())
+        generation = homepage.simulations.generation
+
+        for step in range(10):
+            homepage.volatility.setValue(16.0 + step)
+        assert homepage.simulations.generation == generation
+        wait_until(lambda: not homepage.simulations.is_busy())
+
+        assert homepage.simulations.generation == generation + 1
+        homepage.cleanup()
+
+    def test_total_loss_hides_the_range(self, qapp, wait_until):
+        homepage = Homepage()
+        homepage.update_investment(*projection())
+        homepage.show_range.setChecked(True)
+        wait_until(lambda: not homepage.simulations.is_busy())
+
+        homepage.update_investment(*projection(rate=-100.0))
+        wait_until(lambda: not homepage.simulations.is_busy())
+
+        assert homepage.chart.bands is None
+        assert "Years of Growth: 10" in homepage.details.text()
+        homepage.cleanup()
+
+    def test_switches_back_to_instructions(self, qapp):
+        homepage = Homepage()
+        homepage.update_investment(*projection())
+
+        homepage.update_investment({"is_empty": True}, [], [])
+
+        assert homepage.chart.isHidden()
+        assert homepage.details.isHidden()
+        assert not homepage.instructions.isHidden()
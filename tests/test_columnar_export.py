@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+import core.columnar_export as columnar_export
+from core.columnar_export import BAND_COLUMNS, BREAKDOWN_COLUMNS, export_breakdown
+from core.finance import project_annual_breakdown
+from core.simulation import percentile_bands, simulate_paths
+
+INVESTMENTS = [
+    {"ticker": "AAA", "rate": 5.0, "initial_deposit": 1000.0, "contribution_amount": 100.0},
+    {"ticker": "BBBB", "rate": 0.0, "initial_deposit": 500.0, "contribution_amount": 50.0},
+    {"ticker": "C", "rate": -2.5, "initial_deposit": 2000.0, "contribution_amount": 0.0},
+]
+
+def expected_capital(investments, years, compound_freq="Monthly", contrib_freq="Monthly"):
+    _, capital = project_annual_breakdown([inv["rate"] for inv in investments],
+                                          [inv["initial_deposit"] for inv in investments],
+                                          [inv["contribution_amount"] for inv in investments],
+                                          years, compound_freq, contrib_freq)
+    return capital.ravel()
+
+class TestNpzExport:
+    def test_writes_every_holding_and_year(self, tmp_path):
+        path = export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 5, "Monthly", "Monthly")
+
+        with np.load(path) as data:
+            assert sorted(data.files) == sorted(BREAKDOWN_COLUMNS)
+            assert list(data["ticker"]) == ["AAA"] * 6 + ["BBBB"] * 6 + ["C"] * 6
+            assert list(data["year"]) == list(range(6)) * 3
+            assert data["year"].dtype == np.int32
+            np.testing.assert_allclose(data["capital"], expected_capital(INVESTMENTS, 5))
+            # One year of monthly contributions is 12 payments
+            assert data["invested"][1] == 1000.0 + 12 * 100.0
+            np.testing.assert_allclose(data["profit"], data["capital"] - data["invested"])
+
+    def test_chunks_match_single_pass(self, tmp_path):
+        investments = [dict(INVESTMENTS[i % 3], ticker=f"T{i}") for i in range(25)]
+        whole = export_breakdown(str(tmp_path / "whole.npz"), investments, 3, "Quarterly", "Annually")
+        chunked = export_breakdown(str(tmp_path / "chunked.npz"), investments, 3, "Quarterly", "Annually",
+                                   chunk_size=4, compression=None)
+
+        with np.load(whole) as expected, np.load(chunked) as data:
+            for column in BREAKDOWN_COLUMNS:
+                np.testing.assert_array_equal(data[column], expected[column])
+
+    def test_projects_every_chunk_once(self, tmp_path, monkeypatch):
+        calls = []
+        project = columnar_export.project_annual_breakdown
+        monkeypatch.setattr(columnar_export, "project_annual_breakdown",
+                            lambda *args: calls.append(len(args[0])) or project(*args))
+
+        export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 2, "Monthly", "Monthly", chunk_size=2)
+
+        assert calls == [2, 1]
+
+    def test_column_projection(self, tmp_path):
+        path = export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 2, "Monthly", "Monthly",
+                                columns=["ticker", "capital"])
+
+        with np.load(path) as data:
+            assert sorted(data.files) == ["capital", "ticker"]
+            np.testing.assert_allclose(data["capital"], expected_capital(INVESTMENTS, 2))
+
+    def test_rejects_unknown_columns(self, tmp_path):
+        with pytest.raises(ValueError, match="price"):
+            export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 2, "Monthly", "Monthly", columns=["price"])
+
+    def test_falls_back_to_npz_without_pyarrow(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("core.columnar_export.is_parquet_available", lambda: False)
+
+        path = export_breakdown(str(tmp_path / "out.parquet"), INVESTMENTS, 2, "Monthly", "Monthly")
+
+        assert path == str(tmp_path / "out.npz")
+        with np.load(path) as data:
+            assert len(data["capital"]) == 9
+
+    def test_empty_portfolio(self, tmp_path):
+        path = export_breakdown(str(tmp_path / "out.npz"), [], 2, "Monthly", "Monthly")
+
+        with np.load(path) as data:
+            assert len(data["capital"]) == 0
+
+class TestPercentileBandExport:
+    def test_bands_match_the_simulation_of_every_holding(self, tmp_path):
+        investments = INVESTMENTS[:2]
+        path = export_breakdown(str(tmp_path / "out.npz"), investments, 4, "Monthly", "Quarterly",
+                                chunk_size=1, volatility=20.0, path_count=500, seed=7)
+
+        with np.load(path) as data:
+            assert sorted(data.files) == sorted(BREAKDOWN_COLUMNS + BAND_COLUMNS)
+            for index, inv in enumerate(investments):
+                years, paths = simulate_paths(inv["initial_deposit"], inv["contribution_amount"], 4, inv["rate"],
+                                              20.0, "Quarterly", 500, 7)
+                bands = percentile_bands(years, paths)
+                rows = slice(index * 5, (index + 1) * 5)
+                for column in BAND_COLUMNS:
+                    np.testing.assert_allclose(data[column][rows], getattr(bands, column))
+            assert np.all(data["p5"] <= data["median"]) and np.all(data["median"] <= data["p95"])
+
+    def test_band_column_projection(self, tmp_path):
+        path = export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 2, "Monthly", "Monthly",
+                                columns=["ticker", "median"], volatility=10.0, path_count=100, seed=1)
+
+        with np.load(path) as data:
+            assert sorted(data.files) == ["median", "ticker"]
+            assert len(data["median"]) == 9
+
+    def test_bands_need_a_volatility(self, tmp_path):
+        with pytest.raises(ValueError, match="median"):
+            export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 2, "Monthly", "Monthly", columns=["median"])
+
+class TestParquetExport:
+    def test_matches_npz(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        npz = export_breakdown(str(tmp_path / "out.npz"), INVESTMENTS, 4, "Monthly", "Monthly")
+        parquet = export_breakdown(str(tmp_path / "out.parquet"), INVESTMENTS, 4, "Monthly", "Monthly",
+                                   chunk_size=2)
+
+        table = pq.read_table(parquet)
+        assert table.column_names == list(BREAKDOWN_COLUMNS)
+        # One row group per chunk of holdings
+        assert pq.ParquetFile(parquet).num_row_groups == 2
+        with np.load(npz) as data:
+            for column in BREAKDOWN_COLUMNS:
+                assert table.column(column).to_pylist() == data[column].tolist()
+
+    def test_column_projection_and_compression(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = export_breakdown(str(tmp_path / "out.parquet"), INVESTMENTS, 4, "Monthly", "Monthly",
+                                columns=["year", "profit"], compression="snappy")
+
+        metadata = pq.ParquetFile(path).metadata
+        assert pq.read_table(path).column_names == ["year", "profit"]
+        assert metadata.row_group(0).column(0).compression == "SNAPPY"
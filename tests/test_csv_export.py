@@ -0,0 +1,87 @@
+import csv
+from math import isclose
+import numpy as np
+import pytest
+from core.csv_export import write_portfolio_csv
+from core.finance import Finance, project_annual_breakdown, project_portfolio
+
+INVESTMENTS = [
+    {"ticker": "AAA", "rate": 5.0, "initial_deposit": 1000.0, "contribution_amount": 100.0},
+    {"ticker": "BBB", "rate": 0.0, "initial_deposit": 500.0, "contribution_amount": 50.0},
+    {"ticker": "CCC", "rate": -2.5, "initial_deposit": 2000.0, "contribution_amount": 0.0},
+]
+
+def finance_results(investment, years, compound_freq, contrib_freq):
+    data = dict(investment, years=years, compound_frequency=compound_freq, contribution_frequency=contrib_freq)
+    finance = Finance(data)
+    return finance.get_results(), finance.get_annual_breakdown()
+
+def columns(investments):
+    return ([inv["rate"] for inv in investments], [inv["initial_deposit"] for inv in investments],
+            [inv["contribution_amount"] for inv in investments])
+
+class TestVectorizedProjection:
+    @pytest.mark.parametrize("compound_freq,contrib_freq", [("Monthly", "Monthly"), ("Quarterly", "Annually"),
+                                                            ("Annually", "Monthly")])
+    def test_matches_finance(self, compound_freq, contrib_freq):
+        final_capital, profit, invested = project_portfolio(*columns(INVESTMENTS), 7.5, compound_freq, contrib_freq)
+        years, capital = project_annual_breakdown(*columns(INVESTMENTS), 7.5, compound_freq, contrib_freq)
+
+        for i, investment in enumerate(INVESTMENTS):
+            results, (expected_years, expected_capital) = finance_results(investment, 7.5, compound_freq, contrib_freq)
+            assert isclose(final_capital[i], results["final_capital"], rel_tol=1e-12)
+            assert isclose(profit[i], results["profit"], rel_tol=1e-9, abs_tol=1e-9)
+            assert invested[i] == results["invested"]
+            assert list(years) == expected_years
+            np.testing.assert_allclose(capital[i], expected_capital, rtol=1e-12)
+
+    def test_rate_too_small_per_contribution_still_compounds_the_deposit(self):
+        # Compounded yearly the rate is representable, spread over 12 contributions it rounds to 0
+        rate = np.finfo(np.float64).eps * 100
+        final_capital, profit, _ = project_portfolio([rate], [1e18], [100.0], 10, "Annually", "Monthly")
+        _, capital = project_annual_breakdown([rate], [1e18], [100.0], 10, "Annually", "Monthly")
+
+        expected = 1e18 * (1 + rate / 100) ** 10 + 100.0 * 12 * 10
+        assert final_capital[0] == expected
+        assert capital[0, -1] == expected
+        assert profit[0] > 0
+
+class TestWritePortfolioCsv:
+    def read_rows(self, path):
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+    def test_exact_final_values(self, tmp_path):
+        path = str(tmp_path / "export.csv")
+        write_portfolio_csv(path, INVESTMENTS, 10, "Monthly", "Quarterly")
+        rows = self.read_rows(path)
+
+        header = rows.index(["Ticker", "Annual Rate (%)", "Initial Deposit", "Contribution Amount",
+                             "Expected Final Value", "Total Invested", "Profit"])
+        for investment, row in zip(INVESTMENTS, rows[header + 1:]):
+            results, _ = finance_results(investment, 10, "Monthly", "Quarterly")
+            assert row[0] == investment["ticker"]
+            assert row[4] == f"{results['final_capital']:.2f}"
+        assert rows[-1][0] == "Portfolio Total"
+        assert "Year-by-Year Breakdown" not in [row[0] for row in rows if row]
+
+    def test_breakdown(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("core.csv_export.EXPORT_CHUNK_SIZE", 2)
+        path = str(tmp_path / "export.csv")
+        write_portfolio_csv(path, INVESTMENTS, 4, "Annually", "Annually", include_breakdown=True)
+        rows = self.read_rows(path)
+
+        start = rows.index(["Year-by-Year Breakdown"])
+        assert rows[start + 1] == ["Ticker", "Year 0", "Year 1", "Year 2", "Year 3", "Year 4"]
+        breakdown = rows[start + 2:]
+        assert [row[0] for row in breakdown] == ["AAA", "BBB", "CCC", "Portfolio Total"]
+
+        _, (_, capital) = finance_results(INVESTMENTS[0], 4, "Annually", "Annually")
+        assert breakdown[0][1:] == [f"{value:.2f}" for value in capital]
+        totals = np.array([[float(value) for value in row[1:]] for row in breakdown[:3]]).sum(axis=0)
+        np.testing.assert_allclose([float(value) for value in breakdown[3][1:]], totals, atol=0.02)
+
+    def test_empty_portfolio(self, tmp_path):
+        path = str(tmp_path / "export.csv")
+        write_portfolio_csv(path, [], 5, "Monthly", "Monthly", include_breakdown=True)
+        assert self.read_rows(path)[-1] == ["Portfolio Total", "0.00", "0.00", "0.00", "0.00", "0.00", "0.00"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from core.downsampling import downsample, lttb, visible_slice
+
+class TestLttb:
+    def test_short_series_is_kept(self):
+        assert list(lttb([0, 1, 2], [5, 6, 7], 10)) == [0, 1, 2]
+
+    def test_keeps_endpoints_and_order(self):
+        x = np.arange(10_000, dtype=float)
+        y = np.sin(x / 100)
+
+        indices = lttb(x, y, 500)
+
+        assert len(indices) == 500
+        assert indices[0] == 0 and indices[-1] == 9_999
+        assert np.all(np.diff(indices) > 0)
+
+    def test_keeps_peaks(self):
+        x = np.arange(100_000, dtype=float)
+        y = np.zeros_like(x)
+        y[12_345] = 50.0
+        y[67_890] = -30.0
+
+        indices = lttb(x, y, 300)
+
+        assert 12_345 in indices and 67_890 in indices
+
+    def test_stays_close_to_the_shape(self):
+        x = np.linspace(0, 40, 50_000)
+        y = 1000 * 1.07 ** x
+
+        indices = lttb(x, y, 600)
+
+        # Linear interpolation between kept points stays within 0.1% of the curve
+        interpolated = np.interp(x, x[indices], y[indices])
+        assert np.max(np.abs(interpolated - y) / y) < 1e-3
+
+class TestVisibleRange:
+    def test_slice_includes_neighbours(self):
+        x = np.arange(10, dtype=float)
+
+        assert visible_slice(x, 2.5, 5.5) == slice(2, 7)
+        assert visible_slice(x, -5, 50) == slice(0, 10)
+
+    @pytest.mark.parametrize("x_min,x_max", [(0, 10_000), (2_000, 2_500), (9_990, 10_000)])
+    def test_downsample_limits_points(self, x_min, x_max):
+        x = np.arange(10_001, dtype=float)
+        y = np.cumsum(np.random.default_rng(0).normal(size=len(x)))
+
+        x_drawn, y_drawn = downsample(x, y, x_min, x_max, 400)
+
+        assert len(x_drawn) <= 400
+        assert x_drawn[0] <= x_min and x_drawn[-1] >= min(x_max, 10_000)
+        np.testing.assert_array_equal(y_drawn, y[x_drawn.astype(int)])
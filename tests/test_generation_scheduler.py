@@ -0,0 +1,69 @@
+import pytest
+from core.generation_scheduler import GenerationScheduler, GenerationWorker
+
+class SquareWorker(GenerationWorker):
+    def compute(self, request):
+        if request < 0:
+            raise ValueError("negative request")
+        return request * request
+
+class SquareScheduler(GenerationScheduler):
+    worker_class = SquareWorker
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.results = []
+        self.errors = []
+
+    def publish(self, result):
+        self.results.append(result)
+
+    def report_failure(self, error_message):
+        self.errors.append(error_message)
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = SquareScheduler(delay=20)
+    yield scheduler
+    scheduler.shutdown()
+
+class TestGenerationScheduler:
+    def test_only_the_latest_request_is_published(self, scheduler, wait_until):
+        for request in range(1, 21):
+            scheduler.submit(request)
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert scheduler.results == [400]
+
+    def test_edits_are_debounced(self, scheduler, wait_until):
+        reads = []
+
+        def read_request():
+            reads.append(True)
+            return len(reads)
+        for _ in range(10):
+            scheduler.schedule(read_request)
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert len(reads) == 1
+        assert scheduler.results == [1]
+
+    def test_incomplete_requests_are_skipped(self, scheduler, wait_until):
+        scheduler.schedule(lambda: None)
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert scheduler.results == []
+
+    def test_cancelled_requests_are_not_published(self, scheduler, wait_until):
+        scheduler.submit(3)
+        scheduler.cancel()
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert scheduler.results == []
+
+    def test_failures_are_reported(self, scheduler, wait_until):
+        scheduler.submit(-1)
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert scheduler.results == []
+        assert scheduler.errors == ["negative request"]
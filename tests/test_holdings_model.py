@@ -0,0 +1,255 @@
+import json
+import numpy as np
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QLineEdit
+from core.edit_journal import EditJournal
+from core.snapshot_store import SnapshotStore
+from ui.holdings_model import Holding, HoldingsModel
+
+def make_holdings(count, rate=10.0):
+    holdings = []
+    for i in range(count):
+        holding = Holding(str(i), f"T{i}", "1000", "100")
+        holding.set_rate(rate)
+        holdings.append(holding)
+    return holdings
+
+class TestHolding:
+    def test_get_data_converts_the_inputs(self):
+        holding = Holding("1", " aapl ", "1000", "50.5", rate=12.0)
+
+        data, error = holding.get_data("Monthly", "Annually", 10)
+
+        assert error is None
+        assert data == {"ticker": "AAPL", "rate": 12.0, "initial_deposit": 1000.0, "contribution_amount": 50.5,
+                        "compound_frequency": "Monthly", "contribution_frequency": "Annually", "years": 10}
+
+    @pytest.mark.parametrize("fields, message", [
+        (("", "1", "1"), "Please enter a ticker symbol"),
+        (("AAPL", "abc", "1"), "Please enter valid numbers for deposit and contribution"),
+        (("AAPL", "-1", "1"), "Amounts cannot be negative"),
+        (("AAPL", "1", "1"), "Please wait for ticker analysis to complete or enter a valid ticker"),
+    ])
+    def test_get_data_reports_invalid_inputs(self, fields, message):
+        assert Holding("1", *fields).get_data("Monthly", "Monthly", 10) == (None, message)
+
+    def test_error_clears_the_rate(self):
+        holding = Holding("1", "AAPL", rate=12.0)
+
+        holding.set_error("Error for AAPL: not found")
+
+        assert holding.rate is None
+        assert holding.status == Holding.ERROR
+
+class TestHoldingsModel:
+    def test_add_and_remove(self, qapp):
+        model = HoldingsModel()
+        model.add_holdings(make_holdings(3))
+
+        removed = model.remove_holding(1)
+
+        assert removed.ticker == "T1"
+        assert model.rowCount() == 2
+        assert model.data(model.index(1, HoldingsModel.TICKER)) == "T2"
+        assert model.data(model.index(0, HoldingsModel.RATE)) == "10.00%"
+
+    def test_editing_the_ticker_resets_the_rate(self, qapp):
+        model = HoldingsModel()
+        model.add_holdings(make_holdings(1))
+        edited, changed = [], []
+        model.ticker_edited.connect(edited.append)
+        model.holding_changed.connect(changed.append)
+
+        assert model.setData(model.index(0, HoldingsModel.TICKER), "MSFT")
+
+        holding = model.holdings[0]
+        assert (holding.ticker, holding.rate, holding.status) == ("MSFT", None, Holding.IDLE)
+        assert edited == [holding] and changed == [holding]
+
+    def test_editing_an_amount_keeps_the_rate(self, qapp):
+        model = HoldingsModel()
+        model.add_holdings(make_holdings(1))
+        edited = []
+        model.ticker_edited.connect(edited.append)
+
+        assert model.setData(model.index(0, HoldingsModel.INITIAL_DEPOSIT), "2500")
+        # Unchanged values and read-only columns are not edits
+        assert not model.setData(model.index(0, HoldingsModel.INITIAL_DEPOSIT), "2500")
+        assert not model.setData(model.index(0, HoldingsModel.RATE), "5")
+
+        assert model.holdings[0].initial_deposit == "2500"
+        assert model.holdings[0].rate == 10.0
+        assert edited == []
+
+    def test_only_inputs_are_editable(self, qapp):
+        model = HoldingsModel()
+        model.add_holdings(make_holdings(1))
+
+        editable = [column for column in range(model.columnCount())
+                    if model.flags(model.index(0, column)) & Qt.ItemFlag.ItemIsEditable]
+
+        assert editable == [HoldingsModel.TICKER, HoldingsModel.INITIAL_DEPOSIT, HoldingsModel.CONTRIBUTION]
+
+    def test_tooltip_marks_windows_the_history_cannot_fill(self, qapp):
+        import pandas as pd
+        from core.ticker_cache import ticker_cache
+        index = pd.bdate_range(start="2020-01-01", end="2025-01-01")
+        ticker_cache.store("T0", pd.DataFrame({"Close": 100.0 * 1.0003 ** np.arange(len(index))}, index=index), 8.0)
+        model = HoldingsModel()
+        model.add_holdings(make_holdings(1))
+
+        try:
+            tooltip = model.data(model.index(0, HoldingsModel.STATUS), Qt.ItemDataRole.ToolTipRole).split("\n")
+        finally:
+            ticker_cache.clear()
+
+        assert tooltip[0].startswith("1y rolling CAGR: median")
+        assert tooltip[1:] == ["3y rolling CAGR: not available, needs 6 years of prices",
+                               "5y rolling CAGR: not available, needs 10 years of prices"]
+
+class TestAnalysisTracker:
+    def test_signals_once_when_the_last_analysis_completes(self, qapp):
+        model = HoldingsModel()
+        holdings = make_holdings(3)
+        for holding in holdings[:2]:
+            holding.set_pending(Holding.ANALYZING, "Analyzing...")
+        model.add_holdings(holdings)
+        finished = []
+        model.analysis_tracker.all_finished.connect(lambda: finished.append(True))
+
+        holdings[0].set_rate(5.0)
+        model.refresh_row(0)
+        assert (model.analysis_tracker.pending, finished) == (1, [])
+
+        holdings[1].set_error("Error for T1: not found")
+        model.refresh_row(1)
+        model.refresh_all()
+        assert (model.analysis_tracker.pending, finished) == (0, [True])
+
+    def test_removed_holdings_are_not_pending(self, qapp):
+        model = HoldingsModel()
+        holdings = make_holdings(2)
+        holdings[1].set_pending(Holding.AWAITING, "Fetching T1 rate...")
+        model.add_holdings(holdings)
+        finished = []
+        model.analysis_tracker.all_finished.connect(lambda: finished.append(True))
+
+        model.remove_holding(1)
+
+        assert model.analysis_tracker.pending == 0
+        assert finished == [True]
+
+class TestAdvancedTable:
+    @pytest.fixture
+    def advanced(self, qapp, tmp_path, monkeypatch):
+        monkeypatch.setenv("INVESTMENT_APP_HOME", str(tmp_path))
+        from ui.advanced import Advanced
+        widget = Advanced(EditJournal(str(tmp_path / "journal")), SnapshotStore(str(tmp_path / "snapshots")))
+        widget.resize(800, 600)
+        yield widget
+        widget.cleanup()
+
+    def test_widget_count_does_not_grow_with_holdings(self, advanced):
+        advanced.show()
+        advanced.holdings_model.add_holdings(make_holdings(10))
+        editors = len(advanced.findChildren(QLineEdit))
+
+        advanced.holdings_model.add_holdings(make_holdings(10_000))
+
+        assert advanced.holdings_model.rowCount() == 10_010
+        assert len(advanced.findChildren(QLineEdit)) == editors
+
+    def test_collects_every_holding(self, advanced):
+        advanced.years.setText("10")
+        advanced.holdings_model.add_holdings(make_holdings(1000))
+
+        investments, years = advanced.get_investments_data()
+
+        assert years == 10
+        assert len(investments) == 1000
+        assert investments[0]["ticker"] == "T0"
+
+    def test_reports_the_first_invalid_row(self, advanced):
+        advanced.years.setText("10")
+        holdings = make_holdings(5)
+        holdings[3].initial_deposit = ""
+        advanced.holdings_model.add_holdings(holdings)
+
+        assert advanced.get_investments_data() is None
+        assert advanced.message.text() == "Row 4: Please enter an initial deposit amount"
+        assert advanced.holdings_table.selectionModel().isRowSelected(3)
+
+    @pytest.fixture
+    def validations(self, monkeypatch):
+        from ui.advanced import Advanced
+        validations = []
+        monkeypatch.setattr(Advanced, "_start_bulk_validation",
+                            lambda self, saved_rates, new_tickers=(): validations.append((saved_rates, list(new_tickers))))
+        return validations
+
+    def test_edits_are_restored_from_the_journal(self, advanced, tmp_path, validations):
+        from ui.advanced import Advanced
+        advanced.journal.recover()
+        advanced.add()
+        model = advanced.holdings_model
+        model.setData(model.index(0, HoldingsModel.TICKER), "AAPL")
+        model.setData(model.index(0, HoldingsModel.INITIAL_DEPOSIT), "1000")
+        advanced.cleanup()
+
+        restored = Advanced(EditJournal(str(tmp_path / "journal")), SnapshotStore(str(tmp_path / "snapshots")))
+        restored.restore_from_journal()
+
+        holding = restored.holdings_model.holdings[0]
+        assert (holding.ticker, holding.initial_deposit) == ("AAPL", "1000")
+        # The rate was never fetched, the restored holding asks for it again
+        assert holding.status == Holding.AWAITING
+        assert validations == [({}, ["AAPL"])]
+        restored.cleanup()
+
+    def test_save_waits_for_running_analyses(self, advanced):
+        advanced.years.setText("10")
+        holdings = make_holdings(2)
+        holdings[1].set_pending(Holding.ANALYZING, "Analyzing T1...")
+        advanced.holdings_model.add_holdings(holdings)
+        saved = []
+        advanced.investment_saved.connect(saved.append)
+
+        advanced.save_investments()
+        assert saved == []
+        assert advanced.message.text().startswith("Still analyzing: T1.")
+
+        advanced._on_analysis_success("T1", 8.0)
+
+        assert len(saved) == 1
+        assert advanced.waiting_action is None
+
+    def test_failed_load_keeps_the_portfolio(self, advanced, tmp_path, wait_until):
+        advanced.journal.recover()
+        advanced.add()
+        model = advanced.holdings_model
+        model.setData(model.index(0, HoldingsModel.TICKER), "AAPL")
+        sequence = advanced.journal.sequence
+        broken = tmp_path / "broken.json"
+        broken.write_text('{"metadata": {"years": 5', encoding="utf-8")
+
+        advanced._start_file_load(str(broken))
+        wait_until(lambda: advanced.load_worker is None)
+
+        assert [holding.ticker for holding in model.holdings] == ["AAPL"]
+        assert advanced.journal.sequence == sequence
+        assert advanced.message.text().startswith("The selected file")
+
+    def test_loaded_rates_are_validated(self, advanced, tmp_path, validations, wait_until):
+        advanced.validate_on_load.setChecked(True)
+        path = tmp_path / "portfolio.json"
+        path.write_text(json.dumps({
+            "metadata": {"years": 10, "compound_frequency": "Monthly", "contribution_frequency": "Monthly"},
+            "investments": [{"ticker": "AAPL", "rate": 8.0, "initial_deposit": 1000, "contribution_amount": 100}],
+        }), encoding="utf-8")
+
+        advanced._start_file_load(str(path))
+        wait_until(lambda: advanced.load_worker is None)
+
+        assert [holding.status for holding in advanced.holdings_model.holdings] == [Holding.OK]
+        assert validations == [({"AAPL": 8.0}, [])]
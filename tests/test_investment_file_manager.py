@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+from core.investment_file_manager import InvestmentFileManager, validate_portfolio_files
+from core.portfolio_validator import PortfolioValidationError
+from core.file_thread import PortfolioSaveWorker
+from core.session import SessionState
+
+INVESTMENTS = [
+    {"ticker": "AAPL", "rate": 12.5, "initial_deposit": 1000.0, "contribution_amount": 100.0},
+    {"ticker": "MSFT", "rate": 9.0, "initial_deposit": 500.0, "contribution_amount": 50.0},
+]
+
+@pytest.fixture
+def manager(tmp_path):
+    return InvestmentFileManager(session=SessionState(str(tmp_path / "session.json")))
+
+@pytest.fixture
+def save_data():
+    return InvestmentFileManager.build_save_data(INVESTMENTS, 10, "Monthly", "Quarterly")
+
+class TestWritePortfolio:
+    @pytest.mark.parametrize("name", ["portfolio.json", "portfolio.invb"])
+    def test_round_trip(self, manager, save_data, tmp_path, name):
+        path = str(tmp_path / name)
+        manager.write_portfolio(path, save_data)
+        assert manager.read_portfolio(path) == save_data
+        assert os.listdir(tmp_path) == [name]
+
+    def test_failed_write_keeps_previous_file(self, manager, save_data, tmp_path):
+        path = str(tmp_path / "portfolio.json")
+        manager.write_portfolio(path, save_data)
+
+        broken = dict(save_data, investments=[{"ticker": object()}])
+        with pytest.raises(TypeError):
+            manager.write_portfolio(path, broken)
+
+        assert manager.read_portfolio(path) == save_data
+        assert os.listdir(tmp_path) == ["portfolio.json"]
+
+class TestHeadlessCore:
+    def test_does_not_import_qt(self):
+        code = "import sys, core.investment_file_manager; print('PySide6' in sys.modules)"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
+
+    def test_save_and_load(self, manager, tmp_path):
+        path = str(tmp_path / "portfolio.json")
+        manager.save_investments(path, INVESTMENTS, 10, "Monthly", "Quarterly")
+
+        data = manager.load_investments(path)
+
+        assert data["investments"] == INVESTMENTS
+        assert manager.session.get_last_portfolio() == path
+
+    def test_load_invalid_file(self, manager, save_data, tmp_path):
+        path = str(tmp_path / "portfolio.json")
+        manager.write_portfolio(path, dict(save_data, investments=[{"ticker": "AAPL"}]))
+        with pytest.raises(PortfolioValidationError, match="index 0"):
+            manager.load_investments(path)
+
+    def test_validate_many_files_in_parallel(self, manager, save_data, tmp_path):
+        valid = str(tmp_path / "valid.invb")
+        invalid = str(tmp_path / "invalid.json")
+        missing = str(tmp_path / "missing.json")
+        manager.write_portfolio(valid, save_data)
+        manager.write_portfolio(invalid, dict(save_data, metadata={}))
+
+        reports = validate_portfolio_files([valid, invalid, missing], max_workers=2)
+
+        assert reports[valid].is_valid
+        assert not reports[invalid].is_valid
+        assert "Could not read the file" in reports[missing].summary()
+
+class TestPortfolioSaveWorker:
+    def test_reports_completion(self, manager, save_data, tmp_path):
+        path = str(tmp_path / "portfolio.json")
+        finished, failed = [], []
+        worker = PortfolioSaveWorker(manager, path, save_data)
+        worker.save_finished.connect(finished.append)
+        worker.save_failed.connect(failed.append)
+
+        worker.run()
+
+        assert finished == [path] and failed == []
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f) == save_data
+
+    def test_reports_failure(self, manager, save_data, tmp_path):
+        failed = []
+        worker = PortfolioSaveWorker(manager, str(tmp_path / "missing" / "portfolio.json"), save_data)
+        worker.save_failed.connect(failed.append)
+
+        worker.run()
+
+        assert len(failed) == 1 and failed[0].startswith("Failed to save investments")
+
+    def test_snapshot_errors_do_not_fail_the_save(self, manager, save_data, tmp_path):
+        class BrokenStore:
+            def add(self, data, name):
+                raise TypeError("unexpected value")
+        manager.snapshot_store = BrokenStore()
+        path = str(tmp_path / "portfolio.json")
+        finished, failed = [], []
+        worker = PortfolioSaveWorker(manager, path, save_data)
+        worker.save_finished.connect(finished.append)
+        worker.save_failed.connect(failed.append)
+
+        worker.run()
+
+        assert finished == [path] and failed == []
@@ -0,0 +1,111 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from PySide6.QtWidgets import QApplication
+from core.edit_journal import EditJournal
+from core.ticker_thread import ModulePreloadWorker
+from ui.advanced import Advanced
+from ui.portfolio import Portfolio
+from ui.settings import Settings
+
+# Time allowed from creating the main window to its first paint
+STARTUP_BUDGET = 1.0  # seconds
+# Time allowed to import the main window in a fresh interpreter
+IMPORT_BUDGET = 2.0  # seconds
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def window(qapp, tmp_path, monkeypatch):
+    monkeypatch.setenv("INVESTMENT_APP_HOME", str(tmp_path))
+    from ui.main_window import MainWindow
+    windows = []
+
+    def create():
+        windows.append(MainWindow())
+        return windows[-1]
+    yield create
+    for created in windows:
+        created.close()
+
+class TestLazyPages:
+    def test_only_the_homepage_is_built_at_startup(self, window):
+        main_window = window()
+
+        assert (main_window.portfolio, main_window.settings, main_window.advanced) == (None, None, None)
+        assert main_window.pages.count() == 4
+
+    def test_journal_edits_are_restored_at_startup(self, window):
+        journal = EditJournal()
+        journal.record("add", id="1", fields={"ticker": "AAPL", "initial_deposit": "1000",
+                                              "contribution_amount": "100", "rate": 8.0})
+        journal.close()
+
+        main_window = window()
+
+        assert isinstance(main_window.advanced, Advanced)
+        assert main_window.pages.widget(main_window.PAGE_ADVANCED) is main_window.advanced
+        holding = main_window.advanced.holdings_model.holdings[0]
+        assert (holding.ticker, holding.rate) == ("AAPL", 8.0)
+        assert main_window.pages.currentIndex() == main_window.PAGE_HOME
+
+    def test_pages_are_built_on_first_navigation(self, window):
+        main_window = window()
+
+        main_window.settings_button.click()
+        settings = main_window.settings
+        main_window.home_button.click()
+        main_window.settings_button.click()
+
+        assert isinstance(settings, Settings)
+        assert main_window.settings is settings
+        assert main_window.pages.currentWidget() is settings
+        assert main_window.pages.count() == 4
+
+    def test_portfolio_button_follows_the_mode(self, window):
+        main_window = window()
+
+        main_window.portfolio_button.click()
+        main_window._change_mode(main_window.MODE_ADVANCED)
+        main_window.portfolio_button.click()
+
+        assert isinstance(main_window.portfolio, Portfolio)
+        assert isinstance(main_window.advanced, Advanced)
+        assert main_window.pages.currentIndex() == main_window.PAGE_ADVANCED
+
+    def test_startup_time(self, window):
+        start = time.perf_counter()
+        main_window = window()
+        main_window.show()
+        QApplication.processEvents()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < STARTUP_BUDGET, f"First window took {elapsed:.3f}s"
+
+class TestStartupImports:
+    def test_main_window_startup_skips_the_price_data_libraries(self, tmp_path):
+        # numpy comes with the chart, the advanced page and the workers, never with the first window
+        modules = ModulePreloadWorker.MODULES + ("numpy",)
+        script = ("import sys, time; start = time.perf_counter(); import ui.main_window; "
+                  "print(time.perf_counter() - start); "
+                  "from PySide6.QtWidgets import QApplication; app = QApplication([]); "
+                  "window = ui.main_window.MainWindow(); window.show(); app.processEvents(); "
+                  f"print(','.join(m for m in {modules!r} if m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+                                env=dict(os.environ, QT_QPA_PLATFORM="offscreen", INVESTMENT_APP_HOME=str(tmp_path)),
+                                check=True).stdout
+        elapsed, loaded = output.splitlines()[-2:]
+
+        assert loaded == ""
+        assert float(elapsed) < IMPORT_BUDGET, f"Importing the main window took {float(elapsed):.3f}s"
+
+    def test_preload_imports_the_modules(self, qapp, capsys):
+        sys.modules.pop("colorsys", None)
+        worker = ModulePreloadWorker(("colorsys", "no_such_module"))
+
+        worker.start()
+        worker.wait()
+
+        assert "colorsys" in sys.modules
+        assert "Preload could not import no_such_module" in capsys.readouterr().out
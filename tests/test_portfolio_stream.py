@@ -0,0 +1,75 @@
+import io
+import json
+import pytest
+from core.portfolio_stream import iter_portfolio_events, read_portfolio_streaming
+from core.portfolio_validator import PortfolioValidationError
+
+def parse(text, chunk_size=64 * 1024):
+    metadata = None
+    investments = []
+    for kind, value in iter_portfolio_events(io.StringIO(text), chunk_size=chunk_size):
+        if kind == "metadata":
+            metadata = value
+        else:
+            investments.append(value)
+    return metadata, investments
+
+class TestIterPortfolioEvents:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64, 64 * 1024])
+    def test_matches_json_load(self, chunk_size, portfolio_metadata, make_investments):
+        data = {"metadata": portfolio_metadata, "investments": make_investments(25, huge_ints=True, notes=True)}
+        metadata, investments = parse(json.dumps(data, indent=2, ensure_ascii=False), chunk_size)
+        assert metadata == portfolio_metadata
+        assert investments == data["investments"]
+
+    def test_metadata_after_investments_and_unknown_keys(self, portfolio_metadata, make_investments):
+        investments = make_investments(2, huge_ints=True, notes=True)
+        text = json.dumps({"investments": investments, "extra": {"a": [1, 2]}, "metadata": portfolio_metadata})
+        metadata, investments = parse(text, chunk_size=5)
+        assert metadata == portfolio_metadata
+        assert len(investments) == 2
+
+    def test_empty_investments(self, portfolio_metadata):
+        metadata, investments = parse(json.dumps({"metadata": portfolio_metadata, "investments": []}))
+        assert metadata == portfolio_metadata
+        assert investments == []
+
+    def test_missing_investments(self, portfolio_metadata):
+        with pytest.raises(ValueError, match="does not contain metadata and investments"):
+            parse(json.dumps({"metadata": portfolio_metadata}))
+
+    def test_invalid_metadata(self):
+        with pytest.raises(ValueError, match="Invalid metadata"):
+            parse(json.dumps({"metadata": {"years": 1}, "investments": []}))
+
+    def test_invalid_record_reports_index(self, portfolio_metadata, make_investments):
+        investments = make_investments(3, huge_ints=True, notes=True)
+        del investments[2]["rate"]
+        with pytest.raises(ValueError, match="index 2"):
+            parse(json.dumps({"metadata": portfolio_metadata, "investments": investments}))
+
+    def test_reports_every_invalid_record(self, portfolio_metadata, make_investments):
+        investments = make_investments(5, huge_ints=True, notes=True)
+        del investments[1]["rate"]
+        investments[3]["ticker"] = 3
+        with pytest.raises(PortfolioValidationError) as error:
+            parse(json.dumps({"metadata": portfolio_metadata, "investments": investments}), chunk_size=16)
+        assert error.value.report.invalid_indices() == [1, 3]
+
+    @pytest.mark.parametrize("text", ['{"metadata": ', '{"metadata": {}} trailing', '[]', '{"investments": [1,]}'])
+    def test_invalid_json(self, text):
+        with pytest.raises(ValueError):
+            parse(text, chunk_size=4)
+
+class TestReadPortfolioStreaming:
+    def test_batches_and_progress(self, tmp_path, portfolio_metadata, make_investments):
+        path = tmp_path / "portfolio.json"
+        investments = make_investments(1050, huge_ints=True, notes=True)
+        path.write_text(json.dumps({"metadata": portfolio_metadata, "investments": investments}), encoding="utf-8")
+        progress = []
+        events = list(read_portfolio_streaming(str(path), batch_size=500,
+                                               progress_callback=lambda done, total: progress.append((done, total))))
+        assert events[0] == ("metadata", portfolio_metadata)
+        assert [len(batch) for kind, batch in events[1:]] == [500, 500, 50]
+        assert progress[-1][0] == progress[-1][1]
+        assert all(done <= total for done, total in progress)
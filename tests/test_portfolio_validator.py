@@ -0,0 +1,78 @@
+import time
+import pytest
+from core.portfolio_validator import PortfolioValidationError, PortfolioValidator, validate_portfolio
+
+class TestValidatePortfolio:
+    def test_valid_portfolio(self, portfolio_metadata, make_investments):
+        report = validate_portfolio({"metadata": portfolio_metadata, "investments": make_investments(10)})
+        assert report.is_valid
+        assert report.record_count == 10
+
+    def test_reports_every_problem(self, portfolio_metadata, make_investments):
+        investments = make_investments(6)
+        del investments[1]["rate"]
+        investments[2]["ticker"] = "  "
+        investments[2]["initial_deposit"] = -5
+        investments[3]["contribution_amount"] = "100"
+        investments[4]["rate"] = float("nan")
+        investments[5] = ["not", "a", "record"]
+
+        report = validate_portfolio({"metadata": portfolio_metadata, "investments": investments})
+
+        assert not report.is_valid
+        assert [(issue.index, issue.field) for issue in report.issues] == [
+            (1, "rate"), (2, "ticker"), (2, "initial_deposit"), (3, "contribution_amount"), (4, "rate"), (5, None)
+        ]
+        assert report.invalid_indices() == [1, 2, 3, 4, 5]
+        assert "Investment at index 3: field 'contribution_amount' must be a number" in report.summary()
+
+    def test_ranges(self, portfolio_metadata, make_investments):
+        investments = make_investments(4)
+        investments[0]["rate"] = -3.5
+        investments[1]["rate"] = -100
+        investments[2]["years"] = 0
+        investments[3]["compound_frequency"] = "Weekly"
+        investments[3]["initial_deposit"] = True
+
+        report = validate_portfolio({"metadata": portfolio_metadata, "investments": investments})
+
+        assert [(issue.index, issue.field) for issue in report.issues] == [
+            (1, "rate"), (2, "years"), (3, "initial_deposit"), (3, "compound_frequency")
+        ]
+
+    def test_metadata_problems(self, portfolio_metadata):
+        metadata = {"years": "ten", "compound_frequency": "Daily"}
+        report = validate_portfolio({"metadata": metadata, "investments": []})
+        assert [(issue.index, issue.field) for issue in report.issues] == [
+            (None, "years"), (None, "compound_frequency"), (None, "contribution_frequency")
+        ]
+        assert str(report.issues[0]).startswith("Invalid metadata")
+
+    @pytest.mark.parametrize("sections", [None, ("metadata",), ("investments",)])
+    def test_document_problems(self, sections, portfolio_metadata):
+        document = {"metadata": portfolio_metadata, "investments": []}
+        data = [] if sections is None else {name: document[name] for name in sections}
+        assert not validate_portfolio(data).is_valid
+
+    def test_summary_is_limited(self, portfolio_metadata):
+        investments = [{} for _ in range(5)]
+        summary = validate_portfolio({"metadata": portfolio_metadata, "investments": investments}).summary(limit=3)
+        assert summary.splitlines()[-1] == "... and 17 more problems"
+
+    def test_large_portfolio_is_fast(self, portfolio_metadata, make_investments):
+        data = {"metadata": portfolio_metadata, "investments": make_investments(100_000)}
+        start = time.perf_counter()
+        report = validate_portfolio(data)
+        assert report.is_valid
+        assert time.perf_counter() - start < 1.0
+
+class TestPortfolioValidator:
+    def test_raise_if_invalid(self, portfolio_metadata):
+        validator = PortfolioValidator()
+        validator.check_metadata(portfolio_metadata)
+        validator.has_investments = True
+        assert not validator.check_investment({"ticker": "A"}, 7)
+        with pytest.raises(PortfolioValidationError) as error:
+            validator.raise_if_invalid()
+        assert error.value.report.invalid_indices() == [7]
+        assert "index 7" in str(error.value)
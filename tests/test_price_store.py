@@ -0,0 +1,135 @@
+import multiprocessing
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from core.price_store import PriceMatrixStore
+from core.ticker_cache import TickerCache
+
+def make_history(start, periods, first_price=100.0):
+    index = pd.bdate_range(start=start, periods=periods)
+    return pd.DataFrame({'Close': first_price + np.arange(periods, dtype=float)}, index=index)
+
+def column_sum(directory, ticker):
+    store = PriceMatrixStore(directory)
+    return float(np.nansum(store.column(ticker)))
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceMatrixStore(str(tmp_path / "store"))
+
+class TestPriceMatrixStore:
+    def test_empty_store(self, store):
+        assert store.rows == 0
+        assert store.tickers == []
+        assert store.prices().shape == (0, 0)
+        assert store.column("AAPL") is None
+
+    def test_aligns_tickers_on_dates(self, store):
+        store.update({
+            "aapl": make_history("2020-01-01", 5),
+            "MSFT": make_history("2020-01-03", 5, first_price=200.0),
+        })
+        assert store.tickers == ["AAPL", "MSFT"]
+        assert store.rows == 7
+        prices = store.prices()
+        assert np.isnan(prices[0, 1])
+        assert prices[2, 1] == 200.0
+        assert np.isnan(prices[-1, 0])
+
+    def test_readers_get_memory_mapped_views(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        prices = store.prices()
+        assert isinstance(prices, np.memmap)
+        assert not prices.flags.writeable
+        assert isinstance(store.column("AAPL"), np.memmap)
+
+    def test_new_dates_are_appended(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        generation = store._index["generation"]
+        store.update({"AAPL": make_history("2020-01-01", 15)})
+        assert store.rows == 15
+        assert store._index["generation"] == generation
+        assert store.column("AAPL")[-1] == 114.0
+
+    def test_append_drops_bytes_of_an_interrupted_write(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        # A crash between the data writes and the index update leaves orphaned bytes
+        for path in (store._prices_path(), store._dates_path()):
+            with open(path, 'ab') as f:
+                f.write(b"\x01" * 12)
+
+        store.update({"AAPL": make_history("2020-01-01", 15)})
+
+        assert store.rows == 15
+        assert list(store.column("AAPL")) == [100.0 + i for i in range(15)]
+        assert store.dates()[-1] == np.datetime64(make_history("2020-01-01", 15).index[-1], 'D')
+
+    def test_existing_rows_are_filled_in_place(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        history = make_history("2020-01-01", 10)
+        history.iloc[3, 0] = 999.0
+        store.update({"AAPL": history})
+        assert store.column("AAPL")[3] == 999.0
+
+    def test_new_ticker_rewrites_generation(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        old_prices = store.prices()
+        store.update({"MSFT": make_history("2020-01-01", 10, first_price=50.0)})
+        assert store.tickers == ["AAPL", "MSFT"]
+        assert store.column("AAPL")[0] == 100.0
+        assert store.column("MSFT")[0] == 50.0
+        # Views of the previous generation stay valid
+        assert old_prices[0, 0] == 100.0
+
+    def test_old_generations_are_removed_on_open(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        # Left behind when a reader still mapped them during the rebuild
+        stale = [store._prices_path(), store._dates_path()]
+        store.update({"MSFT": make_history("2020-01-01", 10)})
+        for path in stale:
+            with open(path, 'wb') as f:
+                f.write(b"\0" * 80)
+
+        reopened = PriceMatrixStore(store.directory)
+
+        assert not any(os.path.exists(path) for path in stale)
+        assert os.path.exists(reopened._prices_path())
+        assert reopened.tickers == ["AAPL", "MSFT"]
+
+    def test_window(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        dates, prices = store.window("2020-01-02", "2020-01-06")
+        assert list(dates.astype(str)) == ["2020-01-02", "2020-01-03", "2020-01-06"]
+        assert list(prices[:, 0]) == [101.0, 102.0, 103.0]
+
+    def test_history_roundtrip(self, store):
+        history = make_history("2020-01-01", 10)
+        store.update({"AAPL": history})
+        restored = store.history("AAPL")
+        assert list(restored.index) == list(history.index)
+        assert list(restored['Close']) == list(history['Close'])
+
+    def test_reopen_and_worker_process(self, store):
+        store.update({"AAPL": make_history("2020-01-01", 10)})
+        reopened = PriceMatrixStore(store.directory)
+        assert reopened.rows == 10
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            assert pool.apply(column_sum, (store.directory, "AAPL")) == sum(range(100, 110))
+
+    def test_update_from_cache(self, store):
+        cache = TickerCache()
+        cache.store("SPY", make_history("2020-01-01", 3), 5.0, fetched_at=time.time() - 60)
+        store.update_from_cache(cache)
+        assert store.tickers == ["SPY"]
+        # Stored prices expire when the cached ones would have
+        assert store.fetched_at("spy") == cache.get("SPY").fetched_at
+
+    def test_fetch_time_of_every_ticker(self, store):
+        assert store.fetched_at("AAPL") is None
+        store.update({"AAPL": make_history("2020-01-01", 10)}, {"AAPL": 1000.0})
+        store.update({"MSFT": make_history("2020-01-01", 10)})
+        reopened = PriceMatrixStore(store.directory)
+        assert reopened.fetched_at("AAPL") == 1000.0
+        assert reopened.fetched_at("MSFT") >= time.time() - 60
@@ -0,0 +1,42 @@
+import threading
+import numpy as np
+import pandas as pd
+from core.price_store import PriceMatrixStore
+from core.price_writer import PriceStoreWriter
+
+def make_history(start, periods):
+    index = pd.bdate_range(start=start, periods=periods)
+    return pd.DataFrame({'Close': 100.0 + np.arange(periods, dtype=float)}, index=index)
+
+class TestPriceStoreWriter:
+    def test_batches_are_written_in_order_off_the_calling_thread(self, tmp_path, monkeypatch):
+        store = PriceMatrixStore(str(tmp_path / "store"))
+        threads = []
+        update = store.update
+        monkeypatch.setattr(store, "update",
+                            lambda histories: threads.append(threading.get_ident()) or update(histories))
+        writer = PriceStoreWriter(store)
+
+        writer.submit({"AAPL": make_history("2020-01-01", 10)})
+        writer.submit({"MSFT": make_history("2020-01-01", 5), "SPY": None})
+        writer.shutdown()
+
+        assert PriceMatrixStore(store.directory).tickers == ["AAPL", "MSFT"]
+        assert len(threads) == 2 and threading.get_ident() not in threads
+
+    def test_empty_batches_are_skipped(self, tmp_path):
+        writer = PriceStoreWriter(PriceMatrixStore(str(tmp_path / "store")))
+        assert writer.submit({}) is None
+        assert writer.submit({"AAPL": None}) is None
+        writer.shutdown()
+
+    def test_errors_do_not_stop_the_writer(self, tmp_path, capsys):
+        store = PriceMatrixStore(str(tmp_path / "store"))
+        writer = PriceStoreWriter(store)
+
+        writer.submit({"BAD": pd.DataFrame({'Open': [1.0]})}).result()
+        writer.submit({"AAPL": make_history("2020-01-01", 10)})
+        writer.shutdown()
+
+        assert "Error storing prices" in capsys.readouterr().out
+        assert store.tickers == ["AAPL"]
@@ -0,0 +1,68 @@
+import threading
+import pytest
+from core.finance import Finance
+from core.projection_thread import ProjectionScheduler
+from ui.portfolio import Portfolio
+
+INVESTMENT = {"initial_deposit": 1000.0, "years": 10, "rate": 7.0, "compound_frequency": "Monthly",
+              "contribution_amount": 100.0, "contribution_frequency": "Monthly", "is_empty": False}
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = ProjectionScheduler(delay=20)
+    results = []
+    scheduler.projection_ready.connect(lambda result, years, capital: results.append((result, list(years))))
+    scheduler.results = results
+    yield scheduler
+    scheduler.shutdown()
+
+class TestProjectionScheduler:
+    def test_projects_on_a_worker_thread(self, scheduler, monkeypatch, wait_until):
+        expected = Finance(dict(INVESTMENT)).get_results()["final_capital"]
+        threads = []
+        calculate = Finance.calculate
+        monkeypatch.setattr(Finance, "calculate",
+                            lambda self: threads.append(threading.get_ident()) or calculate(self))
+
+        scheduler.submit(INVESTMENT)
+        wait_until(lambda: not scheduler.is_busy())
+
+        result, years = scheduler.results[0]
+        assert result["final_capital"] == pytest.approx(expected)
+        assert years == list(range(11))
+        assert threads and threading.get_ident() not in threads
+        assert "final_capital" not in INVESTMENT
+
+    def test_failures_are_reported(self, scheduler, wait_until):
+        errors = []
+        scheduler.projection_failed.connect(errors.append)
+
+        scheduler.submit(dict(INVESTMENT, compound_frequency="Daily"))
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert scheduler.results == []
+        assert len(errors) == 1
+
+class TestPortfolioLiveUpdate:
+    def test_edits_request_updates_only_while_live(self, qapp):
+        portfolio = Portfolio()
+        requests = []
+        portfolio.inputs_changed.connect(lambda: requests.append(True))
+
+        portfolio.years.setText("10")
+        portfolio.live_update.setChecked(True)
+        portfolio.rate.setText("5")
+
+        assert len(requests) == 2
+
+    def test_live_investment_does_not_report_errors(self, qapp):
+        portfolio = Portfolio()
+        portfolio.initial_deposit.setText("abc")
+
+        assert portfolio.live_investment() is None
+        assert portfolio.message.text() == ""
+
+        for line_edit, text in ((portfolio.initial_deposit, "1000"), (portfolio.years, "10"),
+                                (portfolio.rate, "7"), (portfolio.contribution, "100")):
+            line_edit.setText(text)
+        assert portfolio.live_investment() == INVESTMENT
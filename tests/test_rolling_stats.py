@@ -0,0 +1,86 @@
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from core.rolling_stats import rolling_cagr, close_prices, compute_rolling_statistics, get_rolling_statistics
+from core.ticker_cache import TickerCache
+
+def make_history(years, annual_rate=0.08, noise=0.0, seed=0):
+    index = pd.bdate_range(start="1995-01-02", periods=int(years * 261))
+    elapsed = (index - index[0]).days.values / 365
+    prices = 100 * (1 + annual_rate) ** elapsed
+    if noise:
+        prices = prices * np.exp(np.random.default_rng(seed).normal(0, noise, len(index)))
+    return pd.DataFrame({'Close': prices}, index=index)
+
+def sliced_cagr(history, window_years):
+    """Reference implementation re-slicing the frame for every window"""
+    results = []
+    for i, start in enumerate(history.index):
+        after = history.index.searchsorted(start + pd.Timedelta(days=round(window_years * 365)))
+        if after >= len(history):
+            break
+        end = history.index[after]
+        years = (end - start).days / 365
+        results.append(((history['Close'].iloc[after] / history['Close'].iloc[i]) ** (1 / years) - 1) * 100)
+    return np.array(results)
+
+class TestRollingCagr:
+    def test_constant_growth(self):
+        days, prices = close_prices(make_history(10, annual_rate=0.08))
+        values = rolling_cagr(days, prices, 3)
+        assert len(values) > 0
+        assert np.allclose(values, 8.0)
+
+    def test_matches_sliced_reference(self):
+        history = make_history(4, noise=0.01)
+        days, prices = close_prices(history)
+        expected = sliced_cagr(history, 1)
+        assert np.allclose(rolling_cagr(days, prices, 1), expected)
+
+    def test_window_longer_than_history(self):
+        days, prices = close_prices(make_history(2))
+        assert len(rolling_cagr(days, prices, 5)) == 0
+
+    def test_invalid_window(self):
+        days, prices = close_prices(make_history(2))
+        with pytest.raises(ValueError, match="Window length must be positive"):
+            rolling_cagr(days, prices, 0)
+
+    def test_non_positive_prices_are_ignored(self):
+        history = make_history(3)
+        history.iloc[10, 0] = 0
+        history.iloc[20, 0] = np.nan
+        days, prices = close_prices(history)
+        assert len(prices) == len(history) - 2
+
+    def test_thirty_years_is_fast(self):
+        days, prices = close_prices(make_history(30, noise=0.01))
+        start = time.perf_counter()
+        for window_years in (1, 3, 5, 10):
+            rolling_cagr(days, prices, window_years)
+        assert time.perf_counter() - start < 0.05
+
+class TestRollingStatistics:
+    def test_summary(self):
+        statistics = compute_rolling_statistics(make_history(12, noise=0.01), windows=(1, 5, 10))
+        assert set(statistics) == {1, 5}
+        one_year = statistics[1]
+        assert one_year.count == len(one_year.values)
+        assert one_year.min <= one_year.p5 <= one_year.p25 <= one_year.median <= one_year.p75 <= one_year.p95 <= one_year.max
+
+    def test_cached_per_ticker(self):
+        cache = TickerCache()
+        cache.store("SPY", make_history(10.5), 8.0)
+        first = get_rolling_statistics("SPY", cache=cache)
+        assert get_rolling_statistics("spy", cache=cache) is first
+        assert set(first) == {1, 3, 5}
+
+    def test_windows_the_history_cannot_fill_are_left_out(self):
+        # Five years, like the histories fetched for the rates
+        statistics = compute_rolling_statistics(make_history(5, noise=0.01))
+        assert set(statistics) == {1}
+        assert statistics[1].count > 250
+
+    def test_uncached_ticker(self):
+        assert get_rolling_statistics("SPY", cache=TickerCache()) is None
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from core.simulation import percentile_bands, simulate_paths
+
+class TestSimulatePaths:
+    def test_shape_and_start(self):
+        years, paths = simulate_paths(1000.0, 100.0, 10, 7.0, 15.0, "Monthly", path_count=500, seed=1)
+
+        assert list(years) == list(range(11))
+        assert paths.shape == (500, 11)
+        assert np.all(paths[:, 0] == 1000.0)
+
+    def test_without_volatility_grows_at_the_rate(self):
+        _, paths = simulate_paths(1000.0, 100.0, 3, 10.0, 0.0, "Quarterly", path_count=3, seed=1)
+
+        expected = [1000.0, 1500.0, 2050.0, 2655.0]
+        for path in paths:
+            np.testing.assert_allclose(path, expected)
+
+    def test_expected_growth_matches_the_rate(self):
+        _, paths = simulate_paths(1000.0, 0.0, 10, 7.0, 20.0, path_count=200_000, seed=3)
+
+        assert paths[:, -1].mean() == pytest.approx(1000.0 * 1.07 ** 10, rel=0.01)
+
+    def test_seed_is_reproducible(self):
+        first = simulate_paths(1000.0, 10.0, 5, 5.0, 10.0, path_count=10, seed=7)[1]
+        second = simulate_paths(1000.0, 10.0, 5, 5.0, 10.0, path_count=10, seed=7)[1]
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_rejects_total_loss_rate(self):
+        with pytest.raises(ValueError):
+            simulate_paths(1000.0, 0.0, 5, -100.0, 10.0)
+
+class TestPercentileBands:
+    def test_bands_are_ordered_and_as_long_as_the_horizon(self):
+        years, paths = simulate_paths(1000.0, 50.0, 30, 6.0, 18.0, path_count=5000, seed=2)
+
+        bands = percentile_bands(years, paths)
+
+        for band in (bands.p5, bands.p25, bands.median, bands.p75, bands.p95):
+            assert band.shape == (31,)
+        assert np.all(bands.p5 <= bands.p25) and np.all(bands.p25 <= bands.median)
+        assert np.all(bands.median <= bands.p75) and np.all(bands.p75 <= bands.p95)
+        np.testing.assert_allclose(bands.median, np.median(paths, axis=0))
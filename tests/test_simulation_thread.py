@@ -0,0 +1,40 @@
+import threading
+import pytest
+import core.simulation as simulation
+from core.simulation_thread import SimulationScheduler
+
+REQUEST = {"initial_deposit": 1000.0, "contribution_amount": 100.0, "years": 10, "rate": 7.0,
+           "volatility": 15.0, "contribution_frequency": "Monthly", "path_count": 200, "seed": 1}
+
+@pytest.fixture
+def scheduler(qapp):
+    scheduler = SimulationScheduler(delay=20)
+    results = []
+    scheduler.bands_ready.connect(results.append)
+    scheduler.results = results
+    yield scheduler
+    scheduler.shutdown()
+
+class TestSimulationScheduler:
+    def test_simulates_on_a_worker_thread(self, scheduler, monkeypatch, wait_until):
+        threads = []
+        simulate_paths = simulation.simulate_paths
+        monkeypatch.setattr(simulation, "simulate_paths",
+                            lambda **kwargs: threads.append(threading.get_ident()) or simulate_paths(**kwargs))
+
+        scheduler.submit(REQUEST)
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert len(scheduler.results) == 1
+        assert len(scheduler.results[0].median) == 11
+        assert threads and threading.get_ident() not in threads
+
+    def test_failures_are_reported(self, scheduler, wait_until):
+        errors = []
+        scheduler.simulation_failed.connect(errors.append)
+
+        scheduler.submit(dict(REQUEST, rate=-100.0))
+        wait_until(lambda: not scheduler.is_busy())
+
+        assert scheduler.results == []
+        assert errors == ["Rate must be greater than -100%"]
@@ -0,0 +1,114 @@
+import json
+import os
+from datetime import datetime
+import pytest
+from core.investment_file_manager import InvestmentFileManager
+from core.portfolio_validator import validate_portfolio
+from core.session import SessionState
+from core.snapshot_store import SnapshotStore, encode_portfolio
+
+INVESTMENTS = [
+    {"ticker": "AAPL", "rate": 12.5, "initial_deposit": 1000.0, "contribution_amount": 100.0},
+    {"ticker": "MSFT", "rate": 10.0, "initial_deposit": 500.0, "contribution_amount": 0.0},
+]
+
+def portfolio(investments=INVESTMENTS, years=10, compound_freq="Monthly"):
+    return InvestmentFileManager.build_save_data([dict(inv) for inv in investments], years,
+                                                 compound_freq, "Monthly")
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path / "snapshots"))
+
+def object_count(store):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(store.directory, store.OBJECTS_DIR)))
+
+class TestNormalization:
+    def test_ignores_creation_time_and_number_formatting(self):
+        first = portfolio()
+        second = portfolio([dict(INVESTMENTS[0], ticker=" aapl ", initial_deposit=1000), INVESTMENTS[1]], years=10.0)
+        second["metadata"]["created_at"] = "2000-01-01T00:00:00"
+
+        assert encode_portfolio(first) == encode_portfolio(second)
+
+    def test_content_changes_the_encoding(self):
+        assert encode_portfolio(portfolio()) != encode_portfolio(portfolio(years=11))
+
+class TestSnapshotStore:
+    def test_identical_saves_are_stored_once(self, store):
+        entries = [store.add(portfolio(), f"investments_{i}.json") for i in range(50)]
+        store.add(portfolio(years=20), "other.json")
+
+        assert len({entry.digest for entry in entries}) == 1
+        assert object_count(store) == 2
+        assert len(store.history()) == 51
+        assert len(store.history(distinct=True)) == 2
+
+    def test_history_is_newest_first_and_filters_by_name(self, store):
+        store.add(portfolio(), "a.json", datetime(2024, 1, 2))
+        store.add(portfolio(years=5), "b.json", datetime(2024, 1, 3))
+        store.add(portfolio(years=6), "a.json", datetime(2024, 1, 1))
+
+        assert [entry.timestamp for entry in store.history()] == [
+            "2024-01-03T00:00:00", "2024-01-02T00:00:00", "2024-01-01T00:00:00"]
+        assert [entry.name for entry in store.history(name="a.json")] == ["a.json", "a.json"]
+        # A new store reads the same history from the index
+        assert SnapshotStore(store.directory).history() == store.history()
+
+    def test_load_returns_a_valid_portfolio(self, store):
+        entry = store.add(portfolio(), "a.json")
+
+        data = store.load(entry.digest[:8])
+
+        assert data["investments"][0]["ticker"] == "AAPL"
+        assert data["metadata"]["years"] == 10
+        assert validate_portfolio(data).is_valid
+        with open(store.object_path(entry.digest), 'r', encoding='utf-8') as f:
+            assert json.load(f) == data
+
+    def test_resolve_rejects_unknown_snapshots(self, store):
+        store.add(portfolio(), "a.json")
+
+        with pytest.raises(KeyError):
+            store.resolve("zzzz")
+
+    def test_diff(self, store):
+        old = store.add(portfolio(), "a.json")
+        changed = [dict(INVESTMENTS[0], rate=8.0), {"ticker": "NVDA", "rate": 30.0,
+                                                   "initial_deposit": 10.0, "contribution_amount": 1.0}]
+        new = store.add(portfolio(changed, compound_freq="Annually"), "b.json")
+
+        diff = store.diff(old.digest, new.digest)
+
+        assert diff.settings == {"compound_frequency": ("Monthly", "Annually")}
+        assert diff.added == ["NVDA"]
+        assert diff.removed == ["MSFT"]
+        assert diff.changed == {"AAPL": {"rate": (12.5, 8.0)}}
+        assert store.diff(old.digest, old.digest).is_empty
+
+    def test_skips_damaged_index_lines(self, store):
+        store.add(portfolio(), "a.json")
+        with open(os.path.join(store.directory, store.INDEX_FILE), 'a', encoding='utf-8') as f:
+            f.write('{"digest": "ab')
+
+        assert len(SnapshotStore(store.directory).history()) == 1
+
+    def test_add_file_dates_by_file_name(self, store, tmp_path):
+        path = tmp_path / "investments_20240131_142501.json"
+        path.write_text(json.dumps(portfolio()), encoding='utf-8')
+
+        entry = store.add_file(str(path))
+
+        assert entry.timestamp == "2024-01-31T14:25:01"
+        assert entry.name == path.name
+        assert entry.holdings == 2
+
+class TestFileManagerSnapshots:
+    def test_saves_are_recorded(self, tmp_path, store):
+        manager = InvestmentFileManager(SessionState(str(tmp_path / "session.json")), store)
+
+        manager.save_investments(str(tmp_path / "one.json"), INVESTMENTS, 10, "Monthly", "Monthly")
+        manager.save_investments(str(tmp_path / "two.json"), INVESTMENTS, 10, "Monthly", "Monthly")
+
+        assert sorted(entry.name for entry in store.history()) == ["one.json", "two.json"]
+        assert len(store.history(distinct=True)) == 1
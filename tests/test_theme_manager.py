@@ -0,0 +1,49 @@
+import pytest
+from ui.chart import Chart, get_chart_palette
+from ui.theme_manager import ThemeManager
+
+@pytest.fixture
+def manager(qapp, tmp_path):
+    reads = []
+    for theme, color in (("white", "#FFFFFF"), ("dark", "#121212")):
+        (tmp_path / f"{theme}.qss").write_text(f"QWidget {{ background-color: {color}; }}", encoding="utf-8")
+
+    def stylesheet_path(theme):
+        reads.append(theme)
+        return str(tmp_path / f"{theme}.qss")
+    manager = ThemeManager(stylesheet_path)
+    manager.reads = reads
+    yield manager
+    qapp.setStyleSheet("")
+
+class TestThemeManager:
+    def test_stylesheets_are_read_once(self, manager, qapp):
+        for theme in ("dark", "white", "dark", "white"):
+            manager.apply(theme)
+
+        assert manager.reads == ["dark", "white"]
+        assert qapp.styleSheet() == "QWidget { background-color: #FFFFFF; }"
+
+    def test_charts_are_recolored_in_place(self, manager):
+        chart = Chart([0, 1], [1.0, 2.0], [1.0, 1.0])
+        manager.register_chart(chart)
+        changes = []
+        manager.theme_changed.connect(changes.append)
+
+        manager.apply("dark")
+
+        assert chart.chart_palette is get_chart_palette("dark")
+        assert chart.chart.backgroundBrush().color().name() == "#2d2d2d"
+        assert changes == ["dark"]
+
+    def test_applying_the_current_theme_does_nothing(self, manager):
+        changes = []
+        manager.theme_changed.connect(changes.append)
+
+        manager.apply("white")
+
+        assert manager.reads == []
+        assert changes == []
+
+    def test_unknown_chart_themes_are_light(self, qapp):
+        assert get_chart_palette("white") is get_chart_palette("light")
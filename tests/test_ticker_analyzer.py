@@ -88,6 +88,65 @@ class TestGetRate:
             assert isinstance(result, float)
             assert mock_internet.call_count == 2
 
+class TestCalculateCagr:
+    def test_doubling_over_one_year(self):
+        data = pd.DataFrame({
+            'Close': [100.0, 200.0]
+        }, index=[datetime(2020,1,1), datetime(2020,12,31)])
+        assert TickerAnalyzer.calculate_cagr(data) == pytest.approx(100.0)
+
+    def test_multi_column_close(self):
+        """yfinance returns a DataFrame for 'Close' when the columns are multi-level"""
+        columns = pd.MultiIndex.from_tuples([('Close', 'AAPL')])
+        data = pd.DataFrame([[100.0], [121.0]], columns=columns,
+                            index=[datetime(2020,1,1), datetime(2021,12,31)])
+        assert TickerAnalyzer.calculate_cagr(data, "AAPL") == pytest.approx(10.0, rel=1e-2)
+
+    def test_empty_data(self):
+        with pytest.raises(ValueError, match="No data available for ticker AAPL"):
+            TickerAnalyzer.calculate_cagr(pd.DataFrame(), "AAPL")
+
+@pytest.fixture
+def mock_batch_data():
+    index = pd.date_range(start="2020-01-01", end="2022-01-01", freq="D")
+    columns = pd.MultiIndex.from_product([['AAPL', 'ZZZZ'], ['Close']], names=['Ticker', 'Price'])
+    values = [[100 * (1.0003 ** i), float('nan')] for i in range(len(index))]
+    return pd.DataFrame(values, index=index, columns=columns)
+
+class TestGetRates:
+    @patch('core.ticker_analyzer.TickerAnalyzer.is_internet_available', return_value=True)
+    def test_single_batched_request(self, mock_internet, mock_batch_data):
+        with patch('yfinance.download', return_value=mock_batch_data) as mock_download:
+            histories, rates, errors = TickerAnalyzer.get_rates(["aapl", "ZZZZ"])
+        assert mock_download.call_count == 1
+        assert mock_download.call_args[0][0] == ["AAPL", "ZZZZ"]
+        assert set(rates) == {"AAPL"}
+        assert rates["AAPL"] > 0
+        assert set(histories) == {"AAPL"}
+        assert "No data available" in errors["ZZZZ"]
+
+    @patch('core.ticker_analyzer.TickerAnalyzer.is_internet_available', return_value=True)
+    def test_ticker_missing_from_response(self, mock_internet, mock_batch_data):
+        with patch('yfinance.download', return_value=mock_batch_data):
+            _, rates, errors = TickerAnalyzer.get_rates(["AAPL", "MSFT"])
+        assert set(rates) == {"AAPL"}
+        assert set(errors) == {"MSFT"}
+
+    @patch('core.ticker_analyzer.TickerAnalyzer.is_internet_available', return_value=False)
+    @patch('time.sleep')
+    def test_no_internet_connection(self, mock_sleep, mock_internet):
+        with pytest.raises(Exception, match="Failed to download data after 1 attempts"):
+            TickerAnalyzer.get_rates(["AAPL"], max_retries=1)
+        assert mock_sleep.call_count == 1
+
+    def test_empty_ticker_list(self):
+        assert TickerAnalyzer.get_rates([]) == ({}, {}, {})
+
+    def test_find_stale_rates(self):
+        saved = {"AAPL": 10.0, "MSFT": 12.0, "ZZZZ": 5.0}
+        current = {"AAPL": 10.005, "MSFT": 13.5}
+        assert TickerAnalyzer.find_stale_rates(saved, current) == ["MSFT"]
+
 @pytest.mark.integration
 class TestIntegration:
     def test_real_ticker(self):
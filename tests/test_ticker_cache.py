@@ -0,0 +1,74 @@
+import time
+import pytest
+import pandas as pd
+from core.ticker_cache import TickerCache
+from core.session import SessionState
+
+@pytest.fixture
+def cache():
+    return TickerCache()
+
+@pytest.fixture
+def history():
+    index = pd.date_range(start="2020-01-01", periods=3, freq="D")
+    return pd.DataFrame({'Close': [100.0, 101.0, 102.0]}, index=index)
+
+class TestTickerCache:
+    def test_store_and_get(self, cache, history):
+        cache.store("aapl", history, 12.5)
+        assert cache.get_rate("AAPL") == 12.5
+        assert cache.get_history(" aapl ") is history
+        assert cache.contains("AAPL")
+
+    def test_missing_ticker(self, cache):
+        assert cache.get("MSFT") is None
+        assert cache.get_rate("MSFT") is None
+        assert cache.get_history("MSFT") is None
+        assert not cache.contains("MSFT")
+
+    def test_store_replaces_entry(self, cache, history):
+        cache.store("AAPL", history, 10.0)
+        cache.store("AAPL", history, 11.0)
+        assert cache.get_rate("AAPL") == 11.0
+        assert cache.tickers() == ["AAPL"]
+
+    def test_clear(self, cache, history):
+        cache.store("AAPL", history, 10.0)
+        cache.clear()
+        assert cache.tickers() == []
+
+    def test_expired_entries_are_missing(self, cache, history):
+        cache.store("AAPL", history, 10.0, fetched_at=time.time() - cache.ttl - 1)
+        cache.store("MSFT", history, 11.0)
+        assert cache.get_rate("AAPL") is None
+        assert not cache.contains("AAPL")
+        assert cache.tickers() == ["MSFT"]
+        assert cache.get("MSFT").fetched_at >= time.time() - 1
+
+    def test_time_to_live(self, history):
+        cache = TickerCache(ttl=60)
+        cache.store("AAPL", history, 10.0, fetched_at=time.time() - 30)
+        assert cache.contains("AAPL")
+        assert cache.is_fresh(time.time() - 59)
+        assert not cache.is_fresh(time.time() - 61)
+
+class TestSessionState:
+    def test_missing_file_returns_empty_state(self, tmp_path):
+        session = SessionState(str(tmp_path / "session.json"))
+        assert session.load() == {}
+        assert session.get_last_portfolio() is None
+
+    def test_last_portfolio_roundtrip(self, tmp_path):
+        portfolio = tmp_path / "portfolio.json"
+        portfolio.write_text("{}")
+        session = SessionState(str(tmp_path / "nested" / "session.json"))
+        session.set_last_portfolio(str(portfolio))
+        assert session.get_last_portfolio() == str(portfolio)
+
+    def test_deleted_portfolio_is_ignored(self, tmp_path):
+        portfolio = tmp_path / "portfolio.json"
+        portfolio.write_text("{}")
+        session = SessionState(str(tmp_path / "session.json"))
+        session.set_last_portfolio(str(portfolio))
+        portfolio.unlink()
+        assert session.get_last_portfolio() is None
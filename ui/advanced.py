@@ -1,26 +1,59 @@
-from PySide6.QtWidgets import QWidget, QLineEdit, QVBoxLayout, QLabel, QPushButton, QComboBox, QScrollArea, QHBoxLayout, QMessageBox
+import os
+from PySide6.QtWidgets import QWidget, QLineEdit, QVBoxLayout, QLabel, QPushButton, QComboBox, QHBoxLayout, QMessageBox, QCheckBox, QProgressBar, QDialog, QTableView, QHeaderView, QAbstractItemView, QDoubleSpinBox
 from PySide6.QtCore import Signal, QTimer
-from ui.investment import Investment
+from ui.holdings_model import Holding, HoldingsModel, TextDelegate, RemoveButtonDelegate
+from ui.broker_import_dialog import BrokerImportDialog
+from ui.snapshot_history_dialog import SnapshotHistoryDialog
 from core.investment_calculator import InvestmentCalculator
 from core.investment_file_manager import InvestmentFileManager
+from ui.file_dialogs import FileDialogs
+from core.ticker_analyzer import TickerAnalyzer
+from core.ticker_thread import BulkTickerWorker, TickerThreadManager
+from core.file_thread import PortfolioLoadWorker, PortfolioSaveWorker
+from core.broker_import import read_broker_csv, read_broker_headers
+from core.edit_journal import EditJournal, PortfolioState
+from core.snapshot_store import SnapshotStore
 
 
 class Advanced(QWidget):
     investment_saved = Signal(dict)
+    # Emitted on every input edit while live updates are on
+    inputs_changed = Signal()
     
-    def __init__(self):
+    # Wait after the last ticker edit before analyzing, so typing does not start requests
+    ANALYSIS_DELAY = 1000  # milliseconds
+    ROW_HEIGHT = 36  # pixels, fixed so the table never measures its rows
+    
+    def __init__(self, journal=None, snapshot_store=None):
         """Initialize the Advanced settings widget"""
         super().__init__()
+        self.journal = journal or EditJournal()
+        self.next_holding_id = 1
+        self.is_restoring = False
         self.calculator = InvestmentCalculator()
-        self.file_manager = InvestmentFileManager()
+        self.file_manager = InvestmentFileManager(snapshot_store=snapshot_store or SnapshotStore())
+        self.file_dialogs = FileDialogs(self.file_manager)
+        self.bulk_worker = None
+        self.load_worker = None
+        self.save_worker = None
+        self.saved_rates = {}
+        # A file being loaded replaces the holdings only once it was parsed completely
+        self.loaded_metadata = None
+        self.loaded_holdings = []
+        self.loaded_rates = {}
+        self.remember_loaded_file = True
+        self.waiting_action = None  # save or export started while analyses were running
+        
+        # One request per ticker is shared by every holding of that ticker
+        self.thread_manager = TickerThreadManager()
+        self.pending_analysis = {}  # holdings whose edited ticker is analyzed after the delay
+        self.analysis_timer = QTimer()
+        self.analysis_timer.setSingleShot(True)
+        self.analysis_timer.timeout.connect(self._start_pending_analyses)
+        
         self.setup()
         self.controller()
         
-        # Timer to periodically check if all analyses are complete
-        self.validation_timer = QTimer()
-        self.validation_timer.setSingleShot(True)
-        self.validation_timer.timeout.connect(self._check_analysis_status)
-        
     def setup(self):
         """Set up the UI components for the Advanced settings"""
         self.main_layout = QVBoxLayout(self)
@@ -29,7 +62,7 @@ class Advanced(QWidget):
         self._setup_title()
         self._setup_message_label()
         self._setup_years_input()
-        self._setup_investments_scroll()
+        self._setup_holdings_table()
         self._setup_frequency_inputs()
         self._setup_buttons()
 
@@ -53,16 +86,37 @@ class Advanced(QWidget):
         self.years.setPlaceholderText("Enter number of years")
         self.main_layout.addWidget(self.years)
 
-    def _setup_investments_scroll(self):
-        """Set up the scrollable investments area"""
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_content)
-        self.scroll_layout.setContentsMargins(2, 2, 2, 2)
-        self.scroll_layout.setSpacing(5)
-        self.scroll_area.setWidget(self.scroll_content)
-        self.main_layout.addWidget(self.scroll_area)
+    def _setup_holdings_table(self):
+        """Set up the holdings table, only its visible rows are painted and editors exist while editing"""
+        self.holdings_model = HoldingsModel(self)
+        self.holdings_table = QTableView()
+        self.holdings_table.setObjectName("holdingsTable")
+        self.holdings_table.setModel(self.holdings_model)
+        self.holdings_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.holdings_table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked |
+                                            QAbstractItemView.EditTrigger.SelectedClicked |
+                                            QAbstractItemView.EditTrigger.EditKeyPressed |
+                                            QAbstractItemView.EditTrigger.AnyKeyPressed)
+        self.holdings_table.setWordWrap(False)
+        self.holdings_table.setMouseTracking(True)
+        
+        self.ticker_delegate = TextDelegate("Enter ticker symbol (e.g., AAPL)", parent=self.holdings_table)
+        self.amount_delegate = TextDelegate("0.00", numeric=True, parent=self.holdings_table)
+        self.remove_delegate = RemoveButtonDelegate(self.holdings_table)
+        self.holdings_table.setItemDelegateForColumn(HoldingsModel.TICKER, self.ticker_delegate)
+        self.holdings_table.setItemDelegateForColumn(HoldingsModel.INITIAL_DEPOSIT, self.amount_delegate)
+        self.holdings_table.setItemDelegateForColumn(HoldingsModel.CONTRIBUTION, self.amount_delegate)
+        self.holdings_table.setItemDelegateForColumn(HoldingsModel.REMOVE, self.remove_delegate)
+        
+        # Fixed sizes, measuring contents would visit every row
+        vertical_header = self.holdings_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.ROW_HEIGHT)
+        horizontal_header = self.holdings_table.horizontalHeader()
+        horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        horizontal_header.setSectionResizeMode(HoldingsModel.STATUS, QHeaderView.ResizeMode.Stretch)
+        horizontal_header.resizeSection(HoldingsModel.REMOVE, 100)
+        self.main_layout.addWidget(self.holdings_table)
 
     def _setup_frequency_inputs(self):
         """Set up frequency selection combo boxes"""
@@ -103,8 +157,45 @@ class Advanced(QWidget):
         self.export_csv_button = QPushButton("Export CSV")
         button_row2.addWidget(self.export_csv_button)
         
+        self.export_data_button = QPushButton("Export Data")
+        self.export_data_button.setToolTip("Export the year-by-year projection to Parquet for analytics tools")
+        button_row2.addWidget(self.export_data_button)
+        
+        self.import_broker_button = QPushButton("Import Broker CSV")
+        button_row2.addWidget(self.import_broker_button)
+        
+        self.history_button = QPushButton("History")
+        button_row2.addWidget(self.history_button)
+        
         self.main_layout.addLayout(button_row2)
         
+        self.validate_on_load = QCheckBox("Validate tickers and refresh rates when loading a file")
+        self.validate_on_load.setChecked(True)
+        self.main_layout.addWidget(self.validate_on_load)
+        
+        self.export_breakdown = QCheckBox("Include a year-by-year breakdown in CSV exports")
+        self.main_layout.addWidget(self.export_breakdown)
+        
+        # Range of outcomes simulated with random yearly returns, as on the homepage
+        export_bands_layout = QHBoxLayout()
+        self.export_bands = QCheckBox("Include percentile bands in data exports")
+        export_bands_layout.addWidget(self.export_bands)
+        export_bands_layout.addWidget(QLabel("Volatility (%)"))
+        self.export_volatility = QDoubleSpinBox()
+        self.export_volatility.setRange(0.0, 100.0)
+        self.export_volatility.setValue(15.0)
+        export_bands_layout.addWidget(self.export_volatility)
+        export_bands_layout.addStretch()
+        self.main_layout.addLayout(export_bands_layout)
+        
+        self.live_update = QCheckBox("Update results while editing")
+        self.main_layout.addWidget(self.live_update)
+        
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setVisible(False)
+        self.main_layout.addWidget(self.load_progress)
+        
         # Main calculation button
         self.save_button = QPushButton("Calculate Investments")
         self.main_layout.addWidget(self.save_button)
@@ -117,6 +208,23 @@ class Advanced(QWidget):
         self.save_to_file_button.clicked.connect(self.save_to_file)
         self.load_from_file_button.clicked.connect(self.load_from_file)
         self.export_csv_button.clicked.connect(self.export_to_csv)
+        self.export_data_button.clicked.connect(self.export_columnar)
+        self.import_broker_button.clicked.connect(self.import_broker_csv)
+        self.history_button.clicked.connect(self.show_history)
+        self.years.textChanged.connect(self._on_settings_changed)
+        self.frequency.currentTextChanged.connect(self._on_settings_changed)
+        self.contribution_frequency.currentTextChanged.connect(self._on_settings_changed)
+        self.holdings_model.ticker_edited.connect(self._on_ticker_edited)
+        self.holdings_model.holding_changed.connect(self._on_holding_changed)
+        self.holdings_model.analysis_tracker.all_finished.connect(self._on_analyses_finished)
+        self.remove_delegate.remove_clicked.connect(self.remove_holding)
+        
+        # Any change of the inputs or rates can request a live update
+        for signal in (self.years.textChanged, self.frequency.currentTextChanged,
+                       self.contribution_frequency.currentTextChanged, self.live_update.toggled,
+                       self.holdings_model.dataChanged, self.holdings_model.rowsInserted,
+                       self.holdings_model.rowsRemoved, self.holdings_model.modelReset):
+            signal.connect(self._on_input_changed)
 
     def show_message(self, text, is_error=False):
         """Show a message with appropriate styling"""
@@ -127,16 +235,23 @@ class Advanced(QWidget):
             self.message.setStyleSheet("color: green;")
 
     def add(self):
-        """Add a new investment widget to the scroll area"""
-        investment = Investment(remove_callback=self.remove_investment)
-        self.scroll_layout.addWidget(investment)
+        """Add an empty holding and start editing its ticker"""
+        holding = self._new_holding()
+        self.journal.record("add", id=holding.holding_id, fields=holding.get_raw_data())
+        self.holdings_model.add_holdings([holding])
+        
+        index = self.holdings_model.index(self.holdings_model.rowCount() - 1, HoldingsModel.TICKER)
+        self.holdings_table.scrollTo(index)
+        self.holdings_table.setCurrentIndex(index)
+        self.holdings_table.edit(index)
         self.show_message("Investment added successfully!")
 
-    def remove_investment(self, widget):
-        """Remove an investment widget from the scroll area"""
-        self.scroll_layout.removeWidget(widget)
-        widget.setParent(None)
-        widget.deleteLater()
+    def remove_holding(self, row):
+        """Remove the holding of a table row"""
+        holding = self.holdings_model.remove_holding(row)
+        self.pending_analysis.pop(holding, None)
+        if holding.holding_id is not None:
+            self.journal.record("remove", id=holding.holding_id)
         self.show_message("Investment removed successfully!")
 
     def clear_all_investments(self):
@@ -150,164 +265,462 @@ class Advanced(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            # Get all investment widgets
-            widgets = self._collect_investment_widgets()
-            
-            # Clean up and remove each widget
-            for widget in widgets:
-                if hasattr(widget, 'thread_manager'):
-                    widget.thread_manager.cancel_all()
-                self.scroll_layout.removeWidget(widget)
-                widget.setParent(None)
-                widget.deleteLater()
-                
+            self._cancel_file_load()
+            self._remove_all_holdings()
             self.show_message("All investments cleared!")
 
+    def _remove_all_holdings(self):
+        """Cancel the running analyses and remove every holding"""
+        if self.journal.state.holdings:
+            self.journal.record("clear")
+        self.waiting_action = None
+        self.analysis_timer.stop()
+        self.pending_analysis = {}
+        self.thread_manager.cancel_all()
+        self.holdings_model.clear()
+
     def save_to_file(self):
+        """Save current investments to a file, once the running analyses are finished"""
+        self._when_analyses_finished(self._perform_file_save)
+
+    def _perform_file_save(self):
         """Save current investments to a file"""
         result = self.get_investments_data()
-        
         if result is None:
             return
-        elif result == "ANALYZING":
-            self.show_message("Please wait for all ticker analyses to complete before saving.", is_error=True)
-            return
             
         investments_data, years = result
         
-        # Save to file using file manager
-        success = self.file_manager.save_investments_to_file(
-            self,
+        if self.save_worker is not None:
+            self.show_message("A save is already in progress. Please wait...", is_error=True)
+            return
+        
+        file_path = self.file_dialogs.choose_save_path(self)
+        if file_path is None:
+            return
+        
+        save_data = self.file_manager.build_save_data(
             investments_data,
             years,
             self.frequency.currentText(),
             self.contribution_frequency.currentText()
         )
         
-        if success:
-            self.show_message("Investments saved to file successfully!")
+        # Write the file in the background
+        self.save_worker = PortfolioSaveWorker(self.file_manager, file_path, save_data)
+        self.save_worker.save_finished.connect(self._on_save_finished)
+        self.save_worker.save_failed.connect(self._on_save_failed)
+        self.save_worker.finished.connect(self._on_save_worker_finished)
+        self.save_worker.start()
+        self.show_message("Saving investments...")
+
+    def _on_save_finished(self, file_path):
+        """Remember the saved file and report success"""
+        self.file_manager.remember_file(file_path)
+        self.show_message(f"Investments saved to {os.path.basename(file_path)} successfully!")
+
+    def _on_save_failed(self, error_message):
+        """Report a failed save, the previous file is left untouched"""
+        self.show_message(error_message, is_error=True)
+
+    def _on_save_worker_finished(self):
+        """Release the finished save worker"""
+        if self.save_worker is not None and not self.save_worker.isRunning():
+            self.save_worker = None
+
+    def _confirm_replace(self):
+        """Ask the user if the current investments can be replaced"""
+        if self.holdings_model.rowCount() == 0:
+            return True
+        reply = QMessageBox.question(
+            self,
+            "Load Investments",
+            "Loading will replace current investments. Continue?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        return reply == QMessageBox.StandardButton.Yes
 
     def load_from_file(self):
         """Load investments from a file"""
         # Ask user if they want to clear existing investments
-        if self.scroll_layout.count() > 0:
-            reply = QMessageBox.question(
-                self,
-                "Load Investments",
-                "Loading will replace current investments. Continue?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.No
-            )
+        if not self._confirm_replace():
+            return
+        
+        file_path = self.file_dialogs.choose_file_to_load(self)
+        if file_path is None:
+            return
+        self._start_file_load(file_path)
+
+    def show_history(self):
+        """Browse the saved snapshots and reopen one of them"""
+        store = self.file_manager.snapshot_store
+        dialog = SnapshotHistoryDialog(store, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted or dialog.selected_digest() is None:
+            return
+        if not self._confirm_replace():
+            return
+        # Snapshots are plain portfolio files, but not remembered as the last opened file
+        self._start_file_load(store.object_path(dialog.selected_digest()), remember=False)
+
+    def _start_file_load(self, file_path, remember=True):
+        """Replace the investments with the ones of a file, parsed in the background"""
+        # The current investments stay until the whole file was parsed and validated
+        self._cancel_file_load()
+        self._cancel_bulk_validation()
+        self.remember_loaded_file = remember
+        
+        self.load_worker = PortfolioLoadWorker(file_path)
+        self.load_worker.metadata_ready.connect(self._on_metadata_loaded)
+        self.load_worker.batch_ready.connect(self._on_batch_loaded)
+        self.load_worker.progress_changed.connect(self.load_progress.setValue)
+        self.load_worker.loading_finished.connect(self._on_loading_finished)
+        self.load_worker.loading_failed.connect(self._on_loading_failed)
+        
+        self._set_loading(True)
+        self.show_message("Loading investments...")
+        self.load_worker.start()
+
+    def _set_loading(self, is_loading):
+        """Show the progress bar and lock file operations while a file is loading"""
+        self.load_progress.setValue(0)
+        self.load_progress.setVisible(is_loading)
+        for button in (self.load_from_file_button, self.save_to_file_button,
+                       self.export_csv_button, self.export_data_button, self.import_broker_button,
+                       self.history_button, self.save_button):
+            button.setEnabled(not is_loading)
+
+    def _is_current_load(self):
+        """Check that a load signal comes from the running worker, not a cancelled one"""
+        worker = self.sender()
+        return worker is not None and worker is self.load_worker
+
+    def _on_metadata_loaded(self, metadata):
+        """Keep the loaded years and frequencies until the file was loaded completely"""
+        if self._is_current_load():
+            self.loaded_metadata = metadata
+
+    def _apply_metadata(self, metadata):
+        """Apply the loaded years and frequencies"""
+        self.years.setText(str(metadata['years']))
+        
+        # Find and set the frequency indices
+        compound_index = self.frequency.findText(metadata['compound_frequency'])
+        if compound_index >= 0:
+            self.frequency.setCurrentIndex(compound_index)
             
-            if reply != QMessageBox.StandardButton.Yes:
-                return
+        contrib_index = self.contribution_frequency.findText(metadata['contribution_frequency'])
+        if contrib_index >= 0:
+            self.contribution_frequency.setCurrentIndex(contrib_index)
+
+    def _on_batch_loaded(self, records):
+        """Build the holdings of a batch of parsed records, shown once the file was loaded completely"""
+        if not self._is_current_load():
+            return
+        for inv_data in records:
+            holding = self._new_holding(inv_data['ticker'], str(inv_data['initial_deposit']),
+                                        str(inv_data['contribution_amount']))
+            # Use the saved rate if available (this will skip analysis)
+            if 'rate' in inv_data:
+                holding.set_rate(inv_data['rate'])
+                self.loaded_rates[holding.symbol] = inv_data['rate']
+            self.loaded_holdings.append(holding)
+
+    def _on_loading_finished(self, file_path, count):
+        """Remember the file once it was parsed completely"""
+        if not self._is_current_load():
+            return
+        if self.remember_loaded_file:
+            self.file_manager.remember_file(file_path)
+        self.load_worker = None
+        self._finish_loading()
+
+    def _finish_loading(self):
+        """Replace the investments with the loaded ones in a single model update"""
+        metadata, holdings, rates = self.loaded_metadata, self.loaded_holdings, self.loaded_rates
+        self._discard_loaded_data()
+        self._set_loading(False)
+        
+        self._remove_all_holdings()
+        if metadata is not None:
+            self._apply_metadata(metadata)
+        self.saved_rates = rates
+        waiting = self._await_missing_rates(holdings)
+        self.holdings_model.add_holdings(holdings)
+        self._snapshot_journal()
+        self.show_message(f"Successfully loaded {len(holdings)} investments!")
+        
+        saved_rates = self.saved_rates if self.validate_on_load.isChecked() else {}
+        if saved_rates or waiting:
+            self._start_bulk_validation(saved_rates, waiting)
+
+    def _on_loading_failed(self, error_message):
+        """Report a failed load, the current investments and journal are left untouched"""
+        if not self._is_current_load():
+            return
+        self.load_worker = None
+        self._discard_loaded_data()
+        self._set_loading(False)
+        self.show_message(error_message, is_error=True)
+
+    def _discard_loaded_data(self):
+        """Forget the data parsed by the last file load"""
+        self.loaded_metadata = None
+        self.loaded_holdings = []
+        self.loaded_rates = {}
+
+    def _cancel_file_load(self):
+        """Cancel a running file load"""
+        if self.load_worker is not None:
+            self.load_worker.cancel()
+            self.load_worker.wait(1000)  # Wait max 1 second
+            if self.load_worker.isRunning():
+                self.load_worker.terminate()
+            self.load_worker = None
+        self._discard_loaded_data()
+        self._set_loading(False)
+
+    def _await_missing_rates(self, holdings):
+        """Mark the holdings without a rate as waiting for the batched request and return their tickers"""
+        waiting = []
+        for holding in holdings:
+            if holding.symbol and holding.rate is None:
+                holding.set_pending(Holding.AWAITING, f"Fetching {holding.symbol} rate...")
+                waiting.append(holding.symbol)
+        return waiting
+
+    def _start_bulk_validation(self, saved_rates, new_tickers=()):
+        """
+        Validate all loaded tickers with one batched request
+        
+        Args:
+            saved_rates: ticker -> rate read from a file, refreshed if stale
+            new_tickers: Tickers without a rate whose cards wait for this request
+        """
+        self._cancel_bulk_validation()
+        self.saved_rates = saved_rates
+        tickers = list(saved_rates.keys()) + [ticker for ticker in new_tickers if ticker not in saved_rates]
+        
+        self.bulk_worker = BulkTickerWorker(tickers)
+        self.bulk_worker.validation_ready.connect(self._on_bulk_validation_ready)
+        self.bulk_worker.validation_failed.connect(self._on_bulk_validation_failed)
+        self.bulk_worker.finished.connect(self._on_bulk_validation_finished)
+        self.bulk_worker.start()
+        
+        self.show_message(f"Validating {len(tickers)} ticker(s)...")
+
+    def _cancel_bulk_validation(self):
+        """Cancel a running bulk validation"""
+        if self.bulk_worker is not None:
+            self.bulk_worker.cancel()
+            self.bulk_worker.wait(1000)  # Wait max 1 second
+            if self.bulk_worker.isRunning():
+                self.bulk_worker.terminate()
+            self.bulk_worker = None
+
+    def _on_bulk_validation_ready(self, rates, errors):
+        """Apply the bulk validation results to all holdings in a single model update"""
+        stale_tickers = TickerAnalyzer.find_stale_rates(self.saved_rates, rates)
+        
+        for holding in self.holdings_model.holdings:
+            ticker = holding.symbol
+            if holding.status == Holding.AWAITING:
+                if ticker in rates:
+                    holding.set_rate(rates[ticker])
+                elif ticker in errors:
+                    holding.set_error(f"Error for {ticker}: {errors[ticker]}")
+                continue
+            if holding.is_analyzing:
+                continue
+            if ticker in rates:
+                holding.set_rate(rates[ticker], " (refreshed)" if ticker in stale_tickers else "")
+            elif ticker in errors:
+                holding.set_warning(f"Warning for {ticker}: {errors[ticker]}. Using the saved rate.")
+        self.holdings_model.refresh_all()
+        self._snapshot_journal()
+        
+        if not stale_tickers and not errors:
+            if self.saved_rates:
+                self.show_message(f"All {len(rates)} ticker(s) validated, saved rates are up to date.")
+            else:
+                self.show_message(f"Fetched the rates of {len(rates)} ticker(s).")
+            return
+        
+        report = [f"Validated {len(rates)} ticker(s)."]
+        if stale_tickers:
+            report.append(f"Refreshed stale rates: {', '.join(stale_tickers)}.")
+        if errors:
+            report.append(f"Unknown tickers: {', '.join(errors.keys())}.")
+        self.show_message(" ".join(report), is_error=bool(errors))
+
+    def _on_bulk_validation_failed(self, error_message):
+        """Report a failed bulk validation, the saved rates stay in place"""
+        self.show_message(f"Ticker validation failed: {error_message}. Using the saved rates.", is_error=True)
         
-        # Load data from file
-        loaded_data = self.file_manager.load_investments_from_file(self)
+        # Holdings without a saved rate analyze their ticker on their own instead
+        self._start_analyses([holding for holding in self.holdings_model.holdings
+                              if holding.status == Holding.AWAITING])
+
+    def _on_bulk_validation_finished(self):
+        """Release the finished bulk validation worker"""
+        if self.bulk_worker is not None and not self.bulk_worker.isRunning():
+            self.bulk_worker = None
+
+    def import_broker_csv(self):
+        """Import holdings from a broker CSV export"""
+        file_path = self.file_dialogs.choose_broker_csv(self)
+        if file_path is None:
+            return
         
-        if loaded_data is None:
+        try:
+            headers = read_broker_headers(file_path)
+        except Exception as e:
+            self.show_message(f"Failed to read broker CSV: {str(e)}", is_error=True)
             return
-            
+        
+        dialog = BrokerImportDialog(headers, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
         try:
-            # Clear existing investments
-            self.clear_all_investments()
-            
-            # Load metadata
-            metadata = loaded_data['metadata']
-            self.years.setText(str(metadata['years']))
-            
-            # Set frequencies
-            compound_freq = metadata['compound_frequency']
-            contrib_freq = metadata['contribution_frequency']
-            
-            # Find and set the frequency indices
-            compound_index = self.frequency.findText(compound_freq)
-            if compound_index >= 0:
-                self.frequency.setCurrentIndex(compound_index)
-                
-            contrib_index = self.contribution_frequency.findText(contrib_freq)
-            if contrib_index >= 0:
-                self.contribution_frequency.setCurrentIndex(contrib_index)
-            
-            # Load investments
-            for inv_data in loaded_data['investments']:
-                investment = Investment(remove_callback=self.remove_investment)
-                
-                # Populate the investment widget
-                investment.ticker.setText(inv_data['ticker'])
-                investment.initial_deposit.setText(str(inv_data['initial_deposit']))
-                investment.contribution.setText(str(inv_data['contribution_amount']))
-                
-                # Set the rate if available (this will skip analysis)
-                if 'rate' in inv_data:
-                    investment.current_rate = inv_data['rate']
-                    investment.status_label.setText(f"✓ {inv_data['ticker']}: {inv_data['rate']:.2f}% annual return")
-                    investment.status_label.setStyleSheet("color: green; font-style: italic;")
-                
-                self.scroll_layout.addWidget(investment)
-                
-            self.show_message(f"Successfully loaded {len(loaded_data['investments'])} investments!")
-            
+            result = read_broker_csv(file_path, dialog.get_mapping())
         except Exception as e:
-            self.show_message(f"Error loading investments: {str(e)}", is_error=True)
+            self.show_message(f"Failed to import broker CSV: {str(e)}", is_error=True)
+            return
+        
+        if not result.investments:
+            self.show_message("No holdings found in the broker CSV.", is_error=True)
+            return
+        
+        self._add_imported_investments(result.investments)
+        
+        report = [f"Imported {len(result.investments)} holding(s)."]
+        if result.merged_rows:
+            report.append(f"Merged {result.merged_rows} duplicate row(s).")
+        if result.skipped_rows:
+            lines = ", ".join(str(line) for line, _ in result.skipped_rows[:10])
+            more = "..." if len(result.skipped_rows) > 10 else ""
+            report.append(f"Skipped {len(result.skipped_rows)} invalid row(s) at line(s) {lines}{more}.")
+        self.show_message(" ".join(report), is_error=bool(result.skipped_rows))
+
+    def _add_imported_investments(self, investments):
+        """Add imported holdings in one model update and fetch their rates with one batched request"""
+        imported_rates = {}
+        holdings = []
+        for inv_data in investments:
+            holding = self._new_holding(inv_data['ticker'], str(inv_data['initial_deposit']),
+                                        str(inv_data['contribution_amount']))
+            if 'rate' in inv_data:
+                holding.set_rate(inv_data['rate'])
+                imported_rates[inv_data['ticker']] = inv_data['rate']
+            else:
+                # Wait for the batched request instead of analyzing the ticker alone
+                holding.set_pending(Holding.AWAITING, f"Fetching {holding.symbol} rate...")
+            holdings.append(holding)
+        self.holdings_model.add_holdings(holdings)
+        self._snapshot_journal()
+        
+        # Restart any running validation with the imported tickers included
+        saved_rates = dict(self.saved_rates) if self.bulk_worker is not None else {}
+        saved_rates.update(imported_rates)
+        waiting = [holding.symbol for holding in self.holdings_model.holdings if holding.status == Holding.AWAITING]
+        self._start_bulk_validation(saved_rates, waiting)
 
     def export_to_csv(self):
+        """Export current investments to CSV, once the running analyses are finished"""
+        self._when_analyses_finished(self._perform_csv_export)
+
+    def _perform_csv_export(self):
         """Export current investments to CSV"""
         result = self.get_investments_data()
-        
         if result is None:
             return
-        elif result == "ANALYZING":
-            self.show_message("Please wait for all ticker analyses to complete before exporting.", is_error=True)
-            return
             
         investments_data, years = result
         
         # Export using file manager
-        success = self.file_manager.export_to_csv(
+        success = self.file_dialogs.export_to_csv(
             self,
             investments_data,
             years,
             self.frequency.currentText(),
-            self.contribution_frequency.currentText()
+            self.contribution_frequency.currentText(),
+            self.export_breakdown.isChecked()
         )
         
         if success:
             self.show_message("Data exported to CSV successfully!")
 
-    def _get_analyzing_tickers(self):
-        """Get list of tickers that are currently being analyzed"""
-        analyzing_tickers = []
+    def export_columnar(self):
+        """Export the projection of current investments to Parquet, once the running analyses are finished"""
+        self._when_analyses_finished(self._perform_columnar_export)
+
+    def _perform_columnar_export(self):
+        """Export the year-by-year projection of current investments to Parquet"""
+        result = self.get_investments_data()
+        if result is None:
+            return
+            
+        investments_data, years = result
+        success = self.file_dialogs.export_columnar(
+            self,
+            investments_data,
+            years,
+            self.frequency.currentText(),
+            self.contribution_frequency.currentText(),
+            self.export_volatility.value() if self.export_bands.isChecked() else None
+        )
         
-        for i in range(self.scroll_layout.count()):
-            widget = self.scroll_layout.itemAt(i).widget()
-            if isinstance(widget, Investment) and widget.is_analyzing:
-                ticker = widget.ticker.text().strip().upper()
-                if ticker:
-                    analyzing_tickers.append(ticker)
+        if success:
+            self.show_message("Projection data exported successfully!")
+
+    def _when_analyses_finished(self, action):
+        """Run an action now, or as soon as the last running analysis completes"""
+        if self._validate_basic_inputs() is None:
+            return
         
-        return analyzing_tickers
+        tracker = self.holdings_model.analysis_tracker
+        if tracker.pending:
+            # Only the latest request runs, clicking again does not queue it twice
+            self.waiting_action = action
+            self.show_message(f"Still analyzing: {', '.join(tracker.tickers())}. "
+                              "Continuing when the analysis is complete...", is_error=True)
+            return
+        self.waiting_action = None
+        action()
 
-    def _check_analysis_status(self):
-        """Check if all ticker analyses are complete"""
-        analyzing_tickers = self._get_analyzing_tickers()
+    def _on_input_changed(self):
+        """Request a live update of the results"""
+        if self.live_update.isChecked():
+            self.inputs_changed.emit()
+
+    def live_investment(self):
+        """Get the aggregated investment for a live update, or None while the inputs are incomplete"""
+        if self.holdings_model.rowCount() == 0 or self.holdings_model.analysis_tracker.pending:
+            return None
+        try:
+            years = self.calculator.validate_years(self.years.text())
+        except ValueError:
+            return None
         
-        if analyzing_tickers:
-            self.show_message(f"Still analyzing: {', '.join(analyzing_tickers)}. Please wait...", is_error=True)
-            # Check again in 2 seconds
-            self.validation_timer.start(2000)
-        else:
-            # All analyses complete, try to save again
-            self._perform_save()
-
-    def _collect_investment_widgets(self):
-        """Collect all Investment widgets from the scroll area"""
-        widgets = []
-        for i in range(self.scroll_layout.count()):
-            widget = self.scroll_layout.itemAt(i).widget()
-            if isinstance(widget, Investment):
-                widgets.append(widget)
-        return widgets
+        investments_data = self._collect_investments_data(years, report=False)
+        if investments_data is None:
+            return None
+        try:
+            return self.calculator.process_investments(
+                investments_data,
+                self.frequency.currentText(),
+                self.contribution_frequency.currentText(),
+                years
+            )
+        except ValueError:
+            return None
+
+    def _on_analyses_finished(self):
+        """Run the save or export that was waiting for the analyses"""
+        action, self.waiting_action = self.waiting_action, None
+        if action is not None:
+            action()
 
     def _validate_basic_inputs(self):
         """Validate years input and check for investments"""
@@ -322,53 +735,39 @@ class Advanced(QWidget):
             return None
             
         # Check if there are any investments
-        if self.scroll_layout.count() == 0:
+        if self.holdings_model.rowCount() == 0:
             self.show_message("Please add at least one investment", is_error=True)
             return None
             
         return years
 
-    def _check_analyzing_status(self):
-        """Check if any investments are still being analyzed"""
-        analyzing_tickers = self._get_analyzing_tickers()
-        
-        if analyzing_tickers:
-            self.show_message(f"{len(analyzing_tickers)} ticker analysis(es) still in progress...", is_error=True)
-            # Start timer to check status periodically
-            self.validation_timer.start(2000)
-            return "ANALYZING"
-            
-        return None
-
-    def _collect_investments_data(self, years):
-        """Collect and validate investment data from all widgets"""
+    def _collect_investments_data(self, years, report=True):
+        """Collect and validate investment data from all holdings, pointing at the first invalid one if report is set"""
         compound_freq = self.frequency.currentText()
         contrib_freq = self.contribution_frequency.currentText()
         
         investments_data = []
-        investment_widgets = self._collect_investment_widgets()
-        
-        for widget in investment_widgets:
-            data = widget.get_data(compound_freq, contrib_freq, years)
+        for row, holding in enumerate(self.holdings_model.holdings):
+            data, error = holding.get_data(compound_freq, contrib_freq, years)
             if data is None:
-                # Error message already shown by the Investment widget
+                if not report:
+                    return None
+                # Point at the first invalid row
+                self.holdings_table.selectRow(row)
+                self.holdings_table.scrollTo(self.holdings_model.index(row, 0))
+                self.show_message(f"Row {row + 1}: {error}", is_error=True)
                 return None
             investments_data.append(data)
             
         return investments_data
 
     def get_investments_data(self):
-        """Collect and validate investment data from the widgets"""
+        """Collect and validate investment data from the holdings"""
         # Validate basic inputs
         years = self._validate_basic_inputs()
         if years is None:
             return None
             
-        # Check if analyses are still running
-        analyzing_status = self._check_analyzing_status()
-        if analyzing_status == "ANALYZING":
-            return "ANALYZING"
-            
         # Collect investment data
         investments_data = self._collect_investments_data(years)
         if investments_data is None:
@@ -377,23 +776,14 @@ class Advanced(QWidget):
         return investments_data, years
 
     def save_investments(self):
-        """Save the investments data and emit the signal"""
-        result = self.get_investments_data()
-        
-        if result is None:
-            return
-        elif result == "ANALYZING":
-            # Analyses are still running, timer will handle retry
-            return
-            
-        self._perform_save(result)
+        """Save the investments data and emit the signal, once the running analyses are finished"""
+        self._when_analyses_finished(self._perform_save)
 
-    def _perform_save(self, result=None):
+    def _perform_save(self):
         """Perform the actual save operation using InvestmentCalculator"""
+        result = self.get_investments_data()
         if result is None:
-            result = self.get_investments_data()
-            if result is None or result == "ANALYZING":
-                return
+            return
         
         investments_data, years = result
         
@@ -415,17 +805,152 @@ class Advanced(QWidget):
         except Exception as e:
             self.show_message(f"Unexpected error: {str(e)}", is_error=True)
 
+    def _new_holding(self, ticker="", initial_deposit="", contribution_amount=""):
+        """Create a holding with a new journal identifier"""
+        holding = Holding(str(self.next_holding_id), ticker, initial_deposit, contribution_amount)
+        self.next_holding_id += 1
+        return holding
+
+    def _on_holding_changed(self, holding):
+        """Record the changed fields of a holding in the edit journal"""
+        if self.is_restoring:
+            return
+        journaled = self.journal.state.holdings.get(holding.holding_id)
+        if journaled is None:
+            return
+        changes = {key: value for key, value in holding.get_raw_data().items() if journaled.get(key) != value}
+        if changes:
+            self.journal.record("update", id=holding.holding_id, fields=changes)
+
+    def _on_ticker_edited(self, holding):
+        """Analyze an edited ticker once the user stops typing"""
+        self.pending_analysis.pop(holding, None)
+        if holding.symbol:
+            self.pending_analysis[holding] = None
+            self.analysis_timer.start(self.ANALYSIS_DELAY)
+
+    def _start_pending_analyses(self):
+        """Analyze the tickers edited since the last analysis"""
+        holdings = [holding for holding in self.pending_analysis if holding.status == Holding.IDLE]
+        self.pending_analysis = {}
+        self._start_analyses(holdings)
+
+    def _start_analyses(self, holdings):
+        """Fetch the rates of holdings, with one request per distinct ticker"""
+        tickers = {}
+        for holding in holdings:
+            holding.set_pending(Holding.ANALYZING, f"Analyzing {holding.symbol}...")
+            tickers.setdefault(holding.symbol, holding)
+        self._refresh_holdings(set(holdings))
+        
+        for ticker in tickers:
+            if self.thread_manager.is_analyzing(ticker):
+                continue  # The running request answers the new holdings too
+            self.thread_manager.start_analysis(
+                ticker,
+                result_callback=self._on_analysis_success,
+                error_callback=self._on_analysis_error,
+                progress_callback=self._on_analysis_progress
+            )
+
+    def _analyzing_holdings(self, ticker):
+        """Get the rows and holdings waiting for the analysis of a ticker"""
+        return [(row, holding) for row, holding in enumerate(self.holdings_model.holdings)
+                if holding.status == Holding.ANALYZING and holding.symbol == ticker]
+
+    def _on_analysis_success(self, ticker, rate):
+        """Apply an analyzed rate to every holding of the ticker"""
+        for row, holding in self._analyzing_holdings(ticker):
+            holding.set_rate(rate)
+            self.holdings_model.refresh_row(row)
+            self._on_holding_changed(holding)
+
+    def _on_analysis_error(self, ticker, error_message):
+        """Report a failed analysis on every holding of the ticker"""
+        for row, holding in self._analyzing_holdings(ticker):
+            holding.set_error(f"Error for {ticker}: {error_message}")
+            self.holdings_model.refresh_row(row)
+            self._on_holding_changed(holding)
+
+    def _on_analysis_progress(self, ticker, status_message):
+        """Show the progress of an analysis"""
+        for row, holding in self._analyzing_holdings(ticker):
+            holding.message = status_message
+            self.holdings_model.refresh_row(row)
+
+    def _refresh_holdings(self, holdings):
+        """Repaint the rows of some holdings"""
+        for row, holding in enumerate(self.holdings_model.holdings):
+            if holding in holdings:
+                self.holdings_model.refresh_row(row)
+
+    def _current_settings(self):
+        """Get the years and frequencies as shown"""
+        return {
+            "years": self.years.text(),
+            "compound_frequency": self.frequency.currentText(),
+            "contribution_frequency": self.contribution_frequency.currentText()
+        }
+
+    def _on_settings_changed(self):
+        """Record changed years and frequencies in the edit journal"""
+        if self.is_restoring:
+            return
+        changes = {key: value for key, value in self._current_settings().items()
+                   if self.journal.state.settings.get(key) != value}
+        if changes:
+            self.journal.record("settings", fields=changes)
+
+    def _snapshot_journal(self):
+        """Replace the journal state with every holding at once, after a bulk change"""
+        holdings = {holding.holding_id: holding.get_raw_data() for holding in self.holdings_model.holdings}
+        self.journal.reset(PortfolioState(settings=self._current_settings(), holdings=holdings))
+
+    def restore_from_journal(self):
+        """Rebuild the investments of the last session from the edit journal"""
+        state = self.journal.recover()
+        if not state.holdings and not state.settings:
+            return
+        
+        self.is_restoring = True
+        try:
+            settings = state.settings
+            self.years.setText(settings.get("years", ""))
+            for combo, key in ((self.frequency, "compound_frequency"),
+                               (self.contribution_frequency, "contribution_frequency")):
+                index = combo.findText(settings.get(key, ""))
+                if index >= 0:
+                    combo.setCurrentIndex(index)
+            
+            holdings = []
+            for holding_id, fields in state.holdings.items():
+                holding = Holding(holding_id, fields.get("ticker", ""), fields.get("initial_deposit", ""),
+                                  fields.get("contribution_amount", ""))
+                if fields.get("rate") is not None:
+                    holding.set_rate(fields["rate"])
+                holdings.append(holding)
+            waiting = self._await_missing_rates(holdings)
+            self.holdings_model.add_holdings(holdings)
+        finally:
+            self.is_restoring = False
+        
+        numeric_ids = [int(holding_id) for holding_id in state.holdings if holding_id.isdigit()]
+        self.next_holding_id = max(numeric_ids, default=0) + 1
+        
+        if state.holdings:
+            self.show_message(f"Restored {len(state.holdings)} investments from your last session.")
+        if waiting:
+            self._start_bulk_validation({}, waiting)
+
     def cleanup(self):
         """Clean up all resources when widget is closed"""
-        self.validation_timer.stop()
-        
-        # Clean up all investment widgets
-        investment_widgets = self._collect_investment_widgets()
-        for widget in investment_widgets:
-            if hasattr(widget, 'thread_manager'):
-                widget.thread_manager.cancel_all()
-
-    def __del__(self):
-        """Cleanup when widget is destroyed"""
-        if hasattr(self, 'validation_timer'):
-            self.validation_timer.stop()
\ No newline at end of file
+        self.waiting_action = None
+        self.analysis_timer.stop()
+        self._cancel_file_load()
+        
+        # Let a running save complete, interrupting it would lose the new version
+        if self.save_worker is not None:
+            self.save_worker.wait()
+        self._cancel_bulk_validation()
+        self.journal.close()
+        self.thread_manager.cancel_all()
\ No newline at end of file
@@ -0,0 +1,75 @@
+from PySide6.QtWidgets import QDialog, QFormLayout, QComboBox, QDialogButtonBox, QLabel, QVBoxLayout
+from core.broker_import import BrokerColumnMapping
+
+class BrokerImportDialog(QDialog):
+    """Dialog to choose which broker CSV columns hold the investment fields"""
+
+    NO_COLUMN = "(none)"
+    DECIMAL_SEPARATORS = {"Dot (1,234.56)": ".", "Comma (1.234,56)": ","}
+
+    def __init__(self, headers, parent=None):
+        """Initialize the dialog with the CSV column names"""
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.setWindowTitle("Import Broker CSV")
+        self.setup()
+        self.controller()
+        self._apply_mapping(BrokerColumnMapping.detect(self.headers))
+
+    def setup(self):
+        """Set up the column selectors"""
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.addWidget(QLabel("Choose the columns to import:"))
+
+        form = QFormLayout()
+        self.ticker_column = QComboBox()
+        self.ticker_column.addItems(self.headers)
+        form.addRow("Ticker", self.ticker_column)
+
+        self.value_column = QComboBox()
+        self.value_column.addItems(self.headers)
+        form.addRow("Initial deposit (value)", self.value_column)
+
+        self.contribution_column = QComboBox()
+        self.contribution_column.addItems([self.NO_COLUMN] + self.headers)
+        form.addRow("Contribution amount", self.contribution_column)
+
+        self.rate_column = QComboBox()
+        self.rate_column.addItems([self.NO_COLUMN] + self.headers)
+        form.addRow("Annual rate (%)", self.rate_column)
+
+        self.decimal_separator = QComboBox()
+        self.decimal_separator.addItems(list(self.DECIMAL_SEPARATORS))
+        form.addRow("Decimal separator", self.decimal_separator)
+        self.main_layout.addLayout(form)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.main_layout.addWidget(self.buttons)
+
+    def controller(self):
+        """Connect signals to their respective slots"""
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+
+    def _apply_mapping(self, mapping):
+        """Preselect the columns of a detected mapping"""
+        if mapping is None:
+            return
+        self.ticker_column.setCurrentText(mapping.ticker)
+        self.value_column.setCurrentText(mapping.initial_deposit)
+        if mapping.contribution_amount:
+            self.contribution_column.setCurrentText(mapping.contribution_amount)
+        if mapping.rate:
+            self.rate_column.setCurrentText(mapping.rate)
+
+    def get_mapping(self) -> BrokerColumnMapping:
+        """Get the mapping chosen by the user"""
+        contribution = self.contribution_column.currentText()
+        rate = self.rate_column.currentText()
+        return BrokerColumnMapping(
+            ticker=self.ticker_column.currentText(),
+            initial_deposit=self.value_column.currentText(),
+            contribution_amount=None if contribution == self.NO_COLUMN else contribution,
+            rate=None if rate == self.NO_COLUMN else rate,
+            decimal=self.DECIMAL_SEPARATORS[self.decimal_separator.currentText()]
+        )
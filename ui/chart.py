@@ -1,10 +1,82 @@
-from PySide6.QtCore import Qt
+from dataclasses import dataclass
+import numpy as np
+from PySide6.QtCore import Qt, QPointF, QTimer
 from PySide6.QtGui import QColor, QPen, QBrush, QPainter
-from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+from PySide6.QtCharts import QChart, QChartView, QLineSeries, QAreaSeries, QValueAxis
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from core.downsampling import downsample, lttb, visible_slice
+
+@dataclass(frozen=True)
+class ChartPalette:
+    """Pens and brushes of a chart theme, built once and shared by every chart"""
+    background: QBrush
+    text: QBrush
+    text_color: QColor
+    grid_color: QColor
+    grid_pen: QPen
+    growth_pen: QPen
+    invested_pen: QPen
+    median_pen: QPen
+    outer_band_brush: QBrush
+    inner_band_brush: QBrush
+    label_style: str
+
+    @classmethod
+    def from_colors(cls, background, text, grid, growth, invested):
+        """Build the palette of a theme from its colors"""
+        bg_color, text_color, grid_color = QColor(background), QColor(text), QColor(grid)
+        growth_color, invested_color = QColor(growth), QColor(invested)
+        
+        # Bands are shades of the growth color, darker towards the median
+        outer_band_color, inner_band_color = QColor(growth_color), QColor(growth_color)
+        outer_band_color.setAlpha(50)
+        inner_band_color.setAlpha(90)
+        
+        return cls(
+            background=QBrush(bg_color),
+            text=QBrush(text_color),
+            text_color=text_color,
+            grid_color=grid_color,
+            grid_pen=QPen(grid_color),
+            growth_pen=QPen(growth_color, 3),
+            invested_pen=QPen(invested_color, 2, Qt.DashLine),
+            median_pen=QPen(growth_color, 2, Qt.DotLine),
+            outer_band_brush=QBrush(outer_band_color),
+            inner_band_brush=QBrush(inner_band_color),
+            label_style=f"color: {text_color.name()}; font-size: 12px; font-weight: bold;"
+        )
+
+# Palettes of the chart themes, built on first use since pens need a QGuiApplication
+_CHART_THEME_COLORS = {
+    "dark": ("#2d2d2d", "#E0E0E0", "#444444", "#BB86FC", "#03DAC6"),
+    "light": ("#f8f8f8", "#2C2C2C", "#c0c0c0", "#35b15a", "#FF6D00"),
+}
+_chart_palettes = {}
+
+def get_chart_palette(theme):
+    """Get the cached palette of a chart theme, unknown themes are light"""
+    theme = theme if theme in _CHART_THEME_COLORS else "light"
+    if theme not in _chart_palettes:
+        _chart_palettes[theme] = ChartPalette.from_colors(*_CHART_THEME_COLORS[theme])
+    return _chart_palettes[theme]
+
+def nearest_index(x_values, x):
+    """Find the index of the value closest to x in sorted values with a binary search"""
+    if not len(x_values):
+        return None
+    index = int(np.searchsorted(x_values, x))
+    if index == 0:
+        return 0
+    if index == len(x_values):
+        return index - 1
+    # The closest value is on either side of the insertion point
+    return index - 1 if x - x_values[index - 1] <= x_values[index] - x else index
 
 class ChartView(QChartView):
     """Custom QChartView to handle zooming, panning and value display"""
+    
+    HOVER_INTERVAL = 16  # milliseconds, one frame at 60 Hz
+    
     def __init__(self, chart, parent):
         super().__init__(chart)
         self.setRubberBand(QChartView.RectangleRubberBand)
@@ -22,6 +94,17 @@ class ChartView(QChartView):
         self.original_y_range = None
         self.max_zoom_factor = 10.0
         self.min_zoom_factor = 0.1
+        
+        # Mouse moves are coalesced into at most one value lookup per frame
+        self.hover_position = None
+        self.hover_timer = QTimer(self)
+        self.hover_timer.setSingleShot(True)
+        self.hover_timer.setInterval(self.HOVER_INTERVAL)
+        self.hover_timer.timeout.connect(self._update_hover)
+
+    def reset_zoom_limits(self):
+        """Measure zoom limits from the next ranges, after the plotted data changed"""
+        self.original_range_set = False
 
     def wheelEvent(self, event):
         """Handle zooming with mouse wheel with limits"""
@@ -75,64 +158,39 @@ class ChartView(QChartView):
         """Handle mouse move for value display"""
         super().mouseMoveEvent(event)
         
-        # Convert mouse position to chart coordinates
-        chart_pos = self.chart().mapToValue(event.position())
-        
-        # Find closest points on both series
-        growth_series = None
-        invested_series = None
-        
-        for series in self.chart().series():
-            if series.name() == "Investment Value":
-                growth_series = series
-            elif series.name() == "Invested Amount":
-                invested_series = series
-        
-        if not growth_series or not invested_series:
-            return
-            
-        # Find closest data points
-        growth_point = self.find_closest_point(growth_series, chart_pos.x())
-        invested_point = self.find_closest_point(invested_series, chart_pos.x())
-        
-        if growth_point and invested_point:
-            # Update label with values
-            year = int(growth_point.x())
-            growth_value = growth_point.y()
-            invested_value = invested_point.y()
-            
-            self.chart_widget.update_values_label(year, growth_value, invested_value)
+        self.hover_position = event.position()
+        if not self.hover_timer.isActive():
+            self.hover_timer.start()
 
-    def find_closest_point(self, series, x_value):
-        """Find the closest point in a series to the given x value"""
-        if not series.points():
-            return None
-            
-        closest_point = None
-        min_distance = float('inf')
+    def _update_hover(self):
+        """Show the values closest to the last mouse position"""
+        if self.hover_position is None:
+            return
         
-        for point in series.points():
-            distance = abs(point.x() - x_value)
-            if distance < min_distance:
-                min_distance = distance
-                closest_point = point
-                
-        return closest_point
+        # Convert mouse position to chart coordinates
+        chart_pos = self.chart().mapToValue(self.hover_position)
+        self.chart_widget.show_values_at(chart_pos.x())
 
     def leaveEvent(self, event):
         """Clear values when mouse leaves the chart"""
+        self.hover_timer.stop()
+        self.hover_position = None
         self.chart_widget.clear_values_label()
         super().leaveEvent(event)
 
 class Chart(QWidget):
     """Widget to display investment growth chart"""
+    
+    RENDER_INTERVAL = 16  # milliseconds, zoom and pan steps are redrawn once per frame
 
-    def __init__(self, years, values, invested_values, theme="dark"):
+    def __init__(self, years=(), values=(), invested_values=(), theme="dark", use_opengl=False):
         """Initialize the Chart widget with investment data"""
         super().__init__()
         self.setFixedSize(600, 400)
         self.setObjectName("graphWidget")
         self.theme = theme
+        self.chart_palette = None
+        self.use_opengl = use_opengl
         
         # Create values label
         self.values_label = QLabel("Move mouse over chart to see values")
@@ -145,11 +203,30 @@ class Chart(QWidget):
         self.invested_series = QLineSeries()
         self.invested_series.setName("Invested Amount")
         
-        for year, value, invested in zip(years, values, invested_values):
-            self.growth_series.append(year, value)
-            self.invested_series.append(year, invested)
+        # Data of every series by name, kept as arrays for fast hover lookups
+        self.series_arrays = {}
+        
+        # Percentile bands of simulated outcomes, hidden until set_percentile_bands
+        self.bands = None
+        self.outer_band_upper, self.outer_band_lower = QLineSeries(), QLineSeries()
+        self.outer_band = QAreaSeries(self.outer_band_upper, self.outer_band_lower)
+        self.outer_band.setName("5th-95th Percentile")
+        self.inner_band_upper, self.inner_band_lower = QLineSeries(), QLineSeries()
+        self.inner_band = QAreaSeries(self.inner_band_upper, self.inner_band_lower)
+        self.inner_band.setName("25th-75th Percentile")
+        self.median_series = QLineSeries()
+        self.median_series.setName("Median")
+        
+        # QtCharts only accelerates line series with OpenGL, the bands are a handful of points anyway
+        for series in (self.growth_series, self.invested_series, self.median_series):
+            series.setUseOpenGL(use_opengl)
 
         self.chart = QChart()
+        # Bands are added first so the lines are drawn over them
+        self.band_series = (self.outer_band, self.inner_band, self.median_series)
+        for series in self.band_series:
+            self.chart.addSeries(series)
+            series.setVisible(False)
         self.chart.addSeries(self.growth_series)
         self.chart.addSeries(self.invested_series)
         self.chart.setTitle("Investment Growth vs. Invested Amount")
@@ -163,79 +240,172 @@ class Chart(QWidget):
         
         # Improve X axis (Years)
         self.axis_x.setLabelFormat("%d")  # Integer format for years
-        self.axis_x.setTickCount(min(10, len(years)))  # Reasonable number of ticks
         self.axis_x.setMinorTickCount(0)  # No minor ticks for cleaner look
         
         # Improve Y axis (Amount)
         self.axis_y.setLabelFormat("$%.0f")  # Currency format without decimals
-        max_value = max(max(values), max(invested_values))
-        min_value = min(min(values), min(invested_values))
-        
-        # Set nice round numbers for Y axis range
-        y_range = max_value - min_value
-        y_padding = y_range * 0.1  # 10% padding
-        self.axis_y.setMin(max(0, min_value - y_padding))
-        self.axis_y.setMax(max_value + y_padding)
-        
-        # Calculate appropriate tick count based on value range
-        if max_value < 10000:
-            tick_count = 8
-        elif max_value < 100000:
-            tick_count = 6
-        else:
-            tick_count = 5
-        self.axis_y.setTickCount(tick_count)
         
         self.chart.addAxis(self.axis_x, Qt.AlignBottom)
         self.chart.addAxis(self.axis_y, Qt.AlignLeft)
         
-        self.growth_series.attachAxis(self.axis_x)
-        self.growth_series.attachAxis(self.axis_y)
-        self.invested_series.attachAxis(self.axis_x)
-        self.invested_series.attachAxis(self.axis_y)
+        for series in self.chart.series():
+            series.attachAxis(self.axis_x)
+            series.attachAxis(self.axis_y)
         
-        self.apply_theme()
+        self._style_axes()
+        self.set_palette(get_chart_palette(theme))
         self.chart_view = ChartView(self.chart, self)
         
+        # Series only hold the points visible at the current zoom, at most one per pixel
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(self.RENDER_INTERVAL)
+        self.render_timer.timeout.connect(self.render_visible)
+        self.axis_x.rangeChanged.connect(self._schedule_render)
+        self.chart.plotAreaChanged.connect(self._schedule_render)
+        
         layout = QVBoxLayout()
         layout.addWidget(self.values_label)
         layout.addWidget(self.chart_view)
         self.setLayout(layout)
+        
+        self.set_data(years, values, invested_values)
 
-    def apply_theme(self):
-        """Apply the selected theme to the chart"""
-        if self.theme == "dark":
-            bg_color = QColor("#2d2d2d")
-            text_color = QColor("#E0E0E0")
-            grid_color = QColor("#444444")
-            growth_color = QColor("#BB86FC")  
-            invested_color = QColor("#03DAC6")  
-        else:
-            bg_color = QColor("#f8f8f8")
-            text_color = QColor("#2C2C2C")
-            grid_color = QColor("#c0c0c0")
-            growth_color = QColor("#35b15a")  
-            invested_color = QColor("#FF6D00")  
-            
-        self.chart.setBackgroundBrush(QBrush(bg_color))
-        self.chart.setTitleBrush(QBrush(text_color))
+    def set_data(self, years, values, invested_values):
+        """
+        Replace the plotted data in place
+        
+        Every series is refilled with a single replace() call and only the axis
+        settings that changed are updated, so the chart is not rebuilt.
+        """
+        if self.chart.isZoomed():
+            self.chart.zoomReset()
+        self.chart_view.reset_zoom_limits()
+        
+        x_values = np.asarray(years, dtype=np.float64)
+        self.series_arrays = {
+            self.growth_series.name(): (x_values, np.asarray(values, dtype=np.float64)),
+            self.invested_series.name(): (x_values, np.asarray(invested_values, dtype=np.float64)),
+        }
+        
+        self._fit_axes()
+        self.render_visible()
+
+    def set_percentile_bands(self, bands):
+        """
+        Draw simulated outcomes as shaded percentile bands and a median line
+        
+        Only the precomputed percentiles are drawn, so the cost depends on the
+        horizon and not on the number of simulated paths.
+        
+        Args:
+            bands: PercentileBands with the years and percentile arrays
+        """
+        self.bands = bands
+        for series in self.band_series:
+            series.setVisible(True)
+        self._fit_axes()
+        self.render_visible()
+
+    def clear_percentile_bands(self):
+        """Hide the percentile bands"""
+        self.bands = None
+        for series in self.band_series:
+            series.setVisible(False)
+        self._fit_axes()
+        self.render_visible()
+
+    def _schedule_render(self):
+        """Redraw the series after a zoom, pan or resize, once per frame"""
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def max_points(self):
+        """Get the number of points worth drawing, one per horizontal pixel of the plot"""
+        width = int(self.chart.plotArea().width())
+        return width if width > 0 else self.width()
+
+    def render_visible(self):
+        """Fill the series with the downsampled points of the visible range"""
+        self.render_timer.stop()
+        x_min, x_max = self.axis_x.min(), self.axis_x.max()
+        max_points = self.max_points()
+        for series in (self.growth_series, self.invested_series):
+            x_values, y_values = self.series_arrays.get(series.name(), ((), ()))
+            if not len(x_values):
+                series.clear()
+                continue
+            x_drawn, y_drawn = downsample(x_values, y_values, x_min, x_max, max_points)
+            self._replace_points(series, x_drawn, y_drawn)
+        if self.bands is not None:
+            self._render_bands(x_min, x_max, max_points)
+
+    def _render_bands(self, x_min, x_max, max_points):
+        """Fill the band series, keeping the same points in every band so the areas line up"""
+        years = np.asarray(self.bands.years, dtype=np.float64)
+        window = visible_slice(years, x_min, x_max)
+        indices = lttb(years[window], self.bands.median[window], max_points)
+        x_drawn = years[window][indices]
+        for series, values in ((self.outer_band_upper, self.bands.p95), (self.outer_band_lower, self.bands.p5),
+                               (self.inner_band_upper, self.bands.p75), (self.inner_band_lower, self.bands.p25),
+                               (self.median_series, self.bands.median)):
+            self._replace_points(series, x_drawn, np.asarray(values, dtype=np.float64)[window][indices])
+
+    @staticmethod
+    def _replace_points(series, x_values, y_values):
+        """Refill a series with a single replace() call"""
+        series.replace([QPointF(x, y) for x, y in zip(x_values.tolist(), y_values.tolist())])
+
+    def _fit_axes(self):
+        """Fit the axes to the data, leaving unchanged settings untouched"""
+        data = list(self.series_arrays.values())
+        if self.bands is not None:
+            data += [(self.bands.years, self.bands.p5), (self.bands.years, self.bands.p95)]
+        data = [(x_values, y_values) for x_values, y_values in data if len(x_values)]
+        if not data:
+            return
         
-        growth_pen = QPen(growth_color, 3)
-        self.growth_series.setPen(growth_pen)
+        years = np.concatenate([x_values for x_values, _ in data])
+        self._set_axis_range(self.axis_x, float(years.min()), float(years.max()))
+        # Reasonable number of ticks
+        self._set_tick_count(self.axis_x, max(2, min(10, max(len(x_values) for x_values, _ in data))))
         
-        invested_pen = QPen(invested_color, 2, Qt.DashLine)
-        self.invested_series.setPen(invested_pen)
+        max_value = float(max(y_values.max() for _, y_values in data))
+        min_value = float(min(y_values.min() for _, y_values in data))
         
+        # Set nice round numbers for Y axis range
+        y_range = max_value - min_value
+        y_padding = y_range * 0.1  # 10% padding
+        self._set_axis_range(self.axis_y, max(0, min_value - y_padding), max_value + y_padding)
+        
+        # Calculate appropriate tick count based on value range
+        if max_value < 10000:
+            tick_count = 8
+        elif max_value < 100000:
+            tick_count = 6
+        else:
+            tick_count = 5
+        self._set_tick_count(self.axis_y, tick_count)
+
+    @staticmethod
+    def _set_axis_range(axis, minimum, maximum):
+        """Set the range of an axis if it changed"""
+        if axis.min() != minimum or axis.max() != maximum:
+            axis.setRange(minimum, maximum)
+
+    @staticmethod
+    def _set_tick_count(axis, tick_count):
+        """Set the tick count of an axis if it changed"""
+        if axis.tickCount() != tick_count:
+            axis.setTickCount(tick_count)
+
+    def _style_axes(self):
+        """Set the fonts and visible parts of the axes and legend, they do not depend on the theme"""
         for axis in [self.axis_x, self.axis_y]:
-            axis.setLabelsBrush(QBrush(text_color))
-            axis.setTitleBrush(QBrush(text_color))
-            axis.setGridLineColor(grid_color)
-            axis.setLinePenColor(text_color)
             # Make axis lines more visible
             axis.setLineVisible(True)
             axis.setGridLineVisible(True)
             # Improve font size for better readability
-            axis.setLabelsFont(axis.labelsFont())
             font = axis.labelsFont()
             font.setPointSize(9)
             axis.setLabelsFont(font)
@@ -244,16 +414,55 @@ class Chart(QWidget):
             title_font.setPointSize(10)
             title_font.setBold(True)
             axis.setTitleFont(title_font)
+        self.chart.legend().setBackgroundVisible(True)
+        for band in (self.outer_band, self.inner_band):
+            band.setPen(QPen(Qt.NoPen))
+
+    def set_palette(self, palette):
+        """Recolor the chart in place with the pens and brushes of a palette"""
+        if palette is self.chart_palette:
+            return
+        self.chart_palette = palette
         
-        legend = self.chart.legend()
-        legend.setLabelColor(text_color)
-        legend.setBackgroundVisible(True)
-        legend.setBrush(QBrush(bg_color))
-        legend.setPen(QPen(grid_color))
+        self.chart.setBackgroundBrush(palette.background)
+        self.chart.setTitleBrush(palette.text)
+        self.growth_series.setPen(palette.growth_pen)
+        self.invested_series.setPen(palette.invested_pen)
+        self.median_series.setPen(palette.median_pen)
+        self.outer_band.setBrush(palette.outer_band_brush)
+        self.inner_band.setBrush(palette.inner_band_brush)
+        
+        for axis in [self.axis_x, self.axis_y]:
+            axis.setLabelsBrush(palette.text)
+            axis.setTitleBrush(palette.text)
+            axis.setGridLineColor(palette.grid_color)
+            axis.setLinePenColor(palette.text_color)
         
-        # Apply theme to values label
-        if hasattr(self, 'values_label'):
-            self.values_label.setStyleSheet(f"color: {text_color.name()}; font-size: 12px; font-weight: bold;")
+        legend = self.chart.legend()
+        legend.setLabelColor(palette.text_color)
+        legend.setBrush(palette.background)
+        legend.setPen(palette.grid_pen)
+        self.values_label.setStyleSheet(palette.label_style)
+
+    def value_at(self, series_name, x):
+        """Get the point of a series closest to x, or None if the series is empty"""
+        x_values, y_values = self.series_arrays.get(series_name, ((), ()))
+        index = nearest_index(x_values, x)
+        if index is None:
+            return None
+        return x_values[index], y_values[index]
+
+    def show_values_at(self, x):
+        """Show the values of both series closest to x"""
+        growth_point = self.value_at(self.growth_series.name(), x)
+        invested_point = self.value_at(self.invested_series.name(), x)
+        if growth_point and invested_point:
+            self.update_values_label(int(growth_point[0]), growth_point[1], invested_point[1])
+            if self.bands is not None:
+                index = nearest_index(np.asarray(self.bands.years, dtype=np.float64), x)
+                self.values_label.setText(
+                    self.values_label.text() + f"\nMedian: ${self.bands.median[index]:,.2f} | "
+                    f"5th-95th Percentile: ${self.bands.p5[index]:,.2f} - ${self.bands.p95[index]:,.2f}")
 
     def update_values_label(self, year, growth_value, invested_value):
         """Update the values label with current data"""
@@ -267,4 +476,4 @@ class Chart(QWidget):
     def change_theme(self, theme):
         """Change the theme of the chart"""
         self.theme = theme
-        self.apply_theme()
\ No newline at end of file
+        self.set_palette(get_chart_palette(theme))
\ No newline at end of file
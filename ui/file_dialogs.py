@@ -0,0 +1,156 @@
+import os
+from typing import List, Dict, Optional
+from datetime import datetime
+from PySide6.QtWidgets import QFileDialog, QMessageBox
+from core.investment_file_manager import InvestmentFileManager
+from core.columnar_export import is_parquet_available
+
+class FileDialogs:
+    """Qt dialogs on top of the headless InvestmentFileManager"""
+    
+    def __init__(self, file_manager: Optional[InvestmentFileManager] = None):
+        self.file_manager = file_manager or InvestmentFileManager()
+        self.file_filter = "Investment Files (*.json *.invb);;All Files (*)"
+        self.save_filter = "Investment Files (*.json);;Binary Investment Files (*.invb);;All Files (*)"
+        
+    def choose_save_path(self, parent_widget) -> Optional[str]:
+        """
+        Open a dialog to choose where to save the investments
+        
+        Args:
+            parent_widget: Parent widget for dialogs
+            
+        Returns:
+            The selected path or None if the dialog was cancelled
+        """
+        file_path, _ = QFileDialog.getSaveFileName(
+            parent_widget,
+            "Save Investments",
+            f"investments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{self.file_manager.default_extension}",
+            self.save_filter
+        )
+        return file_path or None
+    
+    def choose_file_to_load(self, parent_widget) -> Optional[str]:
+        """
+        Open a dialog to choose the investment file to load
+        
+        Args:
+            parent_widget: Parent widget for dialogs
+            
+        Returns:
+            The selected path or None if the dialog was cancelled
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            parent_widget,
+            "Load Investments",
+            "",
+            self.file_filter
+        )
+        return file_path or None
+    
+    def choose_broker_csv(self, parent_widget) -> Optional[str]:
+        """
+        Open a dialog to choose a broker CSV export to import
+        
+        Args:
+            parent_widget: Parent widget for dialogs
+            
+        Returns:
+            The selected path or None if the dialog was cancelled
+        """
+        file_path, _ = QFileDialog.getOpenFileName(
+            parent_widget,
+            "Import Broker CSV",
+            "",
+            "CSV Files (*.csv *.txt);;All Files (*)"
+        )
+        return file_path or None
+    
+    def export_to_csv(self, parent_widget, investments_data: List[Dict], 
+                      years: int, compound_freq: str, contrib_freq: str,
+                      include_breakdown: bool = False) -> bool:
+        """
+        Export investments to CSV format for Excel
+        
+        Args:
+            parent_widget: Parent widget for dialogs
+            investments_data: List of investment data
+            years: Years of growth
+            compound_freq: Compound frequency
+            contrib_freq: Contribution frequency
+            include_breakdown: Add the year-by-year capital of every holding
+            
+        Returns:
+            bool: True if export successful, False otherwise
+        """
+        try:
+            file_path, _ = QFileDialog.getSaveFileName(
+                parent_widget,
+                "Export to CSV",
+                f"investments_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                "CSV Files (*.csv);;All Files (*)"
+            )
+            
+            if not file_path:
+                return False
+                
+            self.file_manager.export_to_csv(file_path, investments_data, years, compound_freq,
+                                            contrib_freq, include_breakdown)
+                    
+            self._show_message(parent_widget, "Success", f"Data exported to {os.path.basename(file_path)}")
+            return True
+            
+        except Exception as e:
+            self._show_error(parent_widget, "Export Error", f"Failed to export data: {str(e)}")
+            return False
+    
+    def export_columnar(self, parent_widget, investments_data: List[Dict], 
+                        years: int, compound_freq: str, contrib_freq: str,
+                        volatility: Optional[float] = None) -> bool:
+        """
+        Export the year-by-year projection to Parquet, or NumPy .npz without pyarrow
+        
+        Args:
+            parent_widget: Parent widget for dialogs
+            investments_data: List of investment data
+            years: Years of growth
+            compound_freq: Compound frequency
+            contrib_freq: Contribution frequency
+            volatility: Volatility in percent to export the percentile bands with, None to skip them
+            
+        Returns:
+            bool: True if export successful, False otherwise
+        """
+        if is_parquet_available():
+            extension, file_filter = "parquet", "Parquet Files (*.parquet);;NumPy Archives (*.npz);;All Files (*)"
+        else:
+            extension, file_filter = "npz", "NumPy Archives (*.npz);;All Files (*)"
+        try:
+            file_path, _ = QFileDialog.getSaveFileName(
+                parent_widget,
+                "Export Data",
+                f"projection_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}",
+                file_filter
+            )
+            
+            if not file_path:
+                return False
+                
+            file_path = self.file_manager.export_columnar(file_path, investments_data, years,
+                                                          compound_freq, contrib_freq, volatility=volatility)
+                    
+            self._show_message(parent_widget, "Success", f"Data exported to {os.path.basename(file_path)}")
+            return True
+            
+        except Exception as e:
+            self._show_error(parent_widget, "Export Error", f"Failed to export data: {str(e)}")
+            return False
+    
+    def _show_message(self, parent, title: str, message: str):
+        """Show information message"""
+        QMessageBox.information(parent, title, message)
+        
+    def _show_error(self, parent, title: str, message: str):
+        """Show error message"""
+        QMessageBox.critical(parent, title, message)
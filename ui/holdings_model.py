@@ -0,0 +1,319 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QEvent, QLocale, Signal
+from PySide6.QtGui import QColor, QDoubleValidator
+from PySide6.QtWidgets import QStyledItemDelegate, QLineEdit, QStyle, QStyleOptionButton, QApplication
+
+class Holding:
+    """Compact state of one holding, the fields are kept as typed until validation"""
+
+    __slots__ = ("holding_id", "ticker", "initial_deposit", "contribution_amount", "rate", "status", "message")
+
+    # Analysis states shown in the status column
+    IDLE, ANALYZING, AWAITING, OK, WARNING, ERROR = "idle", "analyzing", "awaiting", "ok", "warning", "error"
+
+    def __init__(self, holding_id=None, ticker="", initial_deposit="", contribution_amount="", rate=None):
+        self.holding_id = holding_id  # Identifier of the holding in the edit journal
+        self.ticker = ticker
+        self.initial_deposit = initial_deposit
+        self.contribution_amount = contribution_amount
+        self.rate = rate
+        self.status = self.IDLE
+        self.message = ""
+
+    @property
+    def symbol(self):
+        """Get the normalized ticker symbol"""
+        return self.ticker.strip().upper()
+
+    @property
+    def is_analyzing(self):
+        """Check if the rate of the holding is being fetched"""
+        return self.status in (self.ANALYZING, self.AWAITING)
+
+    def set_rate(self, rate, suffix=""):
+        """Use a fetched or saved rate"""
+        self.rate = rate
+        self.status = self.OK
+        self.message = f"✓ {self.symbol}: {rate:.2f}% annual return{suffix}"
+
+    def set_warning(self, message):
+        """Report a problem while keeping the current rate"""
+        self.status = self.WARNING
+        self.message = message
+
+    def set_pending(self, status, message):
+        """Mark the rate as being fetched"""
+        self.status = status
+        self.message = message
+
+    def set_error(self, message):
+        """Report an error, the holding has no usable rate until its ticker is analyzed again"""
+        self.rate = None
+        self.status = self.ERROR
+        self.message = message
+
+    def get_raw_data(self):
+        """Get the inputs as typed, without validation, for the edit journal"""
+        return {
+            "ticker": self.ticker,
+            "initial_deposit": self.initial_deposit,
+            "contribution_amount": self.contribution_amount,
+            "rate": self.rate
+        }
+
+    def get_data(self, compound_freq, contrib_freq, years):
+        """
+        Validate the holding
+
+        Returns:
+            tuple: (investment data, None) or (None, error message)
+        """
+        if not self.ticker.strip():
+            return None, "Please enter a ticker symbol"
+        if not self.initial_deposit.strip():
+            return None, "Please enter an initial deposit amount"
+        if not self.contribution_amount.strip():
+            return None, "Please enter a contribution amount"
+
+        try:
+            initial_deposit = float(self.initial_deposit)
+            contribution = float(self.contribution_amount)
+        except ValueError:
+            return None, "Please enter valid numbers for deposit and contribution"
+        if initial_deposit < 0 or contribution < 0:
+            return None, "Amounts cannot be negative"
+
+        if self.rate is None:
+            if self.is_analyzing:
+                return None, "Ticker analysis in progress. Please wait..."
+            return None, "Please wait for ticker analysis to complete or enter a valid ticker"
+
+        return {
+            "ticker": self.symbol,
+            "rate": self.rate,
+            "initial_deposit": initial_deposit,
+            "contribution_amount": contribution,
+            "compound_frequency": compound_freq,
+            "contribution_frequency": contrib_freq,
+            "years": years
+        }, None
+
+class AnalysisTracker(QObject):
+    """Aggregate of the holdings waiting for a rate, without walking every holding"""
+
+    # Emitted once when the last pending analysis completes
+    all_finished = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.holdings = set()
+
+    @property
+    def pending(self):
+        """Get the number of holdings waiting for a rate"""
+        return len(self.holdings)
+
+    def tickers(self):
+        """Get the distinct tickers being analyzed"""
+        return sorted({holding.symbol for holding in self.holdings if holding.symbol})
+
+    def update(self, holdings):
+        """Track the analysis state of changed holdings"""
+        was_pending = bool(self.holdings)
+        for holding in holdings:
+            if holding.is_analyzing:
+                self.holdings.add(holding)
+            else:
+                self.holdings.discard(holding)
+        self._notify(was_pending)
+
+    def discard(self, holding):
+        """Stop tracking a removed holding"""
+        was_pending = bool(self.holdings)
+        self.holdings.discard(holding)
+        self._notify(was_pending)
+
+    def reset(self, holdings):
+        """Track exactly the analyzing holdings among all holdings, after a bulk change"""
+        was_pending = bool(self.holdings)
+        self.holdings = {holding for holding in holdings if holding.is_analyzing}
+        self._notify(was_pending)
+
+    def _notify(self, was_pending):
+        """Emit all_finished when nothing is pending anymore"""
+        if was_pending and not self.holdings:
+            self.all_finished.emit()
+
+class HoldingsModel(QAbstractTableModel):
+    """Table model of the holdings, views only create widgets for the visible rows"""
+
+    TICKER, INITIAL_DEPOSIT, CONTRIBUTION, RATE, STATUS, REMOVE = range(6)
+    HEADERS = ("Ticker", "Initial Deposit", "Contribution Amount", "Annual Rate", "Status", "")
+    EDITABLE_FIELDS = {TICKER: "ticker", INITIAL_DEPOSIT: "initial_deposit", CONTRIBUTION: "contribution_amount"}
+    STATUS_COLORS = {Holding.ANALYZING: "blue", Holding.AWAITING: "blue", Holding.OK: "green",
+                     Holding.WARNING: "red", Holding.ERROR: "red"}
+
+    # Emitted when the user edits the ticker of a holding
+    ticker_edited = Signal(object)  # holding
+    # Emitted when the fields or the rate of a single holding change
+    holding_changed = Signal(object)  # holding
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.holdings = []
+        self.analysis_tracker = AnalysisTracker(self)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.holdings)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        if orientation == Qt.Orientation.Vertical and role == Qt.ItemDataRole.DisplayRole:
+            return str(section + 1)
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() in self.EDITABLE_FIELDS:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        holding = self.holdings[index.row()]
+        column = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column in self.EDITABLE_FIELDS:
+                return getattr(holding, self.EDITABLE_FIELDS[column])
+            if column == self.RATE:
+                return "" if holding.rate is None else f"{holding.rate:.2f}%"
+            if column == self.STATUS:
+                return holding.message
+            if column == self.REMOVE:
+                return "Remove"
+        elif role == Qt.ItemDataRole.ForegroundRole and column == self.STATUS:
+            color = self.STATUS_COLORS.get(holding.status)
+            return QColor(color) if color else None
+        elif role == Qt.ItemDataRole.ToolTipRole and column == self.STATUS:
+            return self._rolling_statistics_tooltip(holding)
+        return None
+
+    def _rolling_statistics_tooltip(self, holding):
+        """Describe the rolling-window CAGR distribution of the ticker, computed when hovered"""
+        if holding.status != Holding.OK:
+            return holding.message or None
+        from core.rolling_stats import DEFAULT_WINDOWS, MIN_HISTORY_WINDOWS, get_rolling_statistics
+        statistics = get_rolling_statistics(holding.symbol)
+        if not statistics:
+            return holding.message
+        lines = []
+        for window_years in DEFAULT_WINDOWS:
+            stats = statistics.get(window_years)
+            if stats is None:
+                lines.append(f"{window_years}y rolling CAGR: not available, "
+                             f"needs {MIN_HISTORY_WINDOWS * window_years} years of prices")
+            else:
+                lines.append(f"{window_years}y rolling CAGR: median {stats.median:.2f}%, "
+                             f"5th-95th percentile {stats.p5:.2f}% to {stats.p95:.2f}% ({stats.count} windows)")
+        return "\n".join(lines)
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or index.column() not in self.EDITABLE_FIELDS:
+            return False
+        holding = self.holdings[index.row()]
+        field = self.EDITABLE_FIELDS[index.column()]
+        value = str(value)
+        if getattr(holding, field) == value:
+            return False
+
+        setattr(holding, field, value)
+        if field == "ticker":
+            holding.rate = None
+            holding.status = Holding.IDLE
+            holding.message = ""
+        self.refresh_row(index.row())
+        if field == "ticker":
+            self.ticker_edited.emit(holding)
+        self.holding_changed.emit(holding)
+        return True
+
+    def add_holdings(self, holdings):
+        """Append holdings with a single row insertion"""
+        if not holdings:
+            return
+        start = len(self.holdings)
+        self.beginInsertRows(QModelIndex(), start, start + len(holdings) - 1)
+        self.holdings.extend(holdings)
+        self.endInsertRows()
+        self.analysis_tracker.update(holdings)
+
+    def remove_holding(self, row):
+        """Remove the holding of a row and return it"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        holding = self.holdings.pop(row)
+        self.endRemoveRows()
+        self.analysis_tracker.discard(holding)
+        return holding
+
+    def clear(self):
+        """Remove every holding"""
+        self.beginResetModel()
+        self.holdings = []
+        self.endResetModel()
+        self.analysis_tracker.reset(self.holdings)
+
+    def refresh_row(self, row):
+        """Repaint a row and track its analysis after the state of its holding changed"""
+        self.analysis_tracker.update((self.holdings[row],))
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def refresh_all(self):
+        """Repaint every row after a bulk change, with a single signal"""
+        self.analysis_tracker.reset(self.holdings)
+        if self.holdings:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.holdings) - 1, self.columnCount() - 1))
+
+class TextDelegate(QStyledItemDelegate):
+    """Delegate editing a cell with a line edit, created only while the cell is edited"""
+
+    def __init__(self, placeholder="", numeric=False, parent=None):
+        super().__init__(parent)
+        self.placeholder = placeholder
+        self.numeric = numeric
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setPlaceholderText(self.placeholder)
+        if self.numeric:
+            validator = QDoubleValidator(0.0, 1e15, 2, editor)
+            validator.setNotation(QDoubleValidator.Notation.StandardNotation)
+            validator.setLocale(QLocale.c())  # Amounts are stored with a dot as decimal separator
+            editor.setValidator(validator)
+        return editor
+
+class RemoveButtonDelegate(QStyledItemDelegate):
+    """Delegate painting a remove button in every row, without creating a widget per row"""
+
+    # Emitted when the button of a row is clicked
+    remove_clicked = Signal(int)  # row
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 2, -4, -2)
+        button.text = index.data()
+        button.state = QStyle.StateFlag.State_Enabled
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            button.state |= QStyle.StateFlag.State_MouseOver
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and option.rect.contains(event.position().toPoint()):
+            self.remove_clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
@@ -1,14 +1,24 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QSpacerItem, QSizePolicy, QApplication
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpacerItem, QSizePolicy, QCheckBox,
+                               QDoubleSpinBox)
 from PySide6.QtCore import Qt
-from ui.chart import Chart
+from ui.theme_manager import ThemeManager
+from core.simulation_thread import SimulationScheduler
 
 class Homepage(QWidget):
     """Widget to display the homepage with investment details and chart"""
 
-    def __init__(self):
+    SIMULATED_PATHS = 10_000
+
+    def __init__(self, theme_manager=None):
         """Initialize the Homepage widget"""
         super().__init__()
+        self.theme_manager = theme_manager or ThemeManager()
         self.investment = {"is_empty": True}
+        self.chart = None  # Created with the first projection, then updated in place
+        # Simulations run on a worker, the bands are drawn when they arrive
+        self.simulations = SimulationScheduler(self)
+        self.simulations.bands_ready.connect(self._on_bands_ready)
+        self.simulations.simulation_failed.connect(self._on_simulation_failed)
         self.setup_ui()
 
     def setup_ui(self):
@@ -21,6 +31,40 @@ class Homepage(QWidget):
         self.message.setObjectName("home_title")
         self.home_layout.addWidget(self.message)
         
+        self.instructions = QLabel(
+            "👋 Start your investment journey!\n\n"
+            "1. Click on 'Portfolio' in the sidebar\n"
+            "2. Fill in your financial details\n"
+            "3. See your growth projections here"
+        )
+        self.instructions.setObjectName("home_instructions")
+        self.instructions.setAlignment(Qt.AlignCenter)
+        self.home_layout.addWidget(self.instructions)
+        
+        self.details = QLabel()
+        self.details.setObjectName("home_details")
+        self.home_layout.addWidget(self.details)
+        
+        # Range of outcomes simulated with random yearly returns
+        self.range_options = QWidget()
+        range_layout = QHBoxLayout(self.range_options)
+        range_layout.setContentsMargins(0, 0, 0, 0)
+        self.show_range = QCheckBox("Show range of outcomes")
+        range_layout.addWidget(self.show_range)
+        range_layout.addWidget(QLabel("Volatility (%)"))
+        self.volatility = QDoubleSpinBox()
+        self.volatility.setRange(0.0, 100.0)
+        self.volatility.setValue(15.0)
+        range_layout.addWidget(self.volatility)
+        range_layout.addStretch()
+        self.home_layout.addWidget(self.range_options)
+        self.show_range.toggled.connect(self.update_range)
+        # Stepping through values only simulates the last one
+        self.volatility.valueChanged.connect(lambda: self.simulations.schedule(self._simulation_request))
+        
+        # The chart is inserted here, above the spacer
+        self.home_layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+        
         if self.investment["is_empty"]:
             self.no_data()
         else:
@@ -29,16 +73,11 @@ class Homepage(QWidget):
     def no_data(self):
         """Display a message when no investment data is available"""
         self.message.setText("No Investment Data Found")
-        instructions = QLabel(
-            "👋 Start your investment journey!\n\n"
-            "1. Click on 'Portfolio' in the sidebar\n"
-            "2. Fill in your financial details\n"
-            "3. See your growth projections here"
-        )
-        instructions.setObjectName("home_instructions")
-        instructions.setAlignment(Qt.AlignCenter)
-        self.home_layout.addWidget(instructions)
-        self.home_layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
+        self.instructions.setVisible(True)
+        self.details.setVisible(False)
+        self.range_options.setVisible(False)
+        if self.chart is not None:
+            self.chart.setVisible(False)
 
     def calculate_invested_values(self, years):
         """Calculate the invested values based on the investment data"""
@@ -62,8 +101,7 @@ class Homepage(QWidget):
         return invested_values
 
     def create_homepage(self):
-        """Create the homepage with investment details and chart"""
-        self.clear_layout()
+        """Show the investment details and chart, updating the existing widgets"""
         self.message.setText("Investment Details")
         
         details_text = (
@@ -78,39 +116,78 @@ class Homepage(QWidget):
             f"Profit: ${self.investment['profit']:,.2f}"
         )
         
-        details = QLabel(details_text)
-        details.setObjectName("home_details")
+        self.details.setText(details_text)
         
         invested_values = self.calculate_invested_values(self.years)
         
-        app = QApplication.instance()
-        theme = "dark" if "background-color: #121212" in app.styleSheet() else "light"
-        self.chart = Chart(self.years, self.capital, invested_values, theme)
-        self.chart.setObjectName("graphWidget")
+        if self.chart is None:
+            # Imported with the first projection, the chart needs numpy
+            from ui.chart import Chart
+            self.chart = Chart(self.years, self.capital, invested_values, self.theme_manager.chart_theme)
+            self.chart.setObjectName("graphWidget")
+            self.theme_manager.register_chart(self.chart)
+            self.home_layout.insertWidget(self.home_layout.indexOf(self.range_options) + 1, self.chart)
+        else:
+            self.chart.set_data(self.years, self.capital, invested_values)
+        self.update_range()
         
-        self.home_layout.addWidget(self.message)
-        self.home_layout.addWidget(details)
-        self.home_layout.addWidget(self.chart)
+        self.instructions.setVisible(False)
+        self.details.setVisible(True)
+        self.range_options.setVisible(True)
+        self.chart.setVisible(True)
+
+    def update_range(self):
+        """Simulate the range of outcomes in the background, or hide the percentile bands"""
+        request = self._simulation_request()
+        if request is None:
+            self.simulations.cancel()
+            self._hide_range()
+        else:
+            self.simulations.submit(request)
+
+    def _simulation_request(self):
+        """Get the arguments of simulate_paths, or None if no range should be shown"""
+        if self.chart is None or self.investment.get("is_empty", True) or not self.show_range.isChecked():
+            return None
+        # A total loss cannot be simulated with log-normal returns
+        if self.investment['rate'] <= -100:
+            return None
+        return {
+            "initial_deposit": self.investment['initial_deposit'],
+            "contribution_amount": self.investment['contribution_amount'],
+            "years": self.investment['years'],
+            "rate": self.investment['rate'],
+            "volatility": self.volatility.value(),
+            "contribution_frequency": self.investment['contribution_frequency'],
+            "path_count": self.SIMULATED_PATHS,
+        }
+
+    def _hide_range(self):
+        """Remove the percentile bands from the chart"""
+        if self.chart is not None and self.chart.bands is not None:
+            self.chart.clear_percentile_bands()
+
+    def _on_bands_ready(self, bands):
+        """Draw the simulated bands unless the range was hidden meanwhile"""
+        if self._simulation_request() is not None:
+            self.chart.set_percentile_bands(bands)
+
+    def _on_simulation_failed(self, error_message):
+        """Hide the bands of a simulation that could not run"""
+        print(f"Could not simulate the range of outcomes: {error_message}")
+        self._hide_range()
+
+    def cleanup(self):
+        """Stop the running simulation"""
+        self.simulations.shutdown()
 
     def update_investment(self, new_investment, years, capital):
         """Update the homepage with new investment data"""
         self.years = years
         self.capital = capital
         self.investment = new_investment
-        self.clear_layout()
         
         if not self.investment.get("is_empty", True):
             self.create_homepage()
         else:
             self.no_data()
-
-    def clear_layout(self):
-        """Clear the current layout of the homepage"""
-        while self.home_layout.count():
-            item = self.home_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        self.message = QLabel()
-        self.message.setObjectName("home_title")
-        self.home_layout.addWidget(self.message)
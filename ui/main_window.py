@@ -1,10 +1,15 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QStackedLayout, QPushButton, QLabel, QHBoxLayout, QScrollArea, QApplication
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QStackedLayout, QPushButton, QLabel, QHBoxLayout, QScrollArea
 from PySide6.QtCore import QSize
 from ui.homepage import Homepage
 from ui.portfolio import Portfolio
 from ui.settings import Settings
-from ui.advanced import Advanced
-from core.finance import Finance
+from ui.theme_manager import ThemeManager
+from core.projection_thread import ProjectionScheduler
+from core.session import SessionState
+from core.edit_journal import EditJournal
+from core.ticker_thread import CacheWarmupWorker, ModulePreloadWorker
+from core.async_fetch import shutdown_fetch_backend
+from core.price_writer import shutdown_price_writer
 import os
 import sys
 
@@ -47,20 +52,30 @@ class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.mode = self.MODE_DEFAULT
+        self.warmup_worker = None
+        self.preload_worker = None
+        self.projection = ProjectionScheduler(self)
+        self.theme_manager = ThemeManager(lambda theme: get_resource_path(f"assets/{theme}.qss"), parent=self)
         self._init_ui_components()
         self._setup_ui()
         self._connect_signals()
+        self._restore_last_session()
 
     def _init_ui_components(self):
         """Initialize UI components"""
         # Main layout
         self.main_layout = QVBoxLayout()
         
-        # Pages and widgets
-        self.homepage = Homepage()
-        self.portfolio = Portfolio()
-        self.settings = Settings()
-        self.advanced = Advanced()
+        # The homepage is shown first, the other pages are created on their first visit
+        self.homepage = Homepage(self.theme_manager)
+        self.portfolio = None
+        self.settings = None
+        self.advanced = None
+        self.page_factories = {
+            self.PAGE_PORTFOLIO: self._create_portfolio_page,
+            self.PAGE_SETTINGS: self._create_settings_page,
+            self.PAGE_ADVANCED: self._create_advanced_page
+        }
         
         # Navigation buttons
         self.home_button = QPushButton("Home")
@@ -113,22 +128,55 @@ class MainWindow(QWidget):
         """Create and setup the main content area with pages"""
         self.pages = QStackedLayout()
         
-        # Setup portfolio with scroll area
-        portfolio_scroll = self._create_scrollable_widget(self.portfolio)
-        
-        # Add pages in order
-        pages_to_add = [
-            self.homepage,      # PAGE_HOME = 0
-            portfolio_scroll,   # PAGE_PORTFOLIO = 1
-            self.settings,      # PAGE_SETTINGS = 2
-            self.advanced       # PAGE_ADVANCED = 3
-        ]
-        
-        for page in pages_to_add:
-            self.pages.addWidget(page)
+        # Add pages in order, lazy pages start as empty placeholders
+        self.pages.addWidget(self.homepage)  # PAGE_HOME = 0
+        for page_index in (self.PAGE_PORTFOLIO, self.PAGE_SETTINGS, self.PAGE_ADVANCED):
+            self.pages.insertWidget(page_index, QWidget())
         
         self.horizontal_layout.addLayout(self.pages)
 
+    def _ensure_page(self, page_index):
+        """Replace the placeholder of a page with the real page on its first visit"""
+        factory = self.page_factories.pop(page_index, None)
+        if factory is None:
+            return
+        
+        page = factory()
+        placeholder = self.pages.widget(page_index)
+        self.pages.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages.insertWidget(page_index, page)
+
+    def _create_portfolio_page(self):
+        """Create the portfolio page inside its scroll area"""
+        self.portfolio = Portfolio()
+        self.portfolio.investment_saved.connect(self._handle_investment_update)
+        self.portfolio.inputs_changed.connect(lambda: self.projection.schedule(self.portfolio.live_investment))
+        return self._create_scrollable_widget(self.portfolio)
+
+    def _create_settings_page(self):
+        """Create the settings page"""
+        self.settings = Settings()
+        self.settings.mode_changed.connect(self._change_mode)
+        self.settings.theme_changed.connect(self._apply_theme)
+        return self.settings
+
+    def _create_advanced_page(self):
+        """Create the advanced page with the investments of the last session"""
+        # Imported on first use, the page pulls in numpy through the file formats and exports
+        from ui.advanced import Advanced
+        self.advanced = Advanced()
+        self.advanced.investment_saved.connect(self._handle_investment_update)
+        self.advanced.inputs_changed.connect(lambda: self.projection.schedule(self.advanced.live_investment))
+        self.advanced.restore_from_journal()
+        return self.advanced
+
+    def _restore_last_session(self):
+        """Build the advanced page right away if the journal holds edits of the last session"""
+        state = EditJournal().recover()
+        if state.holdings or state.settings:
+            self._ensure_page(self.PAGE_ADVANCED)
+
     def _create_scrollable_widget(self, widget):
         """Create a scrollable container for a widget"""
         scroll_area = QScrollArea()
@@ -139,8 +187,8 @@ class MainWindow(QWidget):
     def _connect_signals(self):
         """Connect all signals to their respective slots"""
         self._connect_navigation_signals()
-        self._connect_settings_signals()
-        self._connect_investment_signals()
+        self.projection.projection_ready.connect(self.homepage.update_investment)
+        self.projection.projection_failed.connect(self._on_projection_failed)
 
     def _connect_navigation_signals(self):
         """Connect navigation button signals"""
@@ -148,18 +196,9 @@ class MainWindow(QWidget):
         self.portfolio_button.clicked.connect(self._handle_portfolio_navigation)
         self.settings_button.clicked.connect(lambda: self._navigate_to_page(self.PAGE_SETTINGS))
 
-    def _connect_settings_signals(self):
-        """Connect settings-related signals"""
-        self.settings.mode_changed.connect(self._change_mode)
-        self.settings.theme_changed.connect(self._apply_theme)
-
-    def _connect_investment_signals(self):
-        """Connect investment update signals"""
-        self.portfolio.investment_saved.connect(self._handle_investment_update)
-        self.advanced.investment_saved.connect(self._handle_investment_update)
-
     def _navigate_to_page(self, page_index):
         """Navigate to a specific page"""
+        self._ensure_page(page_index)
         self.pages.setCurrentIndex(page_index)
 
     def _handle_portfolio_navigation(self):
@@ -176,38 +215,60 @@ class MainWindow(QWidget):
         # No need to reconnect signals
 
     def _handle_investment_update(self, investment):
-        """Handle investment data updates"""
-        try:
-            finance = Finance(investment)
-            results = finance.get_results()
-            years, capital = finance.get_annual_breakdown()
-            self.homepage.update_investment(results, years, capital)
-        except Exception as e:
-            print(f"Error updating investment: {e}")
+        """Project saved investment data on the worker thread, the homepage shows the result"""
+        self.projection.submit(investment)
+
+    def _on_projection_failed(self, error_message):
+        """Report a projection that could not be computed"""
+        print(f"Error updating investment: {error_message}")
 
     def _apply_theme(self, theme_name):
         """Apply the selected theme to the application"""
         try:
-            qss_path = get_resource_path(f"assets/{theme_name}.qss")
-            
-            if not os.path.exists(qss_path):
-                print(f"Warning: QSS file not found at {qss_path}")
-                return
-            
-            with open(qss_path, "r", encoding="utf-8") as file:
-                stylesheet = file.read()
-            
-            app = QApplication.instance()
-            if app:
-                app.setStyleSheet(stylesheet)
-                self._update_chart_theme(theme_name)
-                
-        except Exception as e:
-            print(f"Error applying theme: {e}")
-
-    def _update_chart_theme(self, theme_name):
-        """Update chart theme if available"""
-        if (hasattr(self.homepage, 'chart') and 
-            self.homepage.chart is not None and
-            hasattr(self.homepage.chart, 'change_theme')):
-            self.homepage.chart.change_theme(theme_name)
\ No newline at end of file
+            self.theme_manager.apply(theme_name)
+        except OSError as e:
+            print(f"Warning: QSS file for theme {theme_name} could not be read: {e}")
+
+    def start_module_preload(self):
+        """Import the price data libraries on a low-priority thread while the window is idle"""
+        if self.preload_worker is not None:
+            return
+        
+        self.preload_worker = ModulePreloadWorker()
+        self.preload_worker.start_low_priority()
+
+    def start_cache_warmup(self):
+        """Pre-fetch the tickers of the last used portfolio on a low-priority thread"""
+        file_path = SessionState().get_last_portfolio()
+        if file_path is None or self.warmup_worker is not None:
+            return
+        
+        self.warmup_worker = CacheWarmupWorker(file_path)
+        self.warmup_worker.start_low_priority()
+
+    def _stop_cache_warmup(self):
+        """Stop the warm-up worker if it is still running"""
+        if self.warmup_worker is None:
+            return
+        
+        self.warmup_worker.cancel()
+        self.warmup_worker.wait(1000)  # Wait max 1 second
+        if self.warmup_worker.isRunning():
+            self.warmup_worker.terminate()
+        self.warmup_worker = None
+
+    def closeEvent(self, event):
+        """Stop background work before the window closes"""
+        self._stop_cache_warmup()
+        self.projection.shutdown()
+        self.homepage.cleanup()
+        if self.preload_worker is not None:
+            # An import cannot be interrupted, wait for the current one
+            self.preload_worker.requestInterruption()
+            self.preload_worker.wait()
+        if self.advanced is not None:
+            self.advanced.cleanup()
+        shutdown_fetch_backend()
+        # Prices are stored after every fetch, only a batch still being written is waited for
+        shutdown_price_writer()
+        super().closeEvent(event)
\ No newline at end of file
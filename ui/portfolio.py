@@ -1,9 +1,11 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QStackedLayout, QPushButton, QSpacerItem, QSizePolicy, QLineEdit, QLabel, QHBoxLayout, QComboBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QStackedLayout, QPushButton, QSpacerItem, QSizePolicy, QLineEdit, QLabel, QHBoxLayout, QComboBox, QCheckBox
 from PySide6.QtCore import Signal
 
 class Portfolio(QWidget):
     """Widget to display and manage the investment portfolio"""
     investment_saved = Signal(dict)
+    # Emitted on every input edit while live updates are on
+    inputs_changed = Signal()
     def __init__(self):
         super().__init__()
         self.investment = {
@@ -42,6 +44,8 @@ class Portfolio(QWidget):
         self.settings_layout.addWidget(self.contribution_frequency)
         self.save_button = QPushButton("Save")
         self.settings_layout.addWidget(self.save_button)
+        self.live_update = QCheckBox("Update results while typing")
+        self.settings_layout.addWidget(self.live_update)
         self.message = QLabel("")
         self.warning = QLabel("")
         self.settings_layout.addWidget(self.message)
@@ -51,63 +55,95 @@ class Portfolio(QWidget):
     def controller(self):
         """Connect signals to their respective slots"""
         self.save_button.clicked.connect(self.save_investment)
+        for line_edit in (self.initial_deposit, self.years, self.rate, self.contribution):
+            line_edit.textChanged.connect(self._on_input_changed)
+        for combo in (self.frequency, self.contribution_frequency):
+            combo.currentTextChanged.connect(self._on_input_changed)
+        self.live_update.toggled.connect(self._on_input_changed)
+
+    def _on_input_changed(self):
+        """Request a live update of the results"""
+        if self.live_update.isChecked():
+            self.inputs_changed.emit()
 
     def save_investment(self):
         """Validate input and save the investment data"""
-        self.warning.setText("")
+        investment = self.read_investment()
+        if investment is not None:
+            self.message.setText("Investment Saved")
+            self.message.setStyleSheet("color : green")
+            self.investment.update(investment)
+            self.investment_saved.emit(self.investment)
+
+    def live_investment(self):
+        """Get the investment for a live update, or None while the inputs are invalid"""
+        return self.read_investment(report=False)
+
+    def read_investment(self, report=True):
+        """
+        Validate the inputs
+
+        Args:
+            report: Show errors and warnings below the form
+
+        Returns:
+            dict: The investment fields, or None if an input is invalid
+        """
+        show_error = self.error_message if report else lambda text: None
+        show_warning = self.warning_message if report else lambda text: None
+        if report:
+            self.warning.setText("")
         is_ok = True
 
         try:
             initial_deposit = float(self.initial_deposit.text())
             if initial_deposit < 0:
                 is_ok = False
-                self.error_message("Initial Deposit cannot be negative!")
+                show_error("Initial Deposit cannot be negative!")
         except ValueError:
             is_ok = False
-            self.error_message("Initial Deposit!")
+            show_error("Initial Deposit!")
 
         try:
             years = float(self.years.text())
             if years < 0:
                 is_ok = False
-                self.error_message("Years Of Growth cannot be negative!")
+                show_error("Years Of Growth cannot be negative!")
         except ValueError:
             is_ok = False
-            self.error_message("Years Of Growth!")
+            show_error("Years Of Growth!")
 
         try:
             rate = float(self.rate.text())
             if rate < 0:
-                self.warning_message("negative interest rate will cause loss!")
+                show_warning("negative interest rate will cause loss!")
             elif rate > 100:
-                self.warning_message("unrealistic interest rate!")
+                show_warning("unrealistic interest rate!")
 
         except ValueError:
             is_ok = False
-            self.error_message("Interest Rate!")
+            show_error("Interest Rate!")
 
         try:
             contribution = float(self.contribution.text())
             if contribution < 0:
                 is_ok = False
-                self.error_message("Contribution Amount cannot be negative!")
+                show_error("Contribution Amount cannot be negative!")
         except ValueError:
             is_ok = False
-            self.error_message("Contribution Amount!")
+            show_error("Contribution Amount!")
 
-        if is_ok:
-            self.message.setText("Investment Saved")
-            self.message.setStyleSheet("color : green")
-            self.investment.update({
-                "initial_deposit" : initial_deposit,
-                "years" : years,
-                "rate" : rate,
-                "compound_frequency" : self.frequency.currentText(),
-                "contribution_amount" : contribution,
-                "contribution_frequency" : self.contribution_frequency.currentText(),
-                "is_empty" : False
-            })
-            self.investment_saved.emit(self.investment)
+        if not is_ok:
+            return None
+        return {
+            "initial_deposit" : initial_deposit,
+            "years" : years,
+            "rate" : rate,
+            "compound_frequency" : self.frequency.currentText(),
+            "contribution_amount" : contribution,
+            "contribution_frequency" : self.contribution_frequency.currentText(),
+            "is_empty" : False
+        }
     
     def error_message(self, text):
         """Display an error message"""
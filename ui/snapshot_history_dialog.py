@@ -0,0 +1,122 @@
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+                               QCheckBox, QPlainTextEdit, QAbstractItemView, QHeaderView, QFileDialog, QMessageBox)
+from core.snapshot_store import SnapshotDiff, SnapshotStore
+
+class SnapshotHistoryDialog(QDialog):
+    """Dialog to browse, compare and reopen the saved portfolio snapshots"""
+
+    def __init__(self, store: SnapshotStore, parent=None):
+        """Initialize the dialog with the snapshot store to browse"""
+        super().__init__(parent)
+        self.store = store
+        self.entries = []
+        self.setWindowTitle("Portfolio History")
+        self.resize(700, 500)
+        self.setup()
+        self.controller()
+        self.refresh()
+
+    def setup(self):
+        """Set up the snapshot table, buttons and diff view"""
+        self.main_layout = QVBoxLayout(self)
+
+        self.distinct_only = QCheckBox("Show only distinct portfolios")
+        self.main_layout.addWidget(self.distinct_only)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Saved", "File", "Holdings", "Snapshot"])
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.main_layout.addWidget(self.table)
+
+        self.diff_view = QPlainTextEdit()
+        self.diff_view.setReadOnly(True)
+        self.diff_view.setPlaceholderText("Select two snapshots and press Compare to see what changed.")
+        self.main_layout.addWidget(self.diff_view)
+
+        button_row = QHBoxLayout()
+        self.add_files_button = QPushButton("Add Files...")
+        button_row.addWidget(self.add_files_button)
+        button_row.addStretch()
+        self.compare_button = QPushButton("Compare")
+        button_row.addWidget(self.compare_button)
+        self.open_button = QPushButton("Open")
+        button_row.addWidget(self.open_button)
+        self.close_button = QPushButton("Close")
+        button_row.addWidget(self.close_button)
+        self.main_layout.addLayout(button_row)
+
+    def controller(self):
+        """Connect signals to their respective slots"""
+        self.distinct_only.toggled.connect(self.refresh)
+        self.table.itemSelectionChanged.connect(self._update_buttons)
+        self.table.itemDoubleClicked.connect(self.accept)
+        self.add_files_button.clicked.connect(self.add_files)
+        self.compare_button.clicked.connect(self.compare)
+        self.open_button.clicked.connect(self.accept)
+        self.close_button.clicked.connect(self.reject)
+
+    def refresh(self):
+        """Fill the table with the recorded saves, newest first"""
+        self.entries = self.store.history(distinct=self.distinct_only.isChecked())
+        self.table.setRowCount(len(self.entries))
+        for row, entry in enumerate(self.entries):
+            saved = datetime.fromisoformat(entry.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            for column, text in enumerate((saved, entry.name, str(entry.holdings), entry.digest[:12])):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self._update_buttons()
+
+    def _selected_entries(self):
+        """Get the selected entries, oldest first"""
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()}, reverse=True)
+        return [self.entries[row] for row in rows]
+
+    def _update_buttons(self):
+        """Enable the actions that fit the selection"""
+        count = len(self._selected_entries())
+        self.open_button.setEnabled(count == 1)
+        self.compare_button.setEnabled(count == 2)
+
+    def selected_digest(self):
+        """Get the digest of the snapshot to open, or None"""
+        selected = self._selected_entries()
+        return selected[0].digest if len(selected) == 1 else None
+
+    def add_files(self):
+        """Record existing portfolio files in the history"""
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Add Portfolio Files", "",
+                                                     "Investment Files (*.json *.invb);;All Files (*)")
+        failed = []
+        for file_path in file_paths:
+            try:
+                self.store.add_file(file_path)
+            except (OSError, ValueError) as e:
+                failed.append(f"{file_path}: {e}")
+        if file_paths:
+            self.refresh()
+        if failed:
+            QMessageBox.warning(self, "Add Files", "Some files could not be added:\n" + "\n".join(failed))
+
+    def compare(self):
+        """Show the differences between the two selected snapshots"""
+        selected = self._selected_entries()
+        if len(selected) != 2:
+            return
+        old, new = selected
+        self.diff_view.setPlainText(self.format_diff(self.store.diff(old.digest, new.digest)))
+
+    @staticmethod
+    def format_diff(diff: SnapshotDiff) -> str:
+        """Describe a diff as one line per change"""
+        if diff.is_empty:
+            return "Both snapshots hold the same portfolio."
+        lines = [f"{name}: {old} -> {new}" for name, (old, new) in diff.settings.items()]
+        lines += [f"+ {ticker}" for ticker in diff.added]
+        lines += [f"- {ticker}" for ticker in diff.removed]
+        for ticker, changes in diff.changed.items():
+            details = ", ".join(f"{name} {old} -> {new}" for name, (old, new) in changes.items())
+            lines.append(f"~ {ticker}: {details}")
+        return "\n".join(lines)
@@ -0,0 +1,66 @@
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QApplication
+
+class ThemeManager(QObject):
+    """
+    Single owner of the application theme.
+
+    Stylesheets are read from disk once per theme and kept, and charts register
+    with the manager so a theme switch only recolors them in place.
+    """
+
+    # Emitted with the name of the applied theme
+    theme_changed = Signal(str)
+
+    DEFAULT_THEME = "white"
+    # Chart palette used by every application theme
+    CHART_THEMES = {"white": "light", "dark": "dark"}
+
+    def __init__(self, stylesheet_path=None, theme=DEFAULT_THEME, parent=None):
+        """
+        Args:
+            stylesheet_path: Callable returning the .qss path of a theme name
+            theme: Theme already applied to the application, e.g. by main.py
+        """
+        super().__init__(parent)
+        self.stylesheet_path = stylesheet_path
+        self.theme = theme
+        self.stylesheets = {}  # theme -> stylesheet text
+        self.charts = []
+
+    @property
+    def chart_theme(self):
+        """Get the chart palette name of the current theme"""
+        return self.CHART_THEMES.get(self.theme, "light")
+
+    def stylesheet(self, theme):
+        """
+        Get the stylesheet of a theme, read from disk only the first time.
+
+        Raises:
+            OSError: If the .qss file cannot be read
+        """
+        if theme not in self.stylesheets:
+            with open(self.stylesheet_path(theme), "r", encoding="utf-8") as file:
+                self.stylesheets[theme] = file.read()
+        return self.stylesheets[theme]
+
+    def apply(self, theme):
+        """Apply a theme to the application and recolor the registered charts"""
+        if theme == self.theme:
+            return
+        stylesheet = self.stylesheet(theme)
+
+        app = QApplication.instance()
+        if app:
+            app.setStyleSheet(stylesheet)
+        self.theme = theme
+        for chart in self.charts:
+            chart.change_theme(self.chart_theme)
+        self.theme_changed.emit(theme)
+
+    def register_chart(self, chart):
+        """Keep a chart in the colors of the current theme"""
+        chart.change_theme(self.chart_theme)
+        self.charts.append(chart)
+        chart.destroyed.connect(lambda: self.charts.remove(chart))